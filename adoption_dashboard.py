@@ -7,6 +7,9 @@ from dotenv import load_dotenv
 import json
 import sys
 import requests # requests 라이브러리 추가
+from src.llm_cache import LLMCache
+from src.llm_client import GEMINI_BASE_URL, gemini_stream
+from src.csv_ingest import read_csv_cached
 
 # --- 1. 환경설정 및 API 클라이언트 초기화 ---
 # 🚨🚨🚨 여기에 본인의 'AIza...' 키를 문자열로 직접 입력합니다! 🚨🚨🚨
@@ -26,6 +29,27 @@ if api_key == "AIza로시작하는본인의_Google_API_키":
 # API 클라이언트 초기화 (requests 사용을 위해 주석 처리)
 # client = genai.Client(api_key=api_key)
 
+# Gemini 모델 이름 (캐시 키에도 포함됨)
+MODEL_NAME = "gemini-2.5-flash-preview-09-2025"
+
+
+def is_consulting_result(text):
+    """적합도 점수가 들어 있는 JSON 응답만 캐시 (잘리거나 차단된 응답은 다음에 다시 호출)"""
+    try:
+        result = json.loads(text)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(result, dict) and result.get("adoptionSuitabilityScore") is not None
+
+
+# 같은 동물 프롬프트 + 사용자 환경 + 모델 조합은 다시 호출하지 않도록 응답 캐시
+# (st.cache_resource 로 모든 세션/재실행이 같은 캐시 인스턴스를 공유)
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+llm_cache = get_llm_cache()
+
 # --- 2. CSV 파일 불러오기 및 오류 처리 ---
 # 🚨🚨🚨 CSV 파일 경로를 이미지에서 확인된 절대 경로로 수정  🚨🚨🚨
 csv_path = '' 
@@ -38,15 +62,17 @@ if not os.path.exists(DATA_PATH):
     st.error(f"❌ 파일을 찾을 수 없습니다: {DATA_PATH}. 경로를 확인하세요.")
     st.stop()
 
+# 원본 mtime 을 키에 넣어 두면 파일이 바뀔 때만 다시 읽는다 (재실행마다 CSV 파싱 X)
+@st.cache_data
+def load_prompts(path, mtime_ns):
+    return read_csv_cached(path)
+
 try:
-    df = pd.read_csv(DATA_PATH, encoding='cp949')
+    df = load_prompts(DATA_PATH, os.stat(DATA_PATH).st_mtime_ns)
 except UnicodeDecodeError:
-    try:
-        df = pd.read_csv(DATA_PATH, encoding='euc-kr')
-    except Exception:
-        st.error("❌ CSV 파일 인코딩 오류! cp949/euc-kr로도 읽을 수 없습니다.")
-        st.stop()
-        
+    st.error("❌ CSV 파일 인코딩 오류! utf-8/cp949 로도 읽을 수 없습니다.")
+    st.stop()
+
 # --- 3. 사용자 입력 섹션 ---
 
 st.sidebar.header("📝 분석 대상 동물 선택")
@@ -65,6 +91,12 @@ user_env = st.sidebar.text_area(
     height=150
 )
 
+cache_stats = llm_cache.stats()
+st.sidebar.caption(
+    f"🗂️ AI 응답 캐시 적중률: {cache_stats['hit_rate']:.0%} "
+    f"(메모리 {cache_stats['memory_hits']} / 디스크 {cache_stats['disk_hits']} / 호출 {cache_stats['misses']})"
+)
+
 st.subheader(f"📌 선택된 동물 정보 (Row #{selected_option_index})")
 st.code(animal_prompt, language='text')
 
@@ -84,7 +116,8 @@ if st.button("AI 기반 적합도 분석 실행 (Gemini)"):
         """
         
         # --- [수정된 부분]: Structured JSON Output을 위한 API 호출 설정 ---
-        apiUrl = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-09-2025:generateContent?key={api_key}"
+        # 오류 표시용 — 실제 호출은 gemini_stream (API 키는 화면에 출력하지 않음)
+        endpoint = f"{GEMINI_BASE_URL}/v1beta/models/{MODEL_NAME}:streamGenerateContent"
 
         # AI에게 반드시 지켜야 할 JSON Schema를 제공합니다.
         json_schema = {
@@ -140,19 +173,25 @@ if st.button("AI 기반 적합도 분석 실행 (Gemini)"):
 
         with st.spinner("Gemini AI가 적합도를 분석 중입니다... (JSON 형식 강제 적용 중)"):
             try:
-                # 4-2. Gemini API 호출 (requests 사용)
-                response = requests.post(
-                    apiUrl, 
-                    json=payload
-                )
-                
-                # HTTP 오류 발생 시, 오류 응답 본문을 포함하여 예외를 발생시킵니다.
-                response.raise_for_status() 
+                # 4-2. Gemini API 호출 (공유 keep-alive 커넥션 풀 + 타임아웃 + 스트리밍)
+                # 응답 조각이 도착하는 대로 먼저 보여주고, 다 받으면 아래에서 정리해서 출력합니다.
+                # HTTP 오류 발생 시에는 오류 응답 본문을 포함한 HTTPError 가 그대로 올라옵니다.
+                def call_gemini():
+                    stream_box = st.empty()
+                    chunks = []
+                    for chunk in gemini_stream(user_query, api_key, MODEL_NAME,
+                                               generation_config=payload["generationConfig"]):
+                        chunks.append(chunk)
+                        stream_box.code("".join(chunks), language='json')
+                    stream_box.empty()
+                    return "".join(chunks)
 
-                result = response.json()
+                # 캐시에 있으면 즉시 반환, 같은 요청이 동시에 들어오면 한 번만 호출
+                # (오류 / 빈 응답 / JSON 으로 읽히지 않는 응답은 캐시하지 않음)
+                cache_key = llm_cache.make_key(MODEL_NAME, animal_prompt, user_env, json_schema)
                 
                 # API 응답에서 JSON 텍스트 추출
-                json_string = result.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', '{}')
+                json_string = llm_cache.get_or_compute(cache_key, call_gemini, validate=is_consulting_result) or '{}'
                 
                 # 유효한 JSON 객체로 변환 시도
                 try:
@@ -219,7 +258,7 @@ if st.button("AI 기반 적합도 분석 실행 (Gemini)"):
             except requests.exceptions.HTTPError as http_err:
                 # HTTPError 발생 시 (400, 403, 404 등)
                 st.error(f"⚠️ Gemini API 호출 중 HTTP 오류 발생: {http_err}")
-                st.caption(f"**요청 URL:** {apiUrl}")
+                st.caption(f"**요청 엔드포인트:** {endpoint} (모델: {MODEL_NAME})")
                 
                 # [수정 2] 오류 응답 본문을 출력하여 정확한 원인 진단
                 try:
@@ -233,7 +272,7 @@ if st.button("AI 기반 적합도 분석 실행 (Gemini)"):
             except requests.exceptions.RequestException as e:
                 # requests 라이브러리의 네트워크 오류 처리 (연결, 타임아웃 등)
                 st.error(f"⚠️ Gemini API 호출 중 네트워크 오류 발생: {e}")
-                st.caption(f"**요청 URL:** {apiUrl}")
+                st.caption(f"**요청 엔드포인트:** {endpoint} (모델: {MODEL_NAME})")
             except Exception as e:
                 # 기타 오류 처리
                 st.error(f"⚠️ 기타 오류 발생: {e}")
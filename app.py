@@ -1,18 +1,468 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, g, jsonify, request, send_file, stream_with_context
+import datetime
+import gzip
+import hashlib
+import itertools
 import json
 import os
+import threading
+import time
+
+from src import metrics
+from src.animal_db import AnimalDB
+from src.animal_index import AnimalIndex
+from src.animal_utils import decode_cursor, iter_filter_animals, parse_date, recommend_animals
+from src.fetch_animals import iter_animals
+from src.image_cache import DEFAULT_CACHE_DIR, ImageCache, ImagePrefetcher
+from src.preprocess_animals import ADDED_FIELDS, preprocess_animals
+from src.query import DateRange
+from src.region import EXPAND_MODES
+from src.scoring import AnimalScorer
+from src.urgent_feed import ExpirySweeper, UrgentFeed
 
 app = Flask(__name__)
 
+# 서버는 기본으로 계측을 켠다 (ANIMAL_METRICS=0 이면 끔)
+if os.getenv("ANIMAL_METRICS", "1") != "0":
+    metrics.enable()
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, 'data', 'sample_data_for_knime.json')
+
+# ANIMAL_DB 를 주면 JSON 대신 SQLite 저장소에서 질의 (python -m src.animal_db load / fetch_api --db 로 적재)
+DB_PATH = os.getenv("ANIMAL_DB", "")
+
+# 공고 사진 썸네일 캐시 (ANIMAL_PREFETCH_IMAGES=1 이면 데이터셋을 읽을 때 전부 미리 받기 시작)
+THUMBNAIL_DIR = os.getenv("ANIMAL_THUMBNAIL_DIR", DEFAULT_CACHE_DIR)
+PREFETCH_IMAGES = os.getenv("ANIMAL_PREFETCH_IMAGES", "") not in ("", "0")
+
+# /animals 응답 캐시 (파일 mtime 이 바뀔 때만 다시 만든다)
+_payload = {}
+_payload_lock = threading.Lock()
+
+
+def load_payload(file_path=DATA_PATH):
+    """
+    JSON 파일을 한 번만 읽어서 직렬화된 bytes / gzip 본 / ETag 를 만들어 둔다.
+    파일의 (mtime, 크기) 가 그대로면 캐시된 것을 그대로 반환한다.
+    """
+    st = os.stat(file_path)
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    cached = _payload.get("current")
+    if cached is not None and cached["key"] == key:
+        return cached
+
+    with _payload_lock:
+        cached = _payload.get("current")
+        if cached is not None and cached["key"] == key:
+            return cached
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        # jsonify 와 같은 형식으로 직렬화
+        body = (app.json.dumps(data) + "\n").encode("utf-8")
+        digest = hashlib.sha1(body).hexdigest()
+
+        cached = {
+            "key": key,
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+            "etag": digest,
+            "last_modified": datetime.datetime.fromtimestamp(st.st_mtime, datetime.timezone.utc),
+        }
+        _payload["current"] = cached
+        return cached
+
+
+# 검색 API 페이지 크기
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+
+# 이 중 하나라도 있으면 원본 문서 대신 검색 결과를 돌려준다
+QUERY_PARAMS = ("kind", "region", "region_scope", "care", "deadline_from", "deadline_to",
+                "within_days", "limit", "cursor", "rank")
+
+# /animals/urgent 기본 기간 (일)
+URGENT_DAYS = 7
+
+# rank 값 (deadline: 마감일 순 필터, score: 마감 임박도 가중 점수 순)
+RANK_MODES = ("deadline", "score")
+
+# 전처리 + 색인된 데이터셋 (파일 mtime 이 바뀔 때만 다시 만든다)
+_dataset = {}
+_dataset_lock = threading.Lock()
+
+
+def load_dataset(file_path=DATA_PATH):
+    """
+    검색용 AnimalIndex 를 한 번만 만들어 두고 재사용
+    ANIMAL_DB 가 있으면 AnimalDB (다른 프로세스가 갱신해도 다시 만들 필요 없음)
+    """
+    if DB_PATH:
+        db = _dataset.get("db")
+        if db is None:
+            with _dataset_lock:
+                db = _dataset.setdefault("db", AnimalDB(DB_PATH))
+        return db
+
+    st = os.stat(file_path)
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    cached = _dataset.get("current")
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with _dataset_lock:
+        cached = _dataset.get("current")
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        index = AnimalIndex(preprocess_animals(iter_animals(file_path)))
+        _dataset["current"] = (key, index)
+        return index
+
+
+def load_scorer(dataset):
+    """
+    데이터셋에 대한 AnimalScorer (데이터셋이 바뀔 때만 다시 만든다)
+    """
+    cached = _dataset.get("scorer")
+    if cached is not None and cached[0] is dataset:
+        return cached[1]
+
+    with _dataset_lock:
+        cached = _dataset.get("scorer")
+        if cached is not None and cached[0] is dataset:
+            return cached[1]
+        scorer = AnimalScorer(dataset)
+        _dataset["scorer"] = (dataset, scorer)
+        return scorer
+
+
+def public_record(a):
+    """전처리로 추가된 필드를 빼고 원본 공고 필드만"""
+    return {k: v for k, v in a.items() if k not in ADDED_FIELDS}
+
+
+def parse_query(args, default_limit=DEFAULT_LIMIT):
+    """
+    쿼리스트링 → recommend_animals 인자
+    잘못된 값이면 ValueError
+
+    kind / region / care  : 부분 검색 (품종 / 발생 장소 / 보호소명)
+    region_scope          : province (같은 시도 전체) / neighbors (맞닿은 시도까지)
+    deadline_from / _to   : 마감일 구간 (YYYYMMDD)
+    within_days           : 오늘부터 N일 이내 마감
+    limit / cursor        : 페이지 크기 / 이전 응답의 next_cursor
+    """
+    start = end = None
+    for name in ("deadline_from", "deadline_to"):
+        value = args.get(name)
+        if value:
+            d = parse_date(value)
+            if d is None:
+                raise ValueError(f"{name} 는 YYYYMMDD 형식이어야 합니다: {value!r}")
+            if name == "deadline_from":
+                start = d
+            else:
+                end = d
+
+    within = args.get("within_days")
+    if within:
+        try:
+            days = int(within)
+        except ValueError:
+            raise ValueError(f"within_days 는 정수여야 합니다: {within!r}")
+        today = datetime.date.today()
+        start = max(start or today, today)
+        end = min(end or datetime.date.max, today + datetime.timedelta(days=days))
+
+    limit = args.get("limit")
+    if limit is None:
+        limit = default_limit
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError(f"limit 는 정수여야 합니다: {limit!r}")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit 는 1 ~ {MAX_LIMIT} 사이여야 합니다")
+
+    cursor = args.get("cursor") or None
+    if cursor is not None:
+        decode_cursor(cursor)
+
+    scope = args.get("region_scope") or None
+    if scope is not None and scope not in EXPAND_MODES:
+        raise ValueError(f"region_scope 는 {' / '.join(EXPAND_MODES)} 중 하나여야 합니다: {scope!r}")
+
+    where = None
+    if start is not None or end is not None:
+        where = DateRange("noticeEdt_parsed", start, end)
+
+    return {
+        "user_region": args.get("region", ""),
+        "preferred_kind": args.get("kind") or None,
+        "care": args.get("care") or None,
+        "where": where,
+        "expand": scope,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+
+def load_feed(dataset):
+    """
+    데이터셋에 대한 UrgentFeed + 만료 청소 스레드 (데이터셋이 바뀔 때만 다시 만든다)
+    """
+    cached = _dataset.get("feed")
+    if cached is not None and cached[0] is dataset:
+        return cached[1]
+
+    with _dataset_lock:
+        cached = _dataset.get("feed")
+        if cached is not None and cached[0] is dataset:
+            return cached[1]
+        if cached is not None:
+            cached[2].stop()
+        feed = UrgentFeed(dataset)
+        sweeper = ExpirySweeper(feed).start()
+        _dataset["feed"] = (dataset, feed, sweeper)
+        return feed
+
+
+_images = {}
+_images_lock = threading.Lock()
+
+
+def get_prefetcher():
+    """썸네일 캐시 + 백그라운드 미리 받기 (처음 필요할 때 한 번만 만든다)"""
+    prefetcher = _images.get("prefetcher")
+    if prefetcher is None:
+        with _images_lock:
+            prefetcher = _images.get("prefetcher")
+            if prefetcher is None:
+                prefetcher = ImagePrefetcher(ImageCache(THUMBNAIL_DIR)).start()
+                _images["prefetcher"] = prefetcher
+    return prefetcher
+
+
+def load_popfiles(dataset):
+    """
+    noticeNo → popfile (데이터셋이 바뀔 때만 다시 만든다)
+    사진 URL 은 데이터셋에 있는 것만 받으므로 임의 URL 을 대신 받아 주지 않는다.
+    """
+    cached = _dataset.get("popfiles")
+    if cached is not None and cached[0] is dataset:
+        return cached[1]
+
+    with _dataset_lock:
+        cached = _dataset.get("popfiles")
+        if cached is not None and cached[0] is dataset:
+            return cached[1]
+        popfiles = {a.get("noticeNo"): a.get("popfile") for a in dataset if a.get("popfile")}
+        _dataset["popfiles"] = (dataset, popfiles)
+
+    if PREFETCH_IMAGES:
+        get_prefetcher().submit(popfiles.values())
+    return popfiles
+
+
+def _parse_range(name, value):
+    # '1-3' / '-5' / '2-' → (최소, 최대)
+    lo, sep, hi = value.partition("-")
+    try:
+        if not sep:
+            raise ValueError
+        return (float(lo) if lo else None, float(hi) if hi else None)
+    except ValueError:
+        raise ValueError(f"{name} 는 '최소-최대' 형식이어야 합니다 (예: 1-3, -5): {value!r}")
+
+
+def parse_rank(args, query):
+    """
+    rank=score 면 AnimalScorer.recommend 추가 인자, 아니면 None
+
+    age / weight : 원하는 나이(년) / 체중(kg) 범위 '최소-최대'
+    """
+    rank = args.get("rank") or "deadline"
+    if rank not in RANK_MODES:
+        raise ValueError(f"rank 는 {' / '.join(RANK_MODES)} 중 하나여야 합니다: {rank!r}")
+    if rank == "deadline":
+        return None
+    if query["cursor"] is not None:
+        raise ValueError("rank=score 에서는 cursor 를 쓸 수 없습니다 (limit 로 개수 조절)")
+
+    options = {}
+    for name, key in (("age", "age_range"), ("weight", "weight_range")):
+        if args.get(name):
+            options[key] = _parse_range(name, args[name])
+    return options
+
+
+def bad_request(e):
+    return jsonify({"error": str(e)}), 400
+
+
+@app.before_request
+def start_timer():
+    g.started = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    # 경로 그대로 쓰면 라벨이 무한히 늘어나므로 라우트 패턴 기준
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    if "started" in g:
+        metrics.observe("http_request_seconds", time.perf_counter() - g.started, endpoint=endpoint)
+    metrics.inc("http_requests_total", endpoint=endpoint, status=response.status_code)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus 수집용"""
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route('/animals')
 def animals():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(base_dir, 'data', 'sample_data_for_knime.json')
+    if any(name in request.args for name in QUERY_PARAMS):
+        return search_animals()
+
+    with metrics.timer("animal_stage_seconds", stage="load_payload"):
+        payload = load_payload()
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return jsonify(data)
+    use_gzip = "gzip" in request.accept_encodings
+    body = payload["gzip"] if use_gzip else payload["body"]
+
+    response = Response(body, mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"  # 매번 재검증 (변경 없으면 304)
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    # 압축 여부에 따라 바이트가 다르므로 ETag 도 구분
+    response.set_etag(payload["etag"] + ("-gz" if use_gzip else ""))
+    response.last_modified = payload["last_modified"]
+
+    # If-None-Match / If-Modified-Since 가 맞으면 본문 없이 304
+    return response.make_conditional(request)
+
+
+def search_animals():
+    """
+    /animals?region=서울&kind=말티즈&limit=20 — 마감일 순 한 페이지
+    /animals?region=서울&kind=말티즈&rank=score&age=0-3 — 점수 순 상위 limit 마리
+    """
+    try:
+        query = parse_query(request.args)
+        scoring = parse_rank(request.args, query)
+    except ValueError as e:
+        return bad_request(e)
+
+    with metrics.timer("animal_stage_seconds", stage="load_dataset"):
+        dataset = load_dataset()
+
+    if scoring is not None:
+        # 점수 순은 거르지 않고 지역/품종을 가산점으로만 반영
+        page = load_scorer(dataset).recommend(query["user_region"], query["preferred_kind"],
+                                              limit=query["limit"], **scoring)
+        return jsonify({
+            "items": [dict(public_record(a), score=round(s, 4)) for a, s in zip(page, page.scores)],
+            "count": len(page),
+            "next_cursor": None,
+        })
+
+    page = recommend_animals(dataset, **query)
+    return jsonify({
+        "items": [public_record(a) for a in page],
+        "count": len(page),
+        "next_cursor": page.next_cursor,
+    })
+
+
+@app.route('/animals/urgent')
+def urgent_animals():
+    """
+    /animals/urgent?days=7&region=서울&limit=20 — 오늘부터 days 일 이내 마감, 마감일 순
+    (UrgentFeed 에서 바로 꺼내므로 정렬 없음)
+    """
+    days = request.args.get("days") or str(URGENT_DAYS)
+    if not days.isdigit():
+        return bad_request(ValueError(f"days 는 0 이상의 정수여야 합니다: {days!r}"))
+    try:
+        query = parse_query(request.args)
+    except ValueError as e:
+        return bad_request(e)
+
+    dataset = load_dataset()
+    if isinstance(dataset, AnimalDB):
+        # 마감일 색인 구간 조회 + 조건을 SQL 한 번으로 (피드를 따로 만들지 않음)
+        today = datetime.date.today()
+        window = DateRange("noticeEdt_parsed", today, today + datetime.timedelta(days=int(days)))
+        page = recommend_animals(dataset, query["user_region"], query["preferred_kind"],
+                                 limit=query["limit"], care=query["care"], where=window,
+                                 expand=query["expand"])
+        return jsonify({
+            "items": [public_record(a) for a in page],
+            "count": len(page),
+        })
+
+    feed = load_feed(dataset)
+    feed.expire()
+    urgent = feed.within(int(days))
+    if query["user_region"] or query["preferred_kind"] or query["care"]:
+        urgent = iter_filter_animals(urgent, kind=query["preferred_kind"], region=query["user_region"],
+                                     care=query["care"], expand=query["expand"])
+    page = list(itertools.islice(urgent, query["limit"]))
+    return jsonify({
+        "items": [public_record(a) for a in page],
+        "count": len(page),
+    })
+
+
+@app.route('/animals/<notice_no>/thumbnail')
+def animal_thumbnail(notice_no):
+    """
+    공고 사진 썸네일 (로컬 캐시에서 바로)
+    아직 받지 않았으면 미리 받기 대기열에 넣고 503 + Retry-After
+    """
+    url = load_popfiles(load_dataset()).get(notice_no)
+    if not url:
+        return jsonify({"error": f"사진이 없는 공고입니다: {notice_no}"}), 404
+
+    prefetcher = get_prefetcher()
+    found = prefetcher.cache.lookup(url)
+    if found is None or not os.path.exists(found[0]):
+        prefetcher.submit([url])
+        response = jsonify({"error": "사진을 받는 중입니다. 잠시 후 다시 요청하세요."})
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+
+    path, content_type, digest = found
+    # 내용 해시를 ETag 로 (If-None-Match 가 맞으면 send_file 이 304 로 응답)
+    return send_file(path, mimetype=content_type, etag=digest, max_age=24 * 3600)
+
+
+@app.route('/animals/stream')
+def stream_animals():
+    """
+    /animals 와 같은 조건으로 마감일 순 결과를 NDJSON 으로 스트리밍
+    (한 줄에 동물 하나, limit 를 주지 않으면 끝까지)
+    """
+    try:
+        query = parse_query(request.args, default_limit=None)
+    except ValueError as e:
+        return bad_request(e)
+
+    results = recommend_animals(load_dataset(), lazy=True, **query)
+
+    def generate():
+        for a in results:
+            yield json.dumps(public_record(a), ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 if __name__ == "__main__":
     app.run(debug=True)
-
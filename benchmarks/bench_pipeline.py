@@ -0,0 +1,186 @@
+# benchmarks/bench_pipeline.py
+"""
+로드 → 전처리 → 필터 → 정렬 → 추천 파이프라인 벤치마크
+
+src.synth_animals 로 만든 가짜 공고(1만/10만/100만)로 단계별 시간과 최대 메모리를 재서
+JSON 으로 저장하고, 이전 결과(--baseline)와 비교해 느려진 단계가 있으면 실패(exit 1)한다.
+
+    python -m benchmarks.bench_pipeline                           # 1만, 10만
+    python -m benchmarks.bench_pipeline --sizes 10000,100000,1000000
+    python -m benchmarks.bench_pipeline --baseline benchmarks/results/main.json --threshold 1.2
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from src.animal_db import AnimalDB
+from src.animal_index import AnimalIndex
+from src.animal_store import AnimalStore
+from src.animal_utils import (filter_by_care_name, filter_by_kind, filter_by_region,
+                              recommend_animals, sort_by_end_date)
+from src.fetch_animals import load_mock_animals
+from src.preprocess_animals import preprocess_animals
+from src.scoring import AnimalScorer
+from src.synth_animals import write_synthetic
+
+DEFAULT_SIZES = (10000, 100000)
+DEFAULT_OUT = "./benchmarks/results/latest.json"
+DATA_DIR = "./data"
+DB_PATH = os.path.join(DATA_DIR, "bench.sqlite")
+
+# 이보다 짧은 단계는 잡음이 커서 회귀 판정에서 뺀다 (초)
+MIN_SECONDS = 0.005
+
+# 필터/추천에 쓰는 검색어 (가짜 데이터에 실제로 있는 값)
+KIND_KEYWORD = "말티즈"
+CARE_KEYWORD = "수원"
+REGION_KEYWORD = "서울"
+PREFERRED_KIND = "믹스"
+
+def build_db(animals):
+    """벤치마크용 SQLite 저장소를 새로 만든다"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    db = AnimalDB(DB_PATH)
+    db.upsert_many(animals)
+    return db
+
+
+BACKENDS = {
+    "list": lambda animals: animals,
+    "index": AnimalIndex,
+    "store": AnimalStore.from_records,
+    "sqlite": build_db,
+}
+
+
+def data_path(n):
+    """n건짜리 가짜 덤프 경로 (없으면 만든다)"""
+    path = os.path.join(DATA_DIR, f"synth_{n}.json")
+    if not os.path.exists(path):
+        print(f"  가짜 공고 {n}건 생성 → {path}")
+        write_synthetic(n, path)
+    return path
+
+
+def measure(fn, repeat, memory):
+    """
+    (결과, 최소 시간(초), 최대 메모리(MB) 또는 None)
+    시간은 tracemalloc 없이 repeat 번 중 가장 빠른 값, 메모리는 따로 한 번 더 실행해서 잰다.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return result, best, peak
+
+
+def bench_size(n, backend, repeat, memory):
+    path = data_path(n)
+    results = {}
+
+    def run(name, fn, times=repeat):
+        value, seconds, peak = measure(fn, times, memory)
+        results[name] = {"seconds": round(seconds, 6), "peak_mb": None if peak is None else round(peak, 2)}
+        print(f"  {name:<22} {seconds * 1000:10.1f} ms" + ("" if peak is None else f"  {peak:9.1f} MB"))
+        return value
+
+    # 로드/전처리는 오래 걸리므로 한 번만
+    raw = run("load_mock_animals", lambda: load_mock_animals(path), 1)
+    animals = run("preprocess_animals", lambda: preprocess_animals(raw), 1)
+    del raw
+    animals = run(f"build_{backend}", lambda: BACKENDS[backend](animals), 1)
+
+    run("filter_by_kind", lambda: filter_by_kind(animals, KIND_KEYWORD))
+    run("filter_by_care_name", lambda: filter_by_care_name(animals, CARE_KEYWORD))
+    run("filter_by_region", lambda: filter_by_region(animals, REGION_KEYWORD))
+    run("sort_by_end_date", lambda: sort_by_end_date(animals))
+    run("recommend_animals", lambda: recommend_animals(animals, REGION_KEYWORD, PREFERRED_KIND))
+    run("recommend_top20", lambda: recommend_animals(animals, REGION_KEYWORD, PREFERRED_KIND, limit=20))
+
+    scorer = run("build_scorer", lambda: AnimalScorer(animals), 1)
+    run("score_top20", lambda: scorer.recommend(REGION_KEYWORD, PREFERRED_KIND, limit=20))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """
+    baseline 대비 threshold 배 넘게 느려진 (크기, 단계, 비율) 목록
+    """
+    regressions = []
+    for size, stages in current["results"].items():
+        for stage, now in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(stage)
+            if not before or before["seconds"] < MIN_SECONDS:
+                continue
+            ratio = now["seconds"] / before["seconds"]
+            if ratio > threshold:
+                regressions.append((size, stage, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="공고 수 목록 (쉼표 구분)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="list")
+    parser.add_argument("--repeat", type=int, default=3, help="필터/정렬/추천 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략 (빠름)")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="baseline 대비 이 배수보다 느리면 회귀로 판정")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "results": {},
+    }
+    for n in (int(s) for s in args.sizes.split(",")):
+        print(f"[{n}건 / {args.backend}]")
+        report["results"][str(n)] = bench_size(n, args.backend, args.repeat, not args.no_memory)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 → {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for size, stage, ratio in regressions:
+            print(f"❌ 회귀: {size}건 {stage} {ratio:.2f}배 느려짐 (기준 {baseline.get('commit')})")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ 기준({baseline.get('commit')}) 대비 {args.threshold}배 넘게 느려진 단계 없음")
+
+
+if __name__ == "__main__":
+    main()
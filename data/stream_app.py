@@ -1,8 +1,14 @@
 import os
+import sys
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
-from openai import OpenAI
+
+# 프로젝트 루트의 src 패키지를 쓰기 위해 경로 추가 (data/ 안에서 실행되므로)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.llm_cache import LLMCache
+from src.llm_client import chat_stream
+from src.csv_ingest import read_csv_cached
 
 # ===== 1) 환경설정 =====
 load_dotenv()  # .env 불러오기
@@ -12,17 +18,26 @@ if not api_key:
     st.error("❌ OPENAI_API_KEY 가 .env 에 설정되어 있지 않습니다.")
     st.stop()
 
-client = OpenAI(api_key=api_key)
+MODEL_NAME = "gpt-4.1-mini"   # 필요하면 다른 모델 이름으로 변경
+SYSTEM_PROMPT = ("너는 유기동물 입양 적합도를 분석해 주는 전문가야. "
+                 "사용자 라이프스타일과 공고 정보를 기반으로 입양 적합도를 설명해 줘.")
+
+# 같은 프롬프트 + 모델 조합은 캐시된 답변을 바로 보여줌 (세션 간 공유)
+@st.cache_resource
+def get_llm_cache():
+    return LLMCache()
+
+llm_cache = get_llm_cache()
 
 # ===== 2) CSV 불러오기 =====
 DATA_PATH = "./data/final_urgent_prompts.csv"
 
 @st.cache_data
-def load_data(path):
-    return pd.read_csv(path, encoding="utf-8")
+def load_data(path, mtime_ns):
+    return read_csv_cached(path)
 
 try:
-    df = load_data(DATA_PATH)
+    df = load_data(DATA_PATH, os.stat(DATA_PATH).st_mtime_ns)
 except FileNotFoundError:
     st.error(f"❌ CSV 파일을 찾을 수 없습니다: {DATA_PATH}")
     st.stop()
@@ -58,27 +73,28 @@ st.write("---")
 
 # ===== 4) GPT 호출 버튼 =====
 if st.button("🤖 AI 분석 실행"):
-    with st.spinner("AI가 분석 중입니다..."):
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4.1-mini",   # 필요하면 다른 모델 이름으로 변경
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "너는 유기동물 입양 적합도를 분석해 주는 전문가야. "
-                                   "사용자 라이프스타일과 공고 정보를 기반으로 입양 적합도를 설명해 줘."
-                    },
-                    {"role": "user", "content": prompt_text},
-                ],
-            )
-
-            answer = response.choices[0].message["content"]
-
-            st.subheader("✅ AI 분석 결과")
+    st.subheader("✅ AI 분석 결과")
+    try:
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt_text},
+        ]
+        streamed = []
+
+        def call_openai():
+            # 공유 커넥션 풀로 스트리밍 호출 → 토큰이 오는 대로 바로 화면에 출력
+            streamed.append(True)
+            return st.write_stream(chat_stream(messages, api_key, MODEL_NAME))
+
+        cache_key = llm_cache.make_key(MODEL_NAME, prompt_text, SYSTEM_PROMPT)
+        answer = llm_cache.get_or_compute(cache_key, call_openai)
+
+        if not streamed:
+            # 캐시된 답변은 한 번에 출력
             st.write(answer)
 
-        except Exception as e:
-            st.error(f"❌ API 호출 중 오류가 발생했습니다: {e}")
+    except Exception as e:
+        st.error(f"❌ API 호출 중 오류가 발생했습니다: {e}")
 
 st.write("---")
 st.caption("※ 실제 서비스에서는 여러 마리 동물을 한 번에 평가하거나, 사용자 라이프스타일 입력 폼을 추가할 수 있습니다.")
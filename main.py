@@ -1,32 +1,132 @@
-from src.fetch_animals import load_mock_animals
-from src.preprocess_animals import preprocess_animals
+import argparse
+import itertools
+
+from src import metrics
+
+from src.animal_db import AnimalDB
+from src.fetch_animals import iter_animals
+from src.delta_sync import iter_synced_animals
+from src.preprocess_animals import DEFAULT_CHUNK_SIZE, preprocess_animals
+from src.preprocess_cache import DEFAULT_CACHE_PATH, PreprocessCache
+from src.region import EXPAND_MODES
+from src.scoring import AnimalScorer
+from src.urgent_feed import UrgentFeed
+from src.snapshot import load_snapshot
 from src.animal_utils import *
 
+# 한 번에 보여줄 추천 결과 수
+PAGE_SIZE = 10
+
+# --rank score 일 때 점수 순으로 뽑아 둘 최대 수
+SCORE_LIMIT = 100
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="유기동물 추천 시스템")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="전처리 병렬 프로세스 수 (전국 단위 대용량 데이터용, 기본: 직렬)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="병렬 전처리 시 작업 하나당 레코드 수")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help="전처리 캐시 파일 경로")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="전처리 캐시를 쓰지 않고 전부 새로 전처리")
+    parser.add_argument("--snapshot", default=None,
+                        help="python -m src.snapshot 으로 만든 스냅샷 파일 (JSON 파싱/전처리 생략)")
+    parser.add_argument("--db", default=None,
+                        help="python -m src.animal_db load 로 적재한 SQLite 저장소에서 바로 질의 (로드/전처리 생략)")
+    parser.add_argument("--csv", default=None,
+                        help="JSON 대신 KNIME 내보내기 CSV (final_urgent_prompts.csv 형식) 에서 동물 읽기")
+    parser.add_argument("--synced", action="store_true",
+                        help="python -m src.delta_sync 로 동기화한 최신 공고 (기준 덤프 + 델타 로그) 읽기")
+    parser.add_argument("--region-scope", choices=EXPAND_MODES, default=None,
+                        help="지역 검색 범위 넓히기 (province: 같은 시도 전체, neighbors: 맞닿은 시도까지)")
+    parser.add_argument("--rank", choices=("deadline", "score"), default="deadline",
+                        help="deadline: 지역/품종으로 거르고 마감일 순, score: 마감 임박도 가중 점수 순")
+    parser.add_argument("--within-days", type=int, default=None,
+                        help="오늘부터 N일 이내 마감인 공고만 마감일 순으로 (마감 지난 공고 제외)")
+    parser.add_argument("--profile", action="store_true",
+                        help="끝날 때 단계별 소요 시간 표 출력")
+    return parser.parse_args()
+
+
 def main():
-    print("🐶 유기동물 추천 시스템 시작!")
+    args = parse_args()
+    if args.profile:
+        metrics.enable()
+    try:
+        run(args)
+    finally:
+        if args.profile:
+            print("\n===== ⏱ 단계별 소요 시간 =====")
+            print(metrics.report())
 
-    # 1) 테스트 데이터 로드
-    animals = load_mock_animals()
-    print(f"👉 데이터 로드 완료: {len(animals)} 마리")
 
-    # 2) 전처리
-    animals = preprocess_animals(animals)
-    print("👉 전처리 완료")
+def run(args):
+    print("🐶 유기동물 추천 시스템 시작!")
+
+    # 1~2) 테스트 데이터 로드 + 전처리
+    # 원본은 한 마리씩 스트리밍하고 전처리된 결과만 메모리에 유지
+    # 이전 실행에서 전처리한 공고는 캐시에서 재사용 (바뀐 공고만 다시 처리)
+    if args.csv:
+        # pandas 는 CSV 입력일 때만 필요
+        from src.knime_normalize import iter_knime_animals
+        raw = iter_knime_animals(args.csv)
+    elif args.synced:
+        raw = iter_synced_animals()
+    else:
+        raw = iter_animals()
+    if args.profile and not (args.snapshot or args.db):
+        # 로드와 전처리를 따로 재기 위해 프로파일링 때만 원본을 먼저 다 읽는다
+        with metrics.timer("animal_stage_seconds", stage="load"):
+            raw = list(raw)
+    if args.db:
+        # 조건/정렬은 SQLite 가 색인으로 처리하고 결과 행만 읽어 온다
+        animals = AnimalDB(args.db)
+    elif args.snapshot:
+        # 스냅샷은 이미 전처리된 컬럼 파일이라 mmap 만 하면 끝
+        with metrics.timer("animal_stage_seconds", stage="load_snapshot"):
+            animals = load_snapshot(args.snapshot)
+    elif args.no_cache:
+        animals = preprocess_animals(raw, workers=args.workers, chunk_size=args.chunk_size)
+    else:
+        with PreprocessCache(args.cache) as cache:
+            animals = preprocess_animals(raw, workers=args.workers,
+                                         chunk_size=args.chunk_size, cache=cache)
+        print(f"👉 전처리 캐시: 재사용 {cache.hits} / 새로 처리 {cache.misses}")
+    print(f"👉 데이터 로드 + 전처리 완료: {len(animals)} 마리")
 
     # 3) 사용자 입력 받기
     user_region = input("📍 당신의 지역을 입력하세요 (예: 서울): ")
     preferred_kind = input("🐾 원하는 품종이 있나요? (없으면 엔터): ")
 
-    # 4) 추천
-    result = recommend_animals(animals, user_region, preferred_kind)
+    # 4) 추천 (마감일 순으로 필요한 만큼만 꺼냄 — 전체 정렬 없음)
+    with metrics.timer("animal_stage_seconds", stage="recommend_first_page"):
+        if args.within_days is not None:
+            # 마감 임박 피드: 지난 공고를 빼고 N일 이내만 마감일 순으로 (재정렬 없음)
+            feed = UrgentFeed(animals)
+            feed.expire()
+            result = iter(iter_filter_animals(feed.within(args.within_days), kind=preferred_kind,
+                                              region=user_region, expand=args.region_scope))
+        elif args.rank == "score":
+            # 지역/품종은 거르지 않고 가산점으로만 반영
+            result = iter(AnimalScorer(animals).recommend(user_region, preferred_kind, limit=SCORE_LIMIT))
+        else:
+            result = recommend_animals(animals, user_region, preferred_kind, lazy=True,
+                                       expand=args.region_scope)
+        page = list(itertools.islice(result, PAGE_SIZE))
 
     print("\n===== 🐕 추천 결과 =====")
-    if not result:
+    if not page:
         print("❌ 조건에 맞는 유기동물이 없습니다.")
         return
 
-    for a in result:
-        print(f"[{a['noticeNo']}] {a['kindCd']} | {a['careNm']} | 마감일: {a['noticeEdt']}")
+    while page:
+        for a in page:
+            print(f"[{a['noticeNo']}] {a['kindCd']} | {a['careNm']} | 마감일: {a['noticeEdt']}")
+
+        page = list(itertools.islice(result, PAGE_SIZE))
+        if page and input("➕ 더 보려면 엔터, 그만 보려면 q: ").strip().lower() == "q":
+            break
 
     print("\n🎉 추천 완료!")
 
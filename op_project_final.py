@@ -14,19 +14,29 @@ client = genai.Client(api_key=api_key)
 # 🚨🚨🚨 CSV 파일 경로를 OneDrive 경로로 정확히 지정 (사용자 이름 변경 필수) 🚨🚨🚨
 csv_path = ''
 
-# 🚨 인코딩 오류(UnicodeDecodeError) 처리를 위한 try-except 구조 🚨
+# 🚨 인코딩은 파일 앞부분으로 자동 판별 (utf-8 / cp949), 한 번 읽으면 사이드카 캐시 재사용 🚨
+from src.csv_ingest import read_csv_cached
+
 try:
-    # 1. 한국어 환경에서 가장 흔한 'cp949'로 먼저 시도
-    df = pd.read_csv(csv_path, encoding='cp949')
+    df = read_csv_cached(csv_path)
 except UnicodeDecodeError:
-    try:
-        # 2. 실패 시 다른 한국어 인코딩인 'euc-kr'로 시도
-        df = pd.read_csv(csv_path, encoding='euc-kr')
-    except Exception as e:
-        # 3. 두 인코딩 모두 실패 시 오류 메시지 출력 후 종료
-        print(f"\n[치명적인 인코딩 오류]: 파일({csv_path})을 읽을 수 없습니다.")
-        print("인코딩 문제이거나 파일 내용 자체가 손상되었을 수 있습니다.")
-        sys.exit(1) # 프로그램 종료
+    # 어떤 인코딩으로도 읽을 수 없으면 오류 메시지 출력 후 종료
+    print(f"\n[치명적인 인코딩 오류]: 파일({csv_path})을 읽을 수 없습니다.")
+    print("인코딩 문제이거나 파일 내용 자체가 손상되었을 수 있습니다.")
+    sys.exit(1) # 프로그램 종료
+
+# --- (옵션) 전체 행 × 입양 희망자 프로필 일괄 컨설팅: python op_project_final.py --batch ---
+# 동시 요청/속도 제한/재시도/체크포인트는 src/consulting_batch.py 참고
+if "--batch" in sys.argv:
+    import asyncio
+    from src.consulting_batch import DEFAULT_PROFILES, run_batch
+
+    summary = asyncio.run(run_batch(
+        [str(p) for p in df['AI_Consulting_Prompt']], DEFAULT_PROFILES, api_key,
+        './data/consulting_results.jsonl',
+    ))
+    print(f"\n=== 일괄 컨설팅 완료: 성공 {summary['ok']} / 실패 {summary['failed']} / 이전 완료 {summary['skipped']} ===")
+    sys.exit(0)
 
 # 4) 첫 번째 행의 AI_Consulting_Prompt 추출
 animal_prompt = df.loc[0, 'AI_Consulting_Prompt'] 
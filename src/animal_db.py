@@ -0,0 +1,463 @@
+# src/animal_db.py
+"""
+SQLite 저장소 (FTS5 trigram 검색 + 마감일 B-tree 색인)
+
+메모리 리스트 대신 파일 하나에 전처리된 공고를 넣어 두고 여러 프로세스가 같이 읽는다.
+(RAM 보다 큰 데이터도 가능, WAL 모드라 읽는 중에도 쓰기 가능)
+
+    db = AnimalDB("./data/animals.sqlite")
+    db.upsert_many(iter_animals(path))                 # 큰 트랜잭션 단위로 일괄 반영
+    recommend_animals(db, "서울", "말티즈", limit=20)   # 조건/정렬/페이지를 SQL 한 번으로
+    filter_animals(db, kind="푸들", care="강서")
+
+- 품종 / 보호소 / 발생 장소 부분 검색은 FTS5 trigram 색인 (3글자 이상)
+  두 글자 이하 검색어는 trigram 으로 찾을 수 없어 instr() 로 훑는다.
+- 지역 질의(InRegion)는 (시도, 시군구, 읍면동) 컬럼 색인, 마감일/공고일은 ordinal 컬럼 색인
+- query 모듈의 조건식을 WHERE 절로 바꿔서 실행하고 (Predicate.sql),
+  SQL 로 바꿀 수 없는 조건이 섞이면 파이썬에서 걸러낸다.
+- 전처리 필드(날짜 / 품종 / 장소 / 지역 / 보호소 소문자)는 넣을 때 한 번 계산해서 컬럼에 두고,
+  읽을 때는 컬럼 값으로 dict 만 다시 만든다 (행마다 preprocess_animal 을 다시 돌리지 않음)
+"""
+import argparse
+import datetime
+import functools
+import itertools
+import json
+import os
+import sqlite3
+import threading
+
+from src.animal_utils import RecommendPage, decode_cursor, encode_cursor, parse_date
+from src.preprocess_animals import ADDED_FIELDS, clean_kind, clean_place
+from src.query import Contains, FieldStats
+from src.region import EXPAND_MODES, expand_provinces, parse_place
+
+DEFAULT_DB_PATH = "./data/animals.sqlite"
+
+# upsert_many 한 트랜잭션에 넣는 공고 수
+DEFAULT_BATCH_SIZE = 10000
+
+# 원본 공고 필드 (컬럼으로 저장) — 나머지 필드는 extra 에 JSON 으로
+FIELDS = (
+    "noticeNo", "noticeSdt", "noticeEdt", "kindCd", "colorCd", "age", "weight",
+    "sexCd", "neuterYn", "specialMark", "popfile", "careNm", "happenPlace",
+)
+
+# trigram 색인을 거는 필드 (animal_utils 의 filter_by_* 와 동일)
+FTS_FIELDS = ("kindCd", "careNm", "happenPlace")
+
+# trigram 은 3글자 단위라 이보다 짧은 검색어는 색인을 쓸 수 없음
+TRIGRAM = 3
+
+# 마감일이 없거나 파싱 실패한 공고의 정렬 키 (맨 뒤)
+MISSING_DEADLINE = datetime.date.max.toordinal()
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS animals (
+    id INTEGER PRIMARY KEY,
+    {", ".join(f"{f} TEXT" for f in FIELDS)},
+    extra TEXT,
+    sdt_ord INTEGER,
+    edt_key INTEGER NOT NULL,
+    sido TEXT NOT NULL,
+    sigungu TEXT NOT NULL,
+    dong TEXT NOT NULL,
+    kind_clean TEXT,
+    place_clean TEXT,
+    care_lower TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS animals_notice ON animals (noticeNo);
+CREATE INDEX IF NOT EXISTS animals_deadline ON animals (edt_key);
+CREATE INDEX IF NOT EXISTS animals_deadline_notice ON animals (edt_key, noticeNo);
+CREATE INDEX IF NOT EXISTS animals_start ON animals (sdt_ord);
+CREATE INDEX IF NOT EXISTS animals_region ON animals (sido, sigungu, dong);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS animals_fts USING fts5(
+    {", ".join(FTS_FIELDS)}, content='animals', content_rowid='id', tokenize='trigram'
+);
+"""
+
+# FTS 색인을 animals 테이블과 맞추는 트리거 (빈 저장소 첫 적재 때는 잠시 빼고 한 번에 rebuild)
+_FTS_COLUMNS = ", ".join(FTS_FIELDS)
+_FTS_NEW = ", ".join(f"new.{f}" for f in FTS_FIELDS)
+_FTS_OLD = ", ".join(f"old.{f}" for f in FTS_FIELDS)
+_TRIGGERS = {
+    "animals_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS animals_ai AFTER INSERT ON animals BEGIN
+            INSERT INTO animals_fts (rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW});
+        END""",
+    "animals_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS animals_ad AFTER DELETE ON animals BEGIN
+            INSERT INTO animals_fts (animals_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD});
+        END""",
+    "animals_au": f"""
+        CREATE TRIGGER IF NOT EXISTS animals_au AFTER UPDATE ON animals BEGIN
+            INSERT INTO animals_fts (animals_fts, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD});
+            INSERT INTO animals_fts (rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW});
+        END""",
+}
+
+# 전처리 필드 → 컬럼 (날짜는 sdt_ord / edt_key, region 은 sido / sigungu / dong)
+_DERIVED_COLUMNS = {"kindClean": "kind_clean", "placeClean": "place_clean", "careNm_lower": "care_lower"}
+
+_COLUMNS = FIELDS + ("extra", "sdt_ord", "edt_key", "sido", "sigungu", "dong") + tuple(_DERIVED_COLUMNS.values())
+
+_UPSERT = (
+    f"INSERT INTO animals ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+    f" ON CONFLICT (noticeNo) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS if c != "noticeNo")
+)
+
+# 읽을 때 쓰는 컬럼 (_record 가 이 순서로 푼다)
+_READ_COLUMNS = ("id",) + _COLUMNS
+_SELECT = f"SELECT {', '.join(_READ_COLUMNS)} FROM animals"
+_NOTICE_NO = _READ_COLUMNS.index("noticeNo")
+_EDT_KEY = _READ_COLUMNS.index("edt_key")
+
+# select 정렬 — deadline: 마감일 + 들어온 순 (sort_by_end_date 와 같음)
+#               page: 마감일 + noticeNo (recommend_animals 의 페이지/커서 키와 같음)
+_ORDERS = {None: "id", "deadline": "edt_key, id", "page": "edt_key, noticeNo"}
+
+# 전처리된 날짜 필드 → ordinal 컬럼 (DateRange)
+_DATE_COLUMNS = {"noticeSdt_parsed": "sdt_ord", "noticeEdt_parsed": "edt_key"}
+
+
+def _row_values(a):
+    sdt = parse_date(a.get("noticeSdt", "") or "")
+    edt = parse_date(a.get("noticeEdt", "") or "")
+    place = a.get("happenPlace", "") or ""
+    # 전처리 필드는 원본에서 새로 계산해서 전용 컬럼에 저장 (넘어온 값은 쓰지 않음)
+    extra = {k: v for k, v in a.items() if k not in FIELDS and k not in ADDED_FIELDS}
+    return (
+        *(a.get(f) for f in FIELDS),
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+        sdt.toordinal() if sdt else None,
+        edt.toordinal() if edt else MISSING_DEADLINE,
+        *parse_place(place),
+        clean_kind(a.get("kindCd", "") or ""),
+        clean_place(place),
+        (a.get("careNm", "") or "").lower(),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _date(ordinal):
+    if ordinal is None or ordinal == MISSING_DEADLINE:
+        return None
+    return datetime.date.fromordinal(ordinal)
+
+
+def _fts_phrase(keyword):
+    # FTS5 문자열 리터럴 (큰따옴표는 두 번)
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+# -------------------------------------
+# 저장소
+# -------------------------------------
+class AnimalDB:
+    """
+    animal_utils 의 filter_animals / recommend_animals / sort_by_end_date /
+    filter_by_* 에 리스트 대신 넘기면 조건과 정렬을 SQL 로 실행한다.
+    스레드마다 연결을 따로 열어서 Flask 스레드에서 같이 써도 된다.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self.conn
+        conn.executescript(_SCHEMA)
+        for ddl in _TRIGGERS.values():
+            conn.execute(ddl)
+        conn.commit()
+        self._migrate()
+
+    def _migrate(self):
+        """전처리 컬럼이 없던 예전 파일이면 컬럼을 추가하고 기존 행을 한 번 채운다."""
+        conn = self.conn
+        have = {row[1] for row in conn.execute("PRAGMA table_info(animals)")}
+        missing = [c for c in _DERIVED_COLUMNS.values() if c not in have]
+        if not missing:
+            return
+        with conn:
+            for column in missing:
+                conn.execute(f"ALTER TABLE animals ADD COLUMN {column} TEXT")
+            rows = conn.execute("SELECT id, kindCd, happenPlace, careNm FROM animals").fetchall()
+            conn.executemany(
+                "UPDATE animals SET kind_clean = ?, place_clean = ?, care_lower = ? WHERE id = ?",
+                [(clean_kind(kind or ""), clean_place(place or ""), (care or "").lower(), rid)
+                 for rid, kind, place, care in rows],
+            )
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- 쓰기 -----
+    def upsert_many(self, animals, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        공고를 noticeNo 기준으로 추가/교체 (batch_size 개마다 트랜잭션 하나) → 반영한 수
+        교체된 공고는 처음 들어온 자리(id)를 유지한다.
+        """
+        total = 0
+        it = iter(animals)
+        conn = self.conn
+        if not len(self):
+            return self._bulk_load(it, batch_size)
+        while True:
+            batch = [_row_values(a) for a in itertools.islice(it, batch_size) if a.get("noticeNo")]
+            if not batch:
+                return total
+            with conn:
+                conn.executemany(_UPSERT, batch)
+            total += len(batch)
+
+    def _bulk_load(self, it, batch_size):
+        """
+        빈 저장소 첫 적재: 행마다 도는 FTS 트리거 대신 다 넣은 뒤 색인을 한 번에 만든다.
+        (10만 건 기준 몇 배 빠름) 트리거 삭제/재생성까지 한 트랜잭션이라 도중에 실패하면 전부 취소된다.
+        """
+        total = 0
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            for name in _TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            while True:
+                batch = [_row_values(a) for a in itertools.islice(it, batch_size) if a.get("noticeNo")]
+                if not batch:
+                    break
+                conn.executemany(_UPSERT, batch)
+                total += len(batch)
+            conn.execute("INSERT INTO animals_fts (animals_fts) VALUES ('rebuild')")
+            for ddl in _TRIGGERS.values():
+                conn.execute(ddl)
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return total
+
+    def delete(self, notice_nos):
+        """noticeNo 목록 삭제 → 지운 수"""
+        keys = [(n,) for n in notice_nos]
+        with self.conn as conn:
+            before = conn.total_changes
+            conn.executemany("DELETE FROM animals WHERE noticeNo = ?", keys)
+            return conn.total_changes - before
+
+    def apply(self, ops):
+        """delta_sync.diff 결과(insert / update / expire) 반영"""
+        ops = list(ops)
+        self.upsert_many(op["record"] for op in ops if op["op"] != "expire")
+        self.delete(op["noticeNo"] for op in ops if op["op"] == "expire")
+
+    def expire(self, today=None):
+        """마감일이 today 이전인 공고 삭제 → 지운 수"""
+        cutoff = (today or datetime.date.today()).toordinal()
+        with self.conn as conn:
+            return conn.execute("DELETE FROM animals WHERE edt_key < ?", (cutoff,)).rowcount
+
+    # ----- 행 → dict -----
+    def _record(self, row):
+        # 저장해 둔 전처리 컬럼으로 preprocess_animal 결과와 같은 dict 를 만든다
+        (_, *values, extra, sdt_ord, edt_key, sido, sigungu, dong,
+         kind_clean, place_clean, care_lower) = row
+        a = {f: v for f, v in zip(FIELDS, values) if v is not None}
+        if extra:
+            a.update(json.loads(extra))
+        a["noticeSdt_parsed"] = _date(sdt_ord)
+        a["noticeEdt_parsed"] = _date(edt_key)
+        a["kindClean"] = kind_clean
+        a["placeClean"] = place_clean
+        a["region"] = (sido, sigungu, dong)
+        a["careNm_lower"] = care_lower
+        return a
+
+    def _rows(self, sql, params=()):
+        for row in self.conn.execute(sql, params):
+            yield self._record(row)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM animals").fetchone()[0]
+
+    def __iter__(self):
+        return self._rows(_SELECT + " ORDER BY id")
+
+    def get(self, notice_no):
+        row = self.conn.execute(_SELECT + " WHERE noticeNo = ?", (notice_no,)).fetchone()
+        return None if row is None else self._record(row)
+
+    # ----- 조건 → SQL (query.Predicate.sql 이 부른다) -----
+    def contains_sql(self, field, keyword):
+        keyword = keyword.lower()
+        if not keyword:
+            return "1", []
+        if field in FTS_FIELDS and len(keyword) >= TRIGRAM:
+            return f"id IN (SELECT rowid FROM animals_fts WHERE {field} MATCH ?)", [_fts_phrase(keyword)]
+        if field in FIELDS:
+            return f"instr(lower(COALESCE({field}, '')), ?) > 0", [keyword]
+        if field in _DERIVED_COLUMNS:
+            return f"instr(lower({_DERIVED_COLUMNS[field]}), ?) > 0", [keyword]
+        return f"instr(lower(COALESCE(json_extract(extra, ?), '')), ?) > 0", [f"$.{field}", keyword]
+
+    def equals_sql(self, field, value):
+        if field in FIELDS:
+            return f"COALESCE({field}, '') = ?", [value]
+        if field in _DERIVED_COLUMNS:
+            return f"{_DERIVED_COLUMNS[field]} = ?", [value]
+        return "COALESCE(json_extract(extra, ?), '') = ?", [f"$.{field}", value]
+
+    def date_sql(self, field, start, end):
+        column = _DATE_COLUMNS.get(field)
+        if column is None:
+            raise NotImplementedError(field)
+        clauses, params = [f"{column} IS NOT NULL", f"{column} < ?"], [MISSING_DEADLINE]
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(start.toordinal())
+        if end is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(end.toordinal())
+        return " AND ".join(clauses), params
+
+    def region_sql(self, query, expand=None):
+        sido, sigungu, dong = query
+        if expand in EXPAND_MODES and sido:
+            provinces = sorted(expand_provinces(sido, expand))
+            return f"sido IN ({', '.join('?' * len(provinces))})", provinces
+
+        clauses, params = [], []
+        if sido:
+            clauses.append("sido = ?")
+            params.append(sido)
+        if sigungu:
+            # '수원시' 질의는 '수원시 팔달구' 도 포함
+            clauses.append("(sigungu = ? OR substr(sigungu, 1, ?) = ?)")
+            params += [sigungu, len(sigungu) + 1, sigungu + " "]
+        if dong:
+            clauses.append("dong = ?")
+            params.append(dong)
+        return " AND ".join(clauses) or "1", params
+
+    def _where(self, pred):
+        """(WHERE 절, 인자, 파이썬에서 확인할 함수 또는 None)"""
+        if pred is None:
+            return "1", [], None
+        try:
+            clause, params = pred.sql(self)
+            return clause, params, None
+        except NotImplementedError:
+            return "1", [], pred.compile(FieldStats(()))
+
+    # ----- 조회 -----
+    def select(self, pred=None, order=None, limit=None, offset=0, after=None):
+        """
+        조건을 만족하는 ((마감일 ordinal, noticeNo), 동물) 이터레이터
+        order : None (들어온 순) / "deadline" / "page" (_ORDERS 참고)
+        after : (마감일 ordinal, noticeNo) — 이 키 다음부터 (커서 페이지, order="page")
+        """
+        clause, params, check = self._where(pred)
+        sql = f"{_SELECT} WHERE ({clause})"
+        if after is not None:
+            sql += " AND (edt_key, noticeNo) > (?, ?)"
+            params = params + list(after)
+        sql += f" ORDER BY {_ORDERS[order]}"
+        if check is None and (limit is not None or offset):
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [-1 if limit is None else limit, offset]
+
+        def gen():
+            for row in self.conn.execute(sql, params):
+                a = self._record(row)
+                if check is None or check(a):
+                    yield (row[_EDT_KEY], row[_NOTICE_NO]), a
+
+        rows = gen()
+        if check is not None and (limit is not None or offset):
+            rows = itertools.islice(rows, offset, None if limit is None else offset + limit)
+        return rows
+
+    def search(self, field, keyword):
+        return [a for _, a in self.select(Contains(field, keyword))]
+
+    def sorted_by_end_date(self, rows=None):
+        """
+        마감일 순 (날짜 없는 동물은 맨 뒤) — rows 를 주면 그 동물들만
+        """
+        if rows is None:
+            return [a for _, a in self.select(order="deadline")]
+
+        def key(a):
+            d = a.get("noticeEdt_parsed")
+            return d.toordinal() if d else MISSING_DEADLINE
+        return sorted(rows, key=key)
+
+    def recommend(self, pred, limit=None, offset=0, cursor=None, lazy=False):
+        """
+        recommend_animals 의 SQL 버전 — 조건, 마감일 정렬, 페이지를 쿼리 한 번으로
+        cursor 는 recommend_animals 와 같은 (마감일 ordinal, noticeNo) 라 백엔드가 바뀌어도 이어진다.
+        """
+        after = decode_cursor(cursor) if cursor is not None else None
+        if limit is None and cursor is None and not lazy and not offset:
+            return RecommendPage(a for _, a in self.select(pred, "deadline"))
+        if lazy:
+            return (a for _, a in self.select(pred, "page", limit, offset, after))
+        if limit is None:
+            return RecommendPage(a for _, a in self.select(pred, "page", None, offset, after))
+
+        # 한 개 더 읽어서 다음 페이지가 있는지 확인
+        rows = list(self.select(pred, "page", limit + 1, offset, after))
+        page = RecommendPage(a for _, a in rows[:limit])
+        if len(rows) > limit:
+            page.next_cursor = encode_cursor(rows[limit - 1][0])
+        return page
+
+    def stats(self):
+        conn = self.conn
+        total = conn.execute("SELECT COUNT(*) FROM animals").fetchone()[0]
+        dated = conn.execute("SELECT COUNT(*) FROM animals WHERE edt_key < ?", (MISSING_DEADLINE,)).fetchone()[0]
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"animals": total, "with_deadline": dated, "bytes": size}
+
+
+if __name__ == "__main__":
+    import time
+
+    parser = argparse.ArgumentParser(description="공고 SQLite 저장소")
+    parser.add_argument("command", choices=("load", "expire", "stats"))
+    parser.add_argument("path", nargs="?", default=None, help="load: 공고 JSON (기본: fetch_animals 기본 경로)")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with AnimalDB(args.db) as db:
+        if args.command == "load":
+            from src.fetch_animals import iter_animals
+
+            started = time.perf_counter()
+            n = db.upsert_many(iter_animals(args.path) if args.path else iter_animals(), args.batch_size)
+            print(f"공고 {n}건 반영 ({time.perf_counter() - started:.1f}초)")
+        elif args.command == "expire":
+            print(f"마감 지난 공고 {db.expire()}건 삭제")
+        stats = db.stats()
+        print(f"{args.db}: 공고 {stats['animals']}건 (마감일 있음 {stats['with_deadline']}) / "
+              f"{stats['bytes'] / (1024 * 1024):.1f}MB")
@@ -0,0 +1,177 @@
+# src/animal_index.py
+from collections import defaultdict
+
+from src.region import RegionIndex, parse_place
+
+# 부분 검색을 지원할 필드 (animal_utils 의 filter_by_* 와 동일)
+INDEX_FIELDS = ("kindCd", "careNm", "happenPlace")
+
+
+# -----------------------------
+#  n-gram 유틸
+# -----------------------------
+def ngrams(text, n):
+    """
+    '말티즈' → {'말티', '티즈'} (n=2)
+    """
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+# -----------------------------
+#  필드 하나의 역색인
+# -----------------------------
+class _FieldIndex:
+    """
+    같은 값이 반복되는 경우가 많으므로 (보호소명, 품종 등)
+    n-gram 은 '고유 값' 단위로 색인하고, 값마다 레코드 번호 목록을 따로 둔다.
+
+    - values[v]   : 고유 값(소문자)
+    - postings[v] : 그 값을 가진 레코드 번호 (오름차순)
+    - grams[g]    : n-gram g 를 포함하는 고유 값 번호 집합 (2-gram, 3-gram)
+    """
+
+    def __init__(self):
+        self.values = []
+        self.value_ids = {}
+        self.postings = []
+        self.grams = defaultdict(set)
+
+    def add(self, rid, value):
+        value = (value or "").lower()
+
+        vid = self.value_ids.get(value)
+        if vid is None:
+            vid = len(self.values)
+            self.value_ids[value] = vid
+            self.values.append(value)
+            self.postings.append([])
+            for n in (2, 3):
+                for g in ngrams(value, n):
+                    self.grams[g].add(vid)
+
+        self.postings[vid].append(rid)
+
+    def match_values(self, keyword):
+        """
+        keyword 를 부분 문자열로 포함하는 고유 값 번호 목록
+        """
+        if len(keyword) == 1:
+            # 1글자는 고유 값만 훑어도 충분히 빠름 (레코드 수와 무관)
+            return [v for v, text in enumerate(self.values) if keyword in text]
+
+        if len(keyword) == 2:
+            # 2-gram 은 그 자체로 정확한 부분 문자열 매칭
+            return list(self.grams.get(keyword, ()))
+
+        # 3글자 이상: 3-gram 후보 교집합 → 실제 포함 여부 확인
+        sets = []
+        for g in ngrams(keyword, 3):
+            s = self.grams.get(g)
+            if not s:
+                return []
+            sets.append(s)
+        sets.sort(key=len)
+
+        candidates = set(sets[0])
+        for s in sets[1:]:
+            candidates &= s
+            if not candidates:
+                return []
+
+        return [v for v in candidates if keyword in self.values[v]]
+
+    def lookup(self, keyword):
+        """
+        keyword 를 포함하는 레코드 번호 (오름차순)
+        """
+        ids = []
+        for v in self.match_values(keyword):
+            ids.extend(self.postings[v])
+        ids.sort()
+        return ids
+
+
+# -----------------------------
+#  동물 목록 n-gram 색인
+# -----------------------------
+class AnimalIndex:
+    """
+    전처리된 동물 리스트로 한 번만 만들어 두고 계속 재사용하는 검색 색인
+
+    filter_by_kind / filter_by_care_name / filter_by_region 에
+    리스트 대신 넘기면 전체를 훑지 않고 색인으로 결과를 찾는다.
+    (결과 순서와 부분 검색 의미는 리스트 버전과 동일)
+
+        index = AnimalIndex(preprocess_animals(raw))
+        filter_animals(index, kind="말티즈", region="서울")
+    """
+
+    def __init__(self, animals, fields=INDEX_FIELDS):
+        self.records = list(animals)
+        self.fields = {f: _FieldIndex() for f in fields}
+        self._regions = None
+
+        for rid, a in enumerate(self.records):
+            for field, fi in self.fields.items():
+                fi.add(rid, a.get(field, ""))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, i):
+        return self.records[i]
+
+    def lookup(self, field, keyword):
+        """
+        field 에 keyword 가 포함된 레코드 번호 리스트 (오름차순)
+        """
+        keyword = keyword.lower()
+        if not keyword:
+            return list(range(len(self.records)))
+
+        fi = self.fields.get(field)
+        if fi is None:
+            # 색인하지 않은 필드는 그냥 훑는다
+            return [i for i, a in enumerate(self.records)
+                    if keyword in (a.get(field, "") or "").lower()]
+
+        return fi.lookup(keyword)
+
+    def region_lookup(self, query, expand=None):
+        """
+        (시도, 시군구, 읍면동) 질의에 해당하는 레코드 번호 리스트 (오름차순)
+        지역 색인은 처음 찾을 때 한 번만 만든다.
+        """
+        if self._regions is None:
+            index = RegionIndex()
+            for rid, a in enumerate(self.records):
+                index.add(rid, a.get("region") or parse_place(a.get("happenPlace", "") or ""))
+            self._regions = index
+        return self._regions.lookup(query, expand)
+
+    def search(self, field, keyword):
+        """
+        field 에 keyword 가 포함된 동물 리스트
+        """
+        return [self.records[i] for i in self.lookup(field, keyword)]
+
+    def search_all(self, criteria):
+        """
+        {필드: 키워드} 조건을 모두 만족하는 동물 리스트 (AND)
+        결과가 작은 조건부터 교집합을 구한다.
+        """
+        id_lists = [self.lookup(f, kw) for f, kw in criteria.items()]
+        if not id_lists:
+            return list(self.records)
+
+        id_lists.sort(key=len)
+        ids = set(id_lists[0])
+        for other in id_lists[1:]:
+            ids.intersection_update(other)
+            if not ids:
+                return []
+
+        return [self.records[i] for i in sorted(ids)]
@@ -0,0 +1,344 @@
+# src/animal_store.py
+import datetime
+from array import array
+from itertools import compress
+
+from src.animal_utils import parse_date
+from src.preprocess_animals import clean_kind, clean_place
+from src.region import RegionIndex, parse_place
+
+# -------------------------------------
+# 컬럼 구성
+# -------------------------------------
+# 반복되는 문자열 → 정수 코드 + 카테고리 목록
+CATEGORICAL_FIELDS = ("kindCd", "careNm", "colorCd", "sexCd", "neuterYn", "happenPlace")
+
+# 'YYYYMMDD' 문자열 → int32 ordinal (0 = 파싱 실패/없음)
+DATE_FIELDS = ("noticeSdt", "noticeEdt")
+
+# 거의 고유한 값이라 그대로 보관하는 문자열
+TEXT_FIELDS = ("noticeNo", "age", "weight", "specialMark", "popfile")
+
+# 원본 공고의 필드 순서
+FIELDS = (
+    "noticeNo", "noticeSdt", "noticeEdt", "kindCd", "colorCd", "age", "weight",
+    "sexCd", "neuterYn", "specialMark", "popfile", "careNm", "happenPlace",
+)
+
+# preprocess_animals 가 추가하는 필드 → (원본 카테고리 필드, 변환 함수)
+# 카테고리마다 한 번만 계산하면 되므로 레코드별로 저장하지 않는다.
+DERIVED_FIELDS = {
+    "kindClean": ("kindCd", clean_kind),
+    "placeClean": ("happenPlace", clean_place),
+    "region": ("happenPlace", parse_place),
+    "careNm_lower": ("careNm", lambda s: s.lower()),
+}
+
+PARSED_FIELDS = {
+    "noticeSdt_parsed": "noticeSdt",
+    "noticeEdt_parsed": "noticeEdt",
+}
+
+MISSING_DATE = 0
+
+
+# -------------------------------------
+# 카테고리 컬럼
+# -------------------------------------
+class CategoricalColumn:
+    """
+    codes[i] 는 categories 안의 위치
+    같은 보호소명/품종이 수천 번 반복돼도 문자열은 한 번만 저장된다.
+    """
+
+    def __init__(self):
+        self.categories = []
+        self.lookup = {}
+        self.codes = array("I")
+
+    def append(self, value):
+        value = value or ""
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.lookup[value] = code
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i):
+        return self.categories[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def matching_codes(self, predicate):
+        """
+        predicate 를 카테고리마다 한 번씩만 평가 → 만족하는 코드 집합
+        """
+        return {c for c, v in enumerate(self.categories) if predicate(v)}
+
+    def mask(self, codes):
+        """
+        코드 집합에 속하는지 여부를 행 단위로 (C 레벨 map)
+        """
+        return map(codes.__contains__, self.codes)
+
+
+# -------------------------------------
+# 날짜 컬럼
+# -------------------------------------
+class DateColumn:
+    """
+    날짜를 int32 ordinal 로 저장
+    파싱에 실패한 원본 문자열은 raw 에 따로 보관해서 그대로 돌려준다.
+    """
+
+    def __init__(self):
+        self.ordinals = array("i")
+        self.raw = {}
+
+    def append(self, value):
+        d = parse_date(value or "")
+        if d is None:
+            self.ordinals.append(MISSING_DATE)
+        else:
+            self.ordinals.append(d.toordinal())
+
+        # 'YYYYMMDD' 가 아닌 원본은 복원할 수 없으니 그대로 보관
+        if value and (d is None or len(value) != 8):
+            self.raw[len(self.ordinals) - 1] = value
+
+    def date(self, i):
+        o = self.ordinals[i]
+        return datetime.date.fromordinal(o) if o != MISSING_DATE else None
+
+    def __getitem__(self, i):
+        o = self.ordinals[i]
+        if o == MISSING_DATE or i in self.raw:
+            return self.raw.get(i, "")
+        return datetime.date.fromordinal(o).strftime("%Y%m%d")
+
+    def __len__(self):
+        return len(self.ordinals)
+
+
+# -------------------------------------
+# 한 행을 dict 처럼 보여주는 뷰
+# -------------------------------------
+class AnimalRow:
+    """
+    AnimalStore 의 i 번째 동물
+    a["kindCd"], a.get("noticeEdt_parsed") 처럼 기존 dict 코드가 그대로 동작한다.
+    """
+
+    __slots__ = ("store", "i")
+
+    def __init__(self, store, i):
+        self.store = store
+        self.i = i
+
+    def __getitem__(self, key):
+        return self.store.value(self.i, key)
+
+    def get(self, key, default=None):
+        try:
+            return self.store.value(self.i, key)
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def keys(self):
+        return self.store.row_keys(self.i)
+
+    def items(self):
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"AnimalRow({self.to_dict()!r})"
+
+
+# -------------------------------------
+# 컬럼형 저장소
+# -------------------------------------
+class AnimalStore:
+    """
+    list-of-dict 대신 필드별 컬럼으로 동물 목록을 저장
+
+        store = AnimalStore.from_records(iter_animals(path))
+        filter_animals(store, kind="말티즈", region="서울")
+
+    animal_utils 의 filter_by_* / filter_animals / sort_by_end_date 에
+    리스트 대신 넘기면 카테고리 단위로 조건을 평가하고 코드 컬럼만 훑는다.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.present = set()  # 한 번이라도 등장한 원본 필드
+        self.categorical = {f: CategoricalColumn() for f in CATEGORICAL_FIELDS}
+        self.dates = {f: DateColumn() for f in DATE_FIELDS}
+        self.text = {f: [] for f in TEXT_FIELDS}
+        self.extras = {}      # 행 번호 → 알 수 없는 필드 dict (드물게만 생김)
+        self._derived = {}    # (파생 필드, 카테고리 코드) → 값
+        self._regions = None  # RegionIndex (지역 검색 때 처음 만듦)
+
+    @classmethod
+    def from_records(cls, animals):
+        store = cls()
+        for a in animals:
+            store.append(a)
+        return store
+
+    def append(self, a):
+        for f, col in self.categorical.items():
+            col.append(a.get(f, ""))
+        for f, col in self.dates.items():
+            col.append(a.get(f, ""))
+        for f, col in self.text.items():
+            col.append(a.get(f, "") or "")
+
+        extra = None
+        for k in a:
+            if k in self.text or k in self.categorical or k in self.dates:
+                self.present.add(k)
+            elif k not in DERIVED_FIELDS and k not in PARSED_FIELDS:
+                if extra is None:
+                    extra = {}
+                extra[k] = a[k]
+        if extra:
+            self.extras[self.n] = extra
+
+        self.n += 1
+        self._regions = None
+
+    # ----- 행 접근 -----
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return AnimalRow(self, i)
+
+    def __iter__(self):
+        return (AnimalRow(self, i) for i in range(self.n))
+
+    def rows(self, ids):
+        return [AnimalRow(self, i) for i in ids]
+
+    def row_keys(self, i):
+        keys = [f for f in FIELDS if f in self.present]
+        keys.extend(PARSED_FIELDS)
+        keys.extend(DERIVED_FIELDS)
+        keys.extend(self.extras.get(i, ()))
+        return keys
+
+    def value(self, i, key):
+        col = self.categorical.get(key)
+        if col is not None:
+            return col[i]
+        col = self.text.get(key)
+        if col is not None:
+            return col[i]
+        col = self.dates.get(key)
+        if col is not None:
+            return col[i]
+        if key in PARSED_FIELDS:
+            return self.dates[PARSED_FIELDS[key]].date(i)
+        if key in DERIVED_FIELDS:
+            return self._derived_value(key, i)
+        return self.extras.get(i, {})[key]
+
+    def _derived_value(self, key, i):
+        source, fn = DERIVED_FIELDS[key]
+        code = self.categorical[source].codes[i]
+        cache_key = (key, code)
+        v = self._derived.get(cache_key)
+        if v is None:
+            v = fn(self.categorical[source].categories[code])
+            self._derived[cache_key] = v
+        return v
+
+    # ----- 컬럼 단위 검색 -----
+    def lookup(self, field, keyword):
+        """
+        field 에 keyword 가 포함된 행 번호 리스트 (오름차순)
+        """
+        keyword = keyword.lower()
+
+        col = self.categorical.get(field)
+        if col is not None:
+            codes = col.matching_codes(lambda v: keyword in v.lower())
+            return list(compress(range(self.n), col.mask(codes)))
+
+        return [i for i in range(self.n)
+                if keyword in (self.value(i, field) or "").lower()]
+
+    def search(self, field, keyword):
+        return self.rows(self.lookup(field, keyword))
+
+    def region_lookup(self, query, expand=None):
+        """
+        (시도, 시군구, 읍면동) 질의에 해당하는 행 번호 리스트 (오름차순)
+        장소 파싱은 happenPlace 카테고리마다 한 번, 색인은 처음 찾을 때 한 번만 만든다.
+        """
+        if self._regions is None:
+            col = self.categorical["happenPlace"]
+            regions = [parse_place(c) for c in col.categories]
+            index = RegionIndex()
+            for i, code in enumerate(col.codes):
+                index.add(i, regions[code])
+            self._regions = index
+        return self._regions.lookup(query, expand)
+
+    def search_all(self, criteria):
+        """
+        {필드: 키워드} 를 모두 만족하는 행 (AND)
+        """
+        if not criteria:
+            return list(self)
+
+        masks = []
+        for field, keyword in criteria.items():
+            col = self.categorical.get(field)
+            if col is None:
+                masks.append(None)
+                continue
+            kw = keyword.lower()
+            masks.append((col, col.matching_codes(lambda v: kw in v.lower())))
+
+        # 하나라도 만족하는 카테고리가 없으면 바로 빈 결과
+        if any(m is not None and not m[1] for m in masks):
+            return []
+
+        ids = range(self.n)
+        for (field, keyword), m in zip(criteria.items(), masks):
+            if m is None:
+                keep = set(self.lookup(field, keyword))
+                ids = [i for i in ids if i in keep]
+            else:
+                col, codes = m
+                col_codes = col.codes
+                ids = [i for i in ids if col_codes[i] in codes]
+
+        return self.rows(ids)
+
+    def sorted_by_end_date(self, rows=None):
+        """
+        noticeEdt ordinal 기준 오름차순 (날짜 없는 동물은 맨 뒤)
+        rows 를 주면 그 행들만 정렬
+        """
+        ords = self.dates["noticeEdt"].ordinals
+        last = datetime.date.max.toordinal()
+
+        def key(i):
+            return ords[i] or last
+
+        ids = range(self.n) if rows is None else [r.i for r in rows]
+        return self.rows(sorted(ids, key=key))
@@ -1,27 +1,56 @@
 # src/animal_utils.py
 import datetime
+import functools
+import heapq
+import itertools
 import re
 
+from src import metrics
+from src.query import And, Contains, InRegion, run_query
+
 # -----------------------------
 #  날짜 관련 유틸
 # -----------------------------
+@functools.lru_cache(maxsize=4096)
+def _parse_date_cached(date_str):
+    # 공고 날짜는 대부분 'YYYYMMDD' 8자리 → strptime 대신 슬라이싱
+    # (8자리 숫자에 대해서는 strptime('%Y%m%d') 와 결과가 같다)
+    if len(date_str) == 8 and date_str.isascii() and date_str.isdigit():
+        try:
+            return datetime.date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+        except ValueError:
+            return None
+
+    try:
+        return datetime.datetime.strptime(date_str, "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
 def parse_date(date_str):
     """
     '20250131' 같은 문자열을 datetime.date 객체로 변환
+
+    공고 날짜는 고유 값이 수백 개뿐이라 결과를 메모이즈한다.
+    (preprocess_animals 도 이 함수를 같이 쓴다)
     """
-    try:
-        return datetime.datetime.strptime(date_str, "%Y%m%d").date()
-    except:
+    if not isinstance(date_str, str):
         return None
+    return _parse_date_cached(date_str)
 
 
 # -----------------------------
 #  1) 마감일 기준 정렬
 # -----------------------------
+@metrics.timed("animal_stage_seconds", stage="sort_by_end_date")
 def sort_by_end_date(animals):
     """
     animals 리스트를 보호 종료일(noticeEdt) 기준으로 오름차순 정렬
     """
+    if hasattr(animals, "sorted_by_end_date"):
+        # AnimalStore 는 이미 int32 ordinal 컬럼을 갖고 있음
+        return animals.sorted_by_end_date()
+
     def get_end_date(a):
         return parse_date(a.get("noticeEdt", "")) or datetime.date.max
 
@@ -31,10 +60,15 @@ def sort_by_end_date(animals):
 # -----------------------------
 #  2) 품종/종 검색 (부분 검색)
 # -----------------------------
+@metrics.timed("animal_stage_seconds", stage="filter_by_kind")
 def filter_by_kind(animals, keyword):
     """
     품종(keyword)이 포함된 동물만 필터링
     """
+    if hasattr(animals, "search"):
+        # AnimalIndex 가 넘어오면 전체를 훑지 않고 n-gram 색인으로 검색
+        return animals.search("kindCd", keyword)
+
     keyword = keyword.lower()
 
     result = []
@@ -49,10 +83,14 @@ def filter_by_kind(animals, keyword):
 # -----------------------------
 #  3) 보호소명 검색
 # -----------------------------
+@metrics.timed("animal_stage_seconds", stage="filter_by_care_name")
 def filter_by_care_name(animals, keyword):
     """
     보호소명에 keyword가 포함된 동물만
     """
+    if hasattr(animals, "search"):
+        return animals.search("careNm", keyword)
+
     keyword = keyword.lower()
 
     result = []
@@ -66,56 +104,174 @@ def filter_by_care_name(animals, keyword):
 # -----------------------------
 #  4) 지역 검색 (도/시 포함)
 # -----------------------------
-def filter_by_region(animals, keyword):
+@metrics.timed("animal_stage_seconds", stage="filter_by_region")
+def filter_by_region(animals, keyword, expand=None):
     """
     관할 지역(원래는 orgNm 등)이 keyword 포함
     mock 데이터에서는 'happenPlace'로 대체 가능
-    """
-    keyword = keyword.lower()
-    result = []
-
-    for a in animals:
-        place = a.get("happenPlace", "").lower()
-        if keyword in place:
-            result.append(a)
 
-    return result
+    keyword 가 '서울', '서울 강서구', '수원시' 처럼 지역으로 해석되면
+    (시도, 시군구, 읍면동) 단위로 비교하고 (src.region 참고),
+    아니면 예전처럼 happenPlace 부분 검색을 한다.
+    expand: None / "province" (같은 시도 전체) / "neighbors" (맞닿은 시도까지)
+    """
+    return list(run_query(animals, InRegion(keyword, expand)))
 
 
 # -----------------------------
 #  5) 다중 필터 (복합 조건)
 # -----------------------------
-def filter_animals(animals, kind=None, region=None, care=None):
-    result = animals
+@metrics.timed("animal_stage_seconds", stage="filter_animals")
+def filter_animals(animals, kind=None, region=None, care=None, where=None, expand=None):
+    """
+    품종/지역/보호소 조건을 모두 만족하는 동물 (AND) 리스트
 
-    if kind:
-        result = filter_by_kind(result, kind)
+    조건들은 query 모듈에서 하나로 합쳐져 한 번의 순회
+    (또는 색인 교집합 한 번)로 처리된다.
+    where 에 Contains / Equals 를 &, |, ~ 로 조합한 조건을 추가로 줄 수 있다.
+    expand 는 지역 확장 범위 (filter_by_region 참고)
+    조건이 없으면 animals 를 그대로 반환
+    """
+    if _build_predicate(kind, region, care, where, expand) is None:
+        return animals
+    return list(iter_filter_animals(animals, kind, region, care, where, expand))
+
+
+def iter_filter_animals(animals, kind=None, region=None, care=None, where=None, expand=None):
+    """
+    filter_animals 의 지연 계산 버전 (query.QueryResult — 순회할 때 계산)
+    앞의 몇 개만 필요할 때 (islice 등) 전체를 거르지 않는다.
+    """
+    pred = _build_predicate(kind, region, care, where, expand)
+    if pred is None:
+        return animals
+
+    return run_query(animals, pred)
 
-    if region:
-        result = filter_by_region(result, region)
 
+def _build_predicate(kind=None, region=None, care=None, where=None, expand=None):
+    """filter_animals 조건 → And 조건식 (조건이 없으면 None)"""
+    preds = []
+    if kind:
+        preds.append(Contains("kindCd", kind))
+    if region:
+        preds.append(InRegion(region, expand))
     if care:
-        result = filter_by_care_name(result, care)
+        preds.append(Contains("careNm", care))
+    if where is not None:
+        preds.append(where)
 
-    return result
+    return And(*preds) if preds else None
+
+
+# -----------------------------
+#  6) 추천 결과 페이지 / 커서
+# -----------------------------
+class RecommendPage(list):
+    """
+    recommend_animals 의 한 페이지 (일반 리스트와 동일하게 쓰면 됨)
+    next_cursor 를 다음 호출의 cursor 로 넘기면 이어지는 페이지를 받는다.
+    더 없으면 None.
+    """
+    next_cursor = None
+
+
+def _end_ordinal(a):
+    d = a.get("noticeEdt_parsed") or parse_date(a.get("noticeEdt", ""))
+    return d.toordinal() if d else datetime.date.max.toordinal()
+
+
+def _page_key(a):
+    """
+    페이지/커서 정렬 키 (마감일 ordinal, noticeNo)
+    목록 안 위치가 아니라 공고 자체로 정해지므로, 다시 읽거나 동기화로 앞쪽 공고가
+    늘거나 줄어도 이전 커서가 같은 자리를 가리킨다.
+    """
+    return _end_ordinal(a), a.get("noticeNo") or ""
+
+
+def encode_cursor(key):
+    """(마감일 ordinal, noticeNo) → 'ordinal-noticeNo' 문자열"""
+    return f"{key[0]}-{key[1]}"
+
+
+def decode_cursor(cursor):
+    try:
+        ordinal, notice_no = cursor.split("-", 1)
+        return int(ordinal), notice_no
+    except (AttributeError, ValueError):
+        raise ValueError(f"잘못된 cursor 입니다: {cursor!r}")
+
+
+def _iter_by_end_date(keyed):
+    """
+    (키, 동물) 목록을 heapify 한 뒤 하나씩 꺼냄
+    전체 정렬 없이 앞쪽부터 필요한 만큼만 O(log N) 씩 계산된다.
+    """
+    heapq.heapify(keyed)
+    while keyed:
+        yield heapq.heappop(keyed)
 
 
 # -----------------------------
-#  6) 추천 시스템 예시
+#  7) 추천 시스템 예시
 # -----------------------------
-def recommend_animals(animals, user_region, preferred_kind=None):
+@metrics.timed("animal_stage_seconds", stage="recommend_animals")
+def recommend_animals(animals, user_region, preferred_kind=None,
+                      limit=None, offset=0, cursor=None, lazy=False,
+                      care=None, where=None, expand=None):
     """
     - 지역 우선 필터링
     - 품종(선택)
     - 마감일 정렬
+
+    care / where   : filter_animals 와 같은 추가 조건 (보호소명, query 조건식)
+    expand         : 지역 확장 — "province" 같은 시도 전체, "neighbors" 맞닿은 시도까지
+    limit / offset : 마감일 순으로 offset 번째부터 limit 개만 반환
+                     (크기 offset+limit 힙으로 top-k 만 계산, O(N log k))
+    cursor         : 이전 페이지의 next_cursor — 그 뒤부터 limit 개
+    lazy=True      : 마감일 순으로 하나씩 꺼내는 이터레이터 반환
+
+    아무 옵션도 주지 않으면 기존처럼 전체를 정렬한 리스트를 반환한다.
+    (마감일이 같으면 원래 순서를 유지 — sort_by_end_date 와 동일)
+    limit / offset / cursor / lazy 를 쓰면 마감일이 같을 때 noticeNo 순이다.
     """
-    # 지역 (예: '서울', '부산')
-    filtered = filter_by_region(animals, user_region)
+    if hasattr(animals, "recommend") and hasattr(animals, "select"):
+        # AnimalDB: 조건 + 마감일 정렬 + 페이지를 SQL 한 번으로 (커서는 이 DB 에서 받은 것만)
+        pred = _build_predicate(preferred_kind, user_region, care, where, expand)
+        return animals.recommend(pred, limit=limit, offset=offset, cursor=cursor, lazy=lazy)
+
+    # 지역 (예: '서울', '부산') + 품종(선택)
+    filtered = iter_filter_animals(animals, kind=preferred_kind, region=user_region,
+                                   care=care, where=where, expand=expand)
+
+    if limit is None and cursor is None and not lazy and not offset:
+        # 마감일 빠른 순
+        if hasattr(animals, "sorted_by_end_date"):
+            return animals.sorted_by_end_date(filtered)
+        return sort_by_end_date(filtered)
+
+    # 키 = (마감일 ordinal, noticeNo, 순번) — 순번은 noticeNo 가 겹칠 때 동물끼리 비교하지 않도록
+    keyed = [(_page_key(a) + (seq,), a) for seq, a in enumerate(filtered)]
+
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        keyed = [ka for ka in keyed if ka[0][:2] > after]
 
-    if preferred_kind:
-        filtered = filter_by_kind(filtered, preferred_kind)
+    if lazy:
+        ordered = _iter_by_end_date(keyed)
+        if offset:
+            ordered = itertools.islice(ordered, offset, None)
+        if limit is not None:
+            ordered = itertools.islice(ordered, limit)
+        return (a for _, a in ordered)
 
-    # 마감일 빠른 순
-    filtered = sort_by_end_date(filtered)
+    if limit is None:
+        top = sorted(keyed, key=lambda ka: ka[0])[offset:]
+    else:
+        top = heapq.nsmallest(offset + limit, keyed, key=lambda ka: ka[0])[offset:]
 
-    return filtered
+    page = RecommendPage(a for _, a in top)
+    if limit is not None and len(top) == limit and len(keyed) > offset + limit:
+        page.next_cursor = encode_cursor(top[-1][0][:2])
+    return page
@@ -0,0 +1,258 @@
+# src/consulting_batch.py
+"""
+긴급 입양 동물 × 입양 희망자 프로필 전체를 Gemini 로 일괄 컨설팅하는 배치 실행기
+
+- 동시 요청 수 제한 (worker 수 = concurrency)
+- 토큰 버킷으로 초당 요청 수 제한
+- 429 / 5xx / 네트워크 오류는 지터를 섞은 지수 백오프로 재시도
+- 결과를 JSONL 로 한 줄씩 기록 → 중간에 죽어도 같은 명령으로 이어서 실행
+
+    python -m src.consulting_batch --csv final_urgent_prompts.csv --out data/consulting.jsonl
+    python -m src.consulting_batch --animals data/animals_2025-11-29.json   # 프롬프트 직접 생성
+
+로컬 스텁 서버(src.stub_server)에 --base-url 로 붙여서 API 키 없이 확인할 수 있다.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.http_client import RETRY_STATUS, backoff_delay
+from src.llm_client import GEMINI_BASE_URL, gemini_generate
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+PROMPT_COLUMN = "AI_Consulting_Prompt"
+
+# 입양 희망자 프로필 예시 (op_project_final.py 시연용 환경 + 추가 프로필)
+DEFAULT_PROFILES = [
+    "입양 희망자는 30대 싱글 직장인이며, 반려 동물을 기른 경험이 전혀 없습니다.\n"
+    "주거 형태는 아파트이고, 하루 6시간 이상 집을 비웁니다.",
+    "입양 희망자는 초등학생 자녀 2명을 둔 4인 가족이며, 마당이 있는 단독주택에 삽니다.\n"
+    "예전에 중형견을 10년 이상 키운 경험이 있습니다.",
+    "입양 희망자는 60대 은퇴 부부이며, 하루 대부분을 집에서 보냅니다.\n"
+    "주거 형태는 엘리베이터가 있는 아파트이고, 산책을 자주 나갑니다.",
+]
+
+
+def build_query(animal_prompt, user_env):
+    """op_project_final.py 와 같은 형식의 최종 프롬프트"""
+    return f"""
+{animal_prompt}
+
+#사용자 환경: {user_env}
+
+#요청: 이 동물과 사용자의 환경을 비교하여 입양 적합도 점수(10점 만점)와 상세 컨설팅 의견을 'JSON 형식'으로 출력해 주세요.
+"""
+
+
+# -------------------------------------
+# 속도 제한
+# -------------------------------------
+class TokenBucket:
+    """
+    초당 rate 개씩 토큰이 차고 최대 capacity 개까지 모이는 버킷
+    acquire() 는 토큰이 생길 때까지 기다린다.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RetryableError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# -------------------------------------
+# Gemini 호출 (동기, 스레드에서 실행)
+# -------------------------------------
+def generate_content(text, api_key, model=DEFAULT_MODEL, base_url=GEMINI_BASE_URL, timeout=(5, 120)):
+    """
+    generateContent 한 번 호출 → 응답 텍스트 (llm_client 의 공유 커넥션 풀 사용)
+    재시도할 만한 실패는 RetryableError, 나머지는 requests 예외
+    """
+    try:
+        return gemini_generate(text, api_key, model, base_url=base_url, timeout=timeout)
+    except (requests.ConnectionError, requests.Timeout) as e:
+        raise RetryableError(f"네트워크 오류: {e}")
+    except requests.HTTPError as e:
+        response = e.response
+        if response is None or response.status_code not in RETRY_STATUS:
+            raise
+        retry_after = response.headers.get("Retry-After")
+        raise RetryableError(
+            f"HTTP {response.status_code}",
+            float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+
+
+# -------------------------------------
+# 체크포인트 (JSONL)
+# -------------------------------------
+def load_checkpoint(path):
+    """
+    이미 성공한 작업 id 집합 (실패 기록은 다시 시도)
+    마지막 줄이 쓰다 만 상태면 무시한다.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if rec.get("error") is None:
+                done.add(rec["id"])
+    return done
+
+
+def job_id(query):
+    """최종 프롬프트(동물 프롬프트 + 프로필) 내용 해시 — 체크포인트 키"""
+    return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+
+def build_jobs(prompts, profiles):
+    """
+    (동물 행 번호, 프롬프트) × 프로필 → 작업 목록
+    id 는 프롬프트와 프로필 내용의 해시라 입력 CSV 의 행 순서가 바뀌거나
+    행/프로필이 추가·삭제돼도 같은 작업은 같은 id 를 갖는다. (row / profile 은 참고용)
+    """
+    jobs = []
+    for row, prompt in enumerate(prompts):
+        for p, profile in enumerate(profiles):
+            query = build_query(prompt, profile)
+            jobs.append({"id": job_id(query), "row": row, "profile": p, "query": query})
+    return jobs
+
+
+# -------------------------------------
+# 배치 실행
+# -------------------------------------
+async def run_batch(prompts, profiles, api_key, checkpoint_path,
+                    model=DEFAULT_MODEL, base_url=GEMINI_BASE_URL,
+                    concurrency=8, rate=5.0, max_retries=5, timeout=(5, 120)):
+    """
+    모든 작업을 실행하고 {"total", "skipped", "ok", "failed"} 반환
+    """
+    jobs = build_jobs(prompts, profiles)
+    done = load_checkpoint(checkpoint_path)
+    pending = iter([j for j in jobs if j["id"] not in done])
+    summary = {"total": len(jobs), "skipped": len(done & {j["id"] for j in jobs}), "ok": 0, "failed": 0}
+
+    bucket = TokenBucket(rate)
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    with open(checkpoint_path, "a", encoding="utf-8") as out:
+        # 이전 실행이 줄 중간에서 죽었으면 줄바꿈부터 넣고 이어 쓴다
+        if out.tell() > 0:
+            with open(checkpoint_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    out.write("\n")
+
+        def record(job, response=None, error=None):
+            # 이벤트 루프 스레드에서만 호출되므로 따로 잠글 필요 없음
+            rec = {"id": job["id"], "row": job["row"], "profile": job["profile"],
+                   "response": response, "error": error}
+            out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            out.flush()
+
+        async def call(job):
+            for attempt in range(max_retries + 1):
+                await bucket.acquire()
+                try:
+                    return await loop.run_in_executor(
+                        executor, generate_content, job["query"], api_key, model, base_url, timeout)
+                except RetryableError as e:
+                    if attempt == max_retries:
+                        raise
+                    delay = backoff_delay(attempt)
+                    if e.retry_after is not None:
+                        delay = max(delay, e.retry_after)
+                    await asyncio.sleep(delay)
+
+        async def worker():
+            for job in pending:
+                try:
+                    text = await call(job)
+                except Exception as e:
+                    summary["failed"] += 1
+                    record(job, error=str(e))
+                else:
+                    summary["ok"] += 1
+                    record(job, response=text)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            executor.shutdown(wait=False)
+
+    return summary
+
+
+def read_prompts(csv_path, column=PROMPT_COLUMN):
+    """CSV 의 프롬프트 컬럼 전체 (인코딩 자동 판별, src.csv_ingest 참고)"""
+    from src.csv_ingest import read_csv_cached
+
+    df = read_csv_cached(csv_path)
+    return [str(p) for p in df[column]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="입양 컨설팅 일괄 실행")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="AI_Consulting_Prompt 컬럼이 있는 CSV")
+    source.add_argument("--animals", help="공고 JSON — 프롬프트를 src.prompt_template 로 직접 생성")
+    parser.add_argument("--out", default="./data/consulting_results.jsonl", help="결과/체크포인트 JSONL")
+    parser.add_argument("--profiles", default=None, help="프로필 문자열 목록 JSON 파일 (기본: 예시 3개)")
+    parser.add_argument("--api-key", default=os.getenv("GEMINI_API_KEY", ""))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--base-url", default=GEMINI_BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="초당 최대 요청 수")
+    parser.add_argument("--max-retries", type=int, default=5)
+    args = parser.parse_args()
+
+    profiles = DEFAULT_PROFILES
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as f:
+            profiles = json.load(f)
+
+    if args.csv:
+        prompts = read_prompts(args.csv)
+    else:
+        from src.fetch_animals import iter_animals
+        from src.preprocess_animals import iter_preprocess_animals
+        from src.prompt_template import iter_prompts
+        prompts = iter_prompts(iter_preprocess_animals(iter_animals(args.animals)))
+
+    result = asyncio.run(run_batch(
+        prompts, profiles, args.api_key, args.out,
+        model=args.model, base_url=args.base_url,
+        concurrency=args.concurrency, rate=args.rate, max_retries=args.max_retries,
+    ))
+    print(f"전체 {result['total']} / 이전 완료 {result['skipped']} / 성공 {result['ok']} / 실패 {result['failed']}")
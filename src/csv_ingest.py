@@ -0,0 +1,197 @@
+# src/csv_ingest.py
+"""
+KNIME 에서 내보낸 CSV 를 한 번에 읽어오는 모듈
+
+- 파일 앞부분(기본 64KB)만 보고 인코딩을 판별 (BOM → UTF-8 → CP949)
+  cp949 로 읽고 실패하면 euc-kr 로 처음부터 다시 읽는 일이 없다.
+- 판별한 인코딩으로 파일을 한 번만 읽으며 incremental decoder 로 디코딩해서 DataFrame 생성
+  (앞부분은 UTF-8 로 읽히는데 뒤쪽에 CP949 행이 섞여 있으면 파일을 다시 읽지 않고
+  이미 읽어 둔 바이트를 다음 후보 인코딩으로 디코딩해서 이어 간다)
+- 결과를 캐시 디렉터리(DEFAULT_CACHE_DIR)에 Feather 사이드카(pyarrow 없으면 pickle)로 저장해 두고,
+  원본의 (경로, mtime, 크기) 와 사이드카 파일 크기가 meta.json 과 맞을 때만 사이드카를 읽는다.
+
+    df = read_csv_cached("final_urgent_prompts.csv")
+"""
+import codecs
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+SAMPLE_SIZE = 64 * 1024
+
+# 디코딩할 때 한 번에 읽는 바이트 수
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 사이드카를 두는 디렉터리 (원본 CSV 옆에 쓰지 않음)
+DEFAULT_CACHE_DIR = "./data/csv_cache"
+
+# 앞에서부터 시도할 인코딩 (cp949 는 euc-kr 의 상위 집합)
+CANDIDATE_ENCODINGS = ("utf-8", "cp949")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+try:
+    import pyarrow  # noqa: F401  (Feather 사이드카용, 없으면 pickle)
+    SIDECAR_FORMAT = "feather"
+except ImportError:
+    SIDECAR_FORMAT = "pickle"
+
+
+# -------------------------------------
+# 인코딩 판별
+# -------------------------------------
+def detect_encoding(path, sample_size=SAMPLE_SIZE):
+    """
+    파일 앞부분 sample_size 바이트로 인코딩 판별
+    어느 것으로도 디코딩되지 않으면 UnicodeDecodeError
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+        at_eof = not f.read(1)
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    error = None
+    for encoding in CANDIDATE_ENCODINGS:
+        # 표본 끝에서 멀티바이트 문자가 잘렸을 수 있으므로 incremental decoder 사용
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(sample, final=at_eof)
+            return encoding
+        except UnicodeDecodeError as e:
+            error = e
+
+    raise error
+
+
+# -------------------------------------
+# 사이드카 캐시
+# -------------------------------------
+def _sidecar_paths(path, cache_dir):
+    # 원본 절대 경로 해시로 이름을 지어서 이름이 같은 다른 CSV 와 섞이지 않게
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}")
+    return f"{base}.{SIDECAR_FORMAT}", f"{base}.meta.json"
+
+
+def _source_meta(path):
+    st = os.stat(path)
+    return {"source": os.path.abspath(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "format": SIDECAR_FORMAT}
+
+
+def _read_sidecar(path, cache_dir):
+    data_path, meta_path = _sidecar_paths(path, cache_dir)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        sidecar_size = os.path.getsize(data_path)
+    except (OSError, ValueError):
+        return None
+
+    # 원본이 바뀌었거나 사이드카가 meta 를 쓴 뒤에 바뀌었으면 (pickle 은 열기 전에) 버린다
+    current = _source_meta(path)
+    if any(meta.get(k) != v for k, v in current.items()) or meta.get("sidecar_size") != sidecar_size:
+        return None
+
+    try:
+        if SIDECAR_FORMAT == "feather":
+            return pd.read_feather(data_path)
+        return pd.read_pickle(data_path)
+    except Exception:
+        return None
+
+
+def _write_sidecar(path, df, encoding, cache_dir):
+    data_path, meta_path = _sidecar_paths(path, cache_dir)
+    meta = dict(_source_meta(path), encoding=encoding)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if SIDECAR_FORMAT == "feather":
+            df.reset_index(drop=True).to_feather(data_path)
+        else:
+            df.to_pickle(data_path)
+        meta["sidecar_size"] = os.path.getsize(data_path)
+        # 데이터를 다 쓴 뒤에 meta 를 써야 중간에 죽어도 깨진 사이드카를 읽지 않음
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except Exception:
+        # 읽기 전용 위치 등 — 캐시 없이도 동작은 해야 함
+        pass
+
+
+# -------------------------------------
+# 읽기
+# -------------------------------------
+def _candidates(encoding):
+    """판별한 인코딩 + 그 뒤에 시도할 후보들"""
+    if encoding in CANDIDATE_ENCODINGS:
+        return list(CANDIDATE_ENCODINGS[CANDIDATE_ENCODINGS.index(encoding):])
+    return [encoding] + [e for e in CANDIDATE_ENCODINGS if e != encoding]
+
+
+def _decode_with_fallback(path, encoding, chunk_size=READ_CHUNK_SIZE):
+    """
+    파일을 한 번만 읽으면서 incremental decoder 로 디코딩 → (인코딩, 텍스트)
+    표본 뒤쪽에서 UnicodeDecodeError 가 나면 지금까지 읽은 바이트를
+    다음 후보 인코딩으로 다시 디코딩하고 이어서 읽는다. (파일은 다시 읽지 않음)
+    """
+    candidates = _candidates(encoding)
+    raw = bytearray()
+    parts = []
+    decoder = codecs.getincrementaldecoder(candidates[0])()
+
+    def switch(error):
+        # 다음 후보로 읽어 둔 바이트 전체를 다시 디코딩 (다 실패하면 마지막 오류)
+        nonlocal decoder
+        while True:
+            candidates.pop(0)
+            if not candidates:
+                raise error
+            decoder = codecs.getincrementaldecoder(candidates[0])()
+            try:
+                parts[:] = [decoder.decode(bytes(raw))]
+                return
+            except UnicodeDecodeError as e:
+                error = e
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            raw += chunk
+            try:
+                parts.append(decoder.decode(chunk, final=not chunk))
+            except UnicodeDecodeError as e:
+                switch(e)
+                if not chunk:
+                    parts.append(decoder.decode(b"", final=True))
+            if not chunk:
+                break
+    return candidates[0], "".join(parts)
+
+
+def read_csv_cached(path, use_sidecar=True, cache_dir=DEFAULT_CACHE_DIR, **read_csv_kwargs):
+    """
+    인코딩 자동 판별 + 사이드카 캐시를 거쳐 DataFrame 반환
+    read_csv_kwargs 는 pandas.read_csv 에 그대로 전달 (사이드카 키에는 포함되지 않음)
+    """
+    if use_sidecar and not read_csv_kwargs:
+        df = _read_sidecar(path, cache_dir)
+        if df is not None:
+            return df
+
+    encoding, text = _decode_with_fallback(path, detect_encoding(path))
+    df = pd.read_csv(io.StringIO(text), **read_csv_kwargs)
+
+    if use_sidecar and not read_csv_kwargs:
+        _write_sidecar(path, df, encoding, cache_dir)
+    return df
@@ -0,0 +1,256 @@
+# src/delta_sync.py
+"""
+이전 덤프 대비 바뀐 공고만 받아서 반영하는 증분 동기화
+
+- 상태 파일(sync_state.json)에 워터마크를 기록
+    watermark : 지금까지 본 가장 늦은 noticeSdt
+    notices   : 살아 있는 공고 noticeNo → [원본 해시, noticeEdt]
+- sync 는 워터마크 날짜부터(bgnde) 공고만 요청해서
+    새 noticeNo → insert / 해시가 바뀜 → update / 공고 종료일이 지남 → expire
+  를 만들어 델타 로그(animals_delta.jsonl)에 한 줄씩 덧붙인다.
+  → 매일 읽고 쓰는 양이 전체 공고 수가 아니라 변동 건수에 비례
+- 읽을 때는 기준 덤프 + 델타 로그를 겹쳐서 스트리밍 (iter_synced_animals)
+- 로그가 길어지면 compact 로 새 날짜별 덤프를 만들고 로그를 비운다.
+
+    python -m src.delta_sync init data/animals_2025-11-29.json
+    python -m src.delta_sync sync --service-key $SERVICE_KEY
+    python -m src.delta_sync compact
+
+워터마크 이전 공고의 내용 변경/삭제는 증분 요청에 안 잡히므로
+가끔 sync --full 로 전체를 받아 비교한다. (이때도 로그에는 변동분만 기록)
+"""
+import argparse
+import datetime
+import json
+import os
+
+from src.animal_utils import parse_date
+from src.fetch_animals import iter_animals
+from src.fetch_api import API_BASE_URL, DEFAULT_ROWS, dump_path, iter_api_animals, write_dump
+from src.preprocess_cache import record_hash
+
+DEFAULT_STATE_PATH = "./data/sync_state.json"
+DEFAULT_LOG_PATH = "./data/animals_delta.jsonl"
+
+INSERT, UPDATE, EXPIRE = "insert", "update", "expire"
+
+
+# -------------------------------------
+# 워터마크 상태
+# -------------------------------------
+class SyncState:
+    def __init__(self, base, watermark="", notices=None):
+        self.base = base                # 기준 덤프 경로
+        self.watermark = watermark      # 가장 늦은 noticeSdt ('YYYYMMDD')
+        self.notices = notices or {}    # noticeNo → [해시, noticeEdt]
+
+    @classmethod
+    def from_animals(cls, base, animals):
+        state = cls(base)
+        for a in animals:
+            state._remember(a)
+        return state
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["base"], data["watermark"], data["notices"])
+
+    def save(self, path=DEFAULT_STATE_PATH):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"base": self.base, "watermark": self.watermark, "notices": self.notices},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _remember(self, a):
+        self.notices[a["noticeNo"]] = [record_hash(a), a.get("noticeEdt", "")]
+        sdt = a.get("noticeSdt", "")
+        if len(sdt) == 8 and sdt.isdigit() and sdt > self.watermark:
+            self.watermark = sdt
+
+    def apply(self, ops):
+        for op in ops:
+            if op["op"] == EXPIRE:
+                self.notices.pop(op["noticeNo"], None)
+            else:
+                self._remember(op["record"])
+
+
+# -------------------------------------
+# 변경분 계산
+# -------------------------------------
+def _is_expired(notice_edt, today):
+    end = parse_date(notice_edt)
+    return end is not None and end < today
+
+
+def diff(state, fetched, today=None, full=False):
+    """
+    받아온 공고와 상태를 비교해서 델타 연산 리스트 반환
+    full=True 면 받아온 목록에 없는 공고도 expire (전체를 받아왔을 때만)
+    """
+    today = today or datetime.date.today()
+    stamp = today.isoformat()
+    ops = []
+    touched = set()
+
+    for a in fetched:
+        n = a["noticeNo"]
+        touched.add(n)
+        known = state.notices.get(n)
+        if _is_expired(a.get("noticeEdt", ""), today):
+            if known is not None:
+                ops.append({"op": EXPIRE, "noticeNo": n, "date": stamp})
+            continue
+        if known is None:
+            ops.append({"op": INSERT, "noticeNo": n, "date": stamp, "record": a})
+        elif known[0] != record_hash(a):
+            ops.append({"op": UPDATE, "noticeNo": n, "date": stamp, "record": a})
+
+    for n, (_, edt) in state.notices.items():
+        if n in touched:
+            continue
+        if _is_expired(edt, today) or full:
+            ops.append({"op": EXPIRE, "noticeNo": n, "date": stamp})
+
+    return ops
+
+
+# -------------------------------------
+# 델타 로그
+# -------------------------------------
+def append_log(ops, path=DEFAULT_LOG_PATH):
+    with open(path, "a", encoding="utf-8") as f:
+        for op in ops:
+            f.write(json.dumps(op, ensure_ascii=False) + "\n")
+
+
+def read_log(path=DEFAULT_LOG_PATH):
+    """
+    로그를 재생한 결과 noticeNo → 마지막 연산 (순서 유지)
+    insert 뒤 expire 처럼 앞 연산을 덮는 경우는 마지막 것만 남는다.
+    """
+    latest = {}
+    if not os.path.exists(path):
+        return latest
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError:
+                continue    # 쓰다 만 마지막 줄
+            latest.pop(op["noticeNo"], None)
+            latest[op["noticeNo"]] = op
+    return latest
+
+
+def iter_synced_animals(state_path=DEFAULT_STATE_PATH, log_path=DEFAULT_LOG_PATH):
+    """
+    기준 덤프에 델타 로그를 겹친 현재 공고 목록을 하나씩 yield
+    (메모리에는 로그 내용만 — 변동 건수에 비례)
+    """
+    state = SyncState.load(state_path)
+    pending = read_log(log_path)
+
+    for a in iter_animals(state.base):
+        op = pending.pop(a["noticeNo"], None)
+        if op is None:
+            yield a
+        elif op["op"] != EXPIRE:
+            yield op["record"]
+
+    for op in pending.values():
+        if op["op"] != EXPIRE:
+            yield op["record"]
+
+
+# -------------------------------------
+# 동기화 / 압축
+# -------------------------------------
+def init(base, state_path=DEFAULT_STATE_PATH, log_path=DEFAULT_LOG_PATH):
+    """기준 덤프로 상태 파일을 새로 만들고 로그를 비운다."""
+    state = SyncState.from_animals(base, iter_animals(base))
+    state.save(state_path)
+    open(log_path, "w").close()
+    return state
+
+
+def sync(service_key="", base_url=API_BASE_URL, state_path=DEFAULT_STATE_PATH,
+         log_path=DEFAULT_LOG_PATH, full=False, today=None, cache=None,
+         rows=DEFAULT_ROWS, workers=8, feed=None):
+    """
+    워터마크 이후 공고를 받아 델타 로그에 반영 → {연산: 건수}
+    cache(PreprocessCache) 를 주면 만료된 공고의 전처리 결과도 지운다.
+    feed(UrgentFeed) 를 주면 같은 연산을 마감 임박 피드에도 반영한다.
+    """
+    state = SyncState.load(state_path)
+    params = None if full or not state.watermark else {"bgnde": state.watermark}
+    fetched = iter_api_animals(service_key, rows, params=params, base_url=base_url, workers=workers)
+
+    ops = diff(state, fetched, today=today, full=full)
+    append_log(ops, log_path)
+    state.apply(ops)
+    state.save(state_path)
+
+    if cache is not None:
+        cache.discard(op["noticeNo"] for op in ops if op["op"] == EXPIRE)
+    if feed is not None:
+        feed.apply(ops)
+
+    counts = {INSERT: 0, UPDATE: 0, EXPIRE: 0}
+    for op in ops:
+        counts[op["op"]] += 1
+    return counts
+
+
+def compact(out=None, state_path=DEFAULT_STATE_PATH, log_path=DEFAULT_LOG_PATH):
+    """
+    기준 덤프 + 로그 → 새 날짜별 덤프, 상태의 기준을 바꾸고 로그를 비운다.
+    """
+    out = out or dump_path()
+    # write_dump 는 임시 파일에 다 쓴 뒤 교체하므로 out 이 지금 기준 덤프여도 안전
+    n = write_dump(iter_synced_animals(state_path, log_path), out)
+
+    state = SyncState.load(state_path)
+    state.base = out
+    state.save(state_path)
+    open(log_path, "w").close()
+    return n
+
+
+if __name__ == "__main__":
+    from src.preprocess_cache import DEFAULT_CACHE_PATH, PreprocessCache
+
+    parser = argparse.ArgumentParser(description="유기동물 공고 증분 동기화")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH)
+    parser.add_argument("--log", default=DEFAULT_LOG_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_init = sub.add_parser("init", help="기준 덤프로 워터마크 초기화")
+    p_init.add_argument("base")
+
+    p_sync = sub.add_parser("sync", help="워터마크 이후 공고만 받아 반영")
+    p_sync.add_argument("--service-key", default=os.getenv("ANIMAL_API_KEY", ""))
+    p_sync.add_argument("--base-url", default=API_BASE_URL)
+    p_sync.add_argument("--full", action="store_true", help="전체를 받아 비교 (삭제된 공고까지 반영)")
+    p_sync.add_argument("--workers", type=int, default=8)
+    p_sync.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="만료 공고를 지울 전처리 캐시")
+
+    p_compact = sub.add_parser("compact", help="로그를 합쳐 새 날짜별 덤프 생성")
+    p_compact.add_argument("--out", default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "init":
+        state = init(args.base, args.state, args.log)
+        print(f"공고 {len(state.notices)}건, 워터마크 {state.watermark}")
+    elif args.command == "sync":
+        with PreprocessCache(args.cache) as cache:
+            counts = sync(args.service_key, args.base_url, args.state, args.log,
+                          full=args.full, cache=cache, workers=args.workers)
+        print(f"추가 {counts[INSERT]} / 변경 {counts[UPDATE]} / 만료 {counts[EXPIRE]}")
+    else:
+        n = compact(args.out, args.state, args.log)
+        print(f"공고 {n}건으로 압축 완료")
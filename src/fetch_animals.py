@@ -1,12 +1,184 @@
+import gzip
 import json
 
-def load_mock_animals():
-    with open("./data/sample_data_for_knime.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data["response"]["body"]["items"]["item"]
+from src import metrics
+
+DEFAULT_PATH = "./data/sample_data_for_knime.json"
+
+# 공공데이터 응답에서 동물 목록이 들어있는 위치
+ITEM_PATH = ("response", "body", "items", "item")
+
+# 공고 한 건(item)의 필드 (구조동물 조회 서비스 v1/v2 응답)
+API_FIELDS = (
+    "desertionNo", "noticeNo", "noticeSdt", "noticeEdt", "happenDt", "happenPlace",
+    "kindCd", "upKindCd", "upKindNm", "kindNm", "colorCd", "age", "weight", "sexCd", "neuterYn",
+    "specialMark", "processState", "filename", "popfile", "popfile1", "popfile2",
+    "careNm", "careTel", "careAddr", "careRegNo", "careOwnerNm", "orgNm", "chargeNm",
+    "officetel", "noticeComment", "updTm",
+)
+
+# 스트리밍 파서가 한 번에 읽어오는 문자 수
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+# -----------------------------
+#  파일 열기 (gzip 자동 감지)
+# -----------------------------
+def open_json(path):
+    """
+    일반 JSON / gzip 압축 JSON 모두 텍스트 모드로 연다.
+    확장자가 아니라 파일 앞 2바이트(매직 넘버)로 판단한다.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(2)
+
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+# -----------------------------
+#  스트리밍 JSON 리더
+# -----------------------------
+class _StreamReader:
+    """
+    파일을 CHUNK_SIZE 단위로 읽으면서 필요한 만큼만 버퍼에 유지한다.
+    값 하나는 json.JSONDecoder.raw_decode 로 잘라내고,
+    버퍼가 모자라면 더 읽어서 다시 시도한다.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # 이미 처리한 앞부분은 버려서 메모리를 일정하게 유지
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """공백을 건너뛰고 다음 문자 반환 (파일 끝이면 '')"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"JSON 형식 오류: '{ch}' 가 필요합니다 (위치 {self.pos})")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나를 디코딩"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # 숫자/리터럴이 버퍼 끝에서 잘렸을 수 있으므로 뒤에 문자가 있어야 확정
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def _iter_path(reader, path):
+    """
+    path 에 해당하는 배열의 원소를 하나씩 yield
+    다른 키의 값은 디코딩 후 바로 버린다.
+    """
+    if not path:
+        ch = reader.peek()
+        if ch == "{":
+            # 공공 API는 결과가 1건이면 배열 대신 객체 하나를 준다
+            yield reader.value()
+            return
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        while True:
+            yield reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("]")
+            return
+
+    if reader.peek() != "{":
+        # 경로 중간이 객체가 아니면 (예: items 가 "") 동물 없음
+        reader.value()
+        return
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == path[0]:
+            yield from _iter_path(reader, path[1:])
+            return
+        reader.value()  # 관심 없는 값은 건너뛰기
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+
+# -----------------------------
+#  동물 목록 스트리밍 로드
+# -----------------------------
+def iter_animals(path=DEFAULT_PATH):
+    """
+    JSON 파일에서 동물 공고를 하나씩 yield (메모리 사용량 일정)
+
+    지원 형식
+    - 공공 API 응답 그대로: response.body.items.item
+    - 날짜별 덤프(data/animals_YYYY-MM-DD.json): 최상위 배열
+    - 위 두 형식의 gzip 압축본
+    """
+    with open_json(path) as f:
+        reader = _StreamReader(f)
+
+        if reader.peek() == "[":
+            yield from _iter_path(reader, ())
+        else:
+            yield from _iter_path(reader, ITEM_PATH)
+
+
+@metrics.timed("animal_stage_seconds", stage="load")
+def load_mock_animals(path=DEFAULT_PATH):
+    """
+    iter_animals 결과를 리스트로 반환 (기존 호환용)
+    """
+    return list(iter_animals(path))
 
 if __name__ == "__main__":
-    animals = load_mock_animals()
-    print(f"총 {len(animals)} 마리 로드됨")   # ← 마리 앞에 띄어쓰기 하나 추가
-    for a in animals:
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+
+    count = 0
+    for a in iter_animals(path):
+        count += 1
         print(a["noticeNo"], a["kindCd"], a["careNm"])
+    print(f"총 {count} 마리 로드됨")
@@ -0,0 +1,184 @@
+# src/fetch_api.py
+"""
+공공데이터 유기동물 조회 API 에서 전체 공고를 받아 날짜별 덤프로 저장
+
+- 첫 페이지의 totalCount 로 전체 페이지 수를 계산
+- 나머지 페이지는 스레드 풀(동시 요청 수 제한)로 병렬 요청
+  (src.http_client 의 keep-alive 커넥션 풀 세션을 같이 사용)
+- 실패한 페이지는 지터를 섞은 지수 백오프로 재시도
+- 받은 순서와 상관없이 페이지 순서대로 data/animals_YYYY-MM-DD.json 에 바로 기록
+  (최상위 배열 — fetch_animals.iter_animals 로 그대로 읽힌다)
+
+    python -m src.fetch_api --service-key $SERVICE_KEY
+    python -m src.fetch_api --base-url http://127.0.0.1:8765   # 로컬 스텁 서버
+    python -m src.fetch_api --db ./data/animals.sqlite          # 덤프를 SQLite 저장소에도 반영
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.http_client import RETRY_STATUS, backoff_delay, get_session
+
+API_BASE_URL = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2"
+API_PATH = "/abandonmentPublic_v2"
+
+# 한 페이지에 요청할 공고 수 (API 최대 1000)
+DEFAULT_ROWS = 1000
+
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_DUMP_DIR = "./data"
+
+
+class FetchError(Exception):
+    pass
+
+
+# -------------------------------------
+# 페이지 하나
+# -------------------------------------
+def _page_items(body):
+    # 결과가 한 건이면 item 이 배열이 아니라 객체, 0건이면 items 가 "" 로 온다
+    items = body.get("items") or {}
+    item = items.get("item", []) if isinstance(items, dict) else []
+    return [item] if isinstance(item, dict) else list(item)
+
+
+def fetch_page(page_no, service_key="", rows=DEFAULT_ROWS, params=None,
+               base_url=API_BASE_URL, timeout=DEFAULT_TIMEOUT, max_retries=5):
+    """
+    페이지 하나 요청 → (공고 리스트, totalCount)
+    429/5xx/네트워크 오류는 재시도하고, 끝내 실패하면 FetchError
+    (그 밖의 HTTP 오류나 모양이 다른 응답도 FetchError — 호출하는 쪽은 이것 하나만 잡으면 된다)
+    """
+    query = {"serviceKey": service_key, "_type": "json", "pageNo": page_no, "numOfRows": rows}
+    query.update(params or {})
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = get_session().get(base_url + API_PATH, params=query, timeout=timeout)
+            if response.status_code in RETRY_STATUS:
+                error = f"HTTP {response.status_code}"
+            else:
+                response.raise_for_status()
+                payload = response.json()
+                break
+        except (requests.ConnectionError, requests.Timeout, ValueError) as e:
+            # ValueError: 응답 본문이 잘려서 JSON 파싱 실패
+            error = str(e)
+        except requests.RequestException as e:
+            # 4xx 등 재시도해도 같은 오류
+            raise FetchError(f"{page_no} 페이지 요청 실패: {e}") from e
+        if attempt == max_retries:
+            raise FetchError(f"{page_no} 페이지 요청 실패: {error}")
+        time.sleep(backoff_delay(attempt))
+
+    data = payload.get("response") if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        raise FetchError(f"{page_no} 페이지: 응답에 response 가 없음 ({str(payload)[:200]})")
+
+    # 인증키 오류 등은 재시도해도 같으므로 바로 실패
+    header = data.get("header", {})
+    if header.get("resultCode", "00") != "00":
+        raise FetchError(f"{page_no} 페이지: {header.get('resultCode')} {header.get('resultMsg', '')}")
+    body = data.get("body", {})
+    return _page_items(body), int(body.get("totalCount") or 0)
+
+
+# -------------------------------------
+# 전체 페이지
+# -------------------------------------
+def iter_api_animals(service_key="", rows=DEFAULT_ROWS, params=None, base_url=API_BASE_URL,
+                     workers=8, timeout=DEFAULT_TIMEOUT, max_retries=5):
+    """
+    전체 공고를 페이지 순서대로 하나씩 yield
+
+    첫 페이지로 totalCount 를 알아낸 뒤 나머지는 workers 개씩 병렬로 받는다.
+    미리 받아 두는 페이지는 workers * 2 개까지만 (메모리 사용량 일정)
+    """
+    first, total = fetch_page(1, service_key, rows, params, base_url, timeout, max_retries)
+    yield from first
+
+    pages = -(-total // rows) if rows else 1
+    if pages <= 1:
+        return
+
+    def fetch(page_no):
+        return fetch_page(page_no, service_key, rows, params, base_url, timeout, max_retries)[0]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        next_page = 2
+        window = deque()
+        while next_page <= pages or window:
+            while next_page <= pages and len(window) < workers * 2:
+                window.append(pool.submit(fetch, next_page))
+                next_page += 1
+            try:
+                yield from window.popleft().result()
+            except BaseException:
+                for future in window:
+                    future.cancel()
+                raise
+
+
+# -------------------------------------
+# 날짜별 덤프
+# -------------------------------------
+def dump_path(date=None, directory=DEFAULT_DUMP_DIR):
+    date = date or datetime.date.today()
+    return os.path.join(directory, f"animals_{date.isoformat()}.json")
+
+
+def write_dump(animals, path):
+    """
+    공고 이터레이터를 최상위 JSON 배열로 스트리밍 기록 → 기록한 개수
+    임시 파일에 다 쓴 뒤 교체하므로 도중에 실패해도 기존 파일은 그대로다.
+    """
+    tmp = path + ".tmp"
+    count = 0
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("[")
+            for a in animals:
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(a, ensure_ascii=False))
+                count += 1
+            f.write("\n]\n")
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="유기동물 공고 전체 받아서 날짜별 덤프로 저장")
+    parser.add_argument("--service-key", default=os.getenv("ANIMAL_API_KEY", ""))
+    parser.add_argument("--base-url", default=API_BASE_URL)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="페이지당 공고 수")
+    parser.add_argument("--workers", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--out", default=None, help="저장 경로 (기본: data/animals_오늘날짜.json)")
+    parser.add_argument("--db", default=None, help="받은 공고를 이 SQLite 저장소(src.animal_db)에도 반영")
+    args = parser.parse_args()
+
+    path = args.out or dump_path()
+    started = time.perf_counter()
+    n = write_dump(iter_api_animals(args.service_key, args.rows, base_url=args.base_url,
+                                    workers=args.workers), path)
+    print(f"공고 {n}건 → {path} ({time.perf_counter() - started:.1f}초)")
+
+    if args.db:
+        from src.animal_db import AnimalDB
+        from src.fetch_animals import iter_animals
+
+        started = time.perf_counter()
+        with AnimalDB(args.db) as db:
+            n = db.upsert_many(iter_animals(path))
+        print(f"공고 {n}건 → {args.db} ({time.perf_counter() - started:.1f}초)")
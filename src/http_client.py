@@ -0,0 +1,40 @@
+# src/http_client.py
+"""
+모델 API / 공고 API / 사진 요청이 같이 쓰는 HTTP 도우미
+
+- 프로세스 전체에서 keep-alive 커넥션 풀(requests.Session) 하나를 재사용
+- 재시도할 HTTP 상태 코드와 지터를 섞은 지수 백오프
+"""
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 호스트당 유지할 커넥션 수
+POOL_SIZE = 16
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스에서 공유하는 커넥션 풀 세션"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """지수 백오프 + 지터 (0.5 ~ 1배 사이 무작위)"""
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
@@ -0,0 +1,384 @@
+# src/image_cache.py
+"""
+popfile(공고 사진) 썸네일 디스크 캐시 + 비동기 미리 받기
+
+대시보드/API 에서 사진을 보여줄 때마다 원격 서버에서 받아오면 느리므로
+백그라운드에서 미리 받아 작게 줄여 두고 로컬 파일로 내보낸다.
+
+    cache = ImageCache()
+    asyncio.run(prefetch(popfile_urls, cache, concurrency=8))
+    cache.lookup(url)       # → (파일 경로, content-type, 해시) 또는 None
+
+- 받을 때 ETag / Last-Modified 를 같이 저장해 두고, max_age 가 지나 다시 확인할 때는
+  조건부 요청(If-None-Match / If-Modified-Since) 으로 304 면 본문 없이 끝낸다.
+- 파일 이름은 썸네일 내용의 sha256 (content-addressed) — 같은 사진이 여러 URL 에
+  걸려 있어도 한 번만 저장된다.
+- 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 사진부터 지운다 (LRU).
+- Pillow 가 있으면 THUMB_SIZE 로 줄인 JPEG, 없으면 원본 그대로 저장한다.
+
+src.stub_server --static DIR 로 띄운 로컬 서버 주소로 확인할 수 있다.
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src import metrics
+from src.http_client import get_session
+
+try:
+    from PIL import Image   # 썸네일 축소용 (없으면 원본 저장)
+except ImportError:
+    Image = None
+
+DEFAULT_CACHE_DIR = "./data/thumbnails"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024    # 512MB
+DEFAULT_MAX_AGE = 24 * 3600              # 이 시간이 지나야 원격 서버에 다시 확인
+DEFAULT_TIMEOUT = (5, 30)
+
+THUMB_SIZE = (320, 320)
+THUMB_QUALITY = 80
+
+# 파일 앞 바이트 → (content-type, 확장자)
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+    (b"GIF87a", "image/gif", "gif"),
+    (b"GIF89a", "image/gif", "gif"),
+)
+
+
+def sniff_image(data):
+    """이미지 형식 판별 → (content-type, 확장자), 모르는 형식이면 None"""
+    for magic, content_type, ext in _SIGNATURES:
+        if data.startswith(magic):
+            return content_type, ext
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return None
+
+
+def make_thumbnail(data):
+    """
+    원본 바이트 → (썸네일 바이트, content-type, 확장자)
+    이미지가 아니면 ValueError
+    """
+    kind = sniff_image(data)
+    if kind is None:
+        raise ValueError("이미지가 아닌 응답입니다")
+    if Image is None:
+        return (data,) + kind
+
+    with Image.open(io.BytesIO(data)) as img:
+        img.thumbnail(THUMB_SIZE)
+        out = io.BytesIO()
+        img.convert("RGB").save(out, "JPEG", quality=THUMB_QUALITY)
+    return out.getvalue(), "image/jpeg", "jpg"
+
+
+# -------------------------------------
+# 디스크 캐시
+# -------------------------------------
+class ImageCache:
+    """
+    root/ab/abcdef….jpg 에 썸네일, root/index.sqlite 에 색인
+
+        images  : 해시 → (확장자, content-type, 크기, 마지막 사용 시각)
+        sources : URL → (해시, ETag, Last-Modified, 마지막 확인 시각)
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS images ("
+            " hash TEXT PRIMARY KEY, ext TEXT NOT NULL, content_type TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS images_lru ON images (last_access);"
+            "CREATE TABLE IF NOT EXISTS sources ("
+            " url TEXT PRIMARY KEY, hash TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+            " checked_at REAL NOT NULL);"
+        )
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM images").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def path(self, digest, ext):
+        return os.path.join(self.root, digest[:2], f"{digest}.{ext}")
+
+    # ----- 조회 -----
+    def lookup(self, url):
+        """
+        URL 의 썸네일 → (파일 경로, content-type, 해시), 없으면 None
+        찾으면 LRU 순서를 갱신한다.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT i.hash, i.ext, i.content_type FROM sources s JOIN images i ON i.hash = s.hash"
+                " WHERE s.url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE images SET last_access = ? WHERE hash = ?", (time.time(), row[0]))
+            self.conn.commit()
+        return self.path(row[0], row[1]), row[2], row[0]
+
+    def validators(self, url):
+        """(ETag, Last-Modified, 마지막 확인 시각) — 캐시에 없으면 None"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT s.etag, s.last_modified, s.checked_at FROM sources s"
+                " JOIN images i ON i.hash = s.hash WHERE s.url = ?", (url,)
+            ).fetchone()
+
+    # ----- 저장 -----
+    def put(self, url, data, content_type, ext, etag=None, last_modified=None):
+        """썸네일 저장 → 해시 (같은 내용이 이미 있으면 파일은 다시 쓰지 않음)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest, ext)
+        now = time.time()
+
+        with self._lock:
+            exists = self.conn.execute("SELECT 1 FROM images WHERE hash = ?", (digest,)).fetchone()
+            if not exists:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                self.conn.execute(
+                    "INSERT INTO images (hash, ext, content_type, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (digest, ext, content_type, len(data), now),
+                )
+                self.total_bytes += len(data)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (url, hash, etag, last_modified, checked_at)"
+                " VALUES (?, ?, ?, ?, ?)", (url, digest, etag, last_modified, now),
+            )
+            self.conn.commit()
+            if self.total_bytes > self.max_bytes:
+                self._evict_locked(self.max_bytes)
+        return digest
+
+    def mark_checked(self, url):
+        """304 Not Modified — 확인 시각만 갱신"""
+        with self._lock:
+            self.conn.execute("UPDATE sources SET checked_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    # ----- 정리 -----
+    def _evict_locked(self, limit):
+        removed = 0
+        rows = self.conn.execute("SELECT hash, ext, size FROM images ORDER BY last_access")
+        victims = []
+        for digest, ext, size in rows:
+            if self.total_bytes <= limit:
+                break
+            victims.append((digest, ext))
+            self.total_bytes -= size
+        for digest, ext in victims:
+            try:
+                os.remove(self.path(digest, ext))
+            except FileNotFoundError:
+                pass
+            self.conn.execute("DELETE FROM images WHERE hash = ?", (digest,))
+            # 지운 사진을 가리키던 URL 은 다음에 처음부터 다시 받는다
+            self.conn.execute("DELETE FROM sources WHERE hash = ?", (digest,))
+            removed += 1
+        self.conn.commit()
+        return removed
+
+    def evict(self, max_bytes=None):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 것부터 삭제 → 지운 사진 수"""
+        with self._lock:
+            return self._evict_locked(self.max_bytes if max_bytes is None else max_bytes)
+
+    def stats(self):
+        with self._lock:
+            images = self.conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+            sources = self.conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        return {"images": images, "urls": sources, "bytes": self.total_bytes, "max_bytes": self.max_bytes}
+
+
+# -------------------------------------
+# 받기
+# -------------------------------------
+def fetch_image(url, cache, timeout=DEFAULT_TIMEOUT, max_age=DEFAULT_MAX_AGE, session=None):
+    """
+    URL 하나를 캐시에 반영 → "fresh" / "not_modified" / "fetched"
+    (실패하면 requests 예외 또는 ValueError)
+    """
+    known = cache.validators(url)
+    if known is not None and time.time() - known[2] < max_age:
+        return "fresh"
+
+    headers = {}
+    if known is not None:
+        if known[0]:
+            headers["If-None-Match"] = known[0]
+        if known[1]:
+            headers["If-Modified-Since"] = known[1]
+
+    response = (session or get_session()).get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and known is not None:
+        cache.mark_checked(url)
+        return "not_modified"
+    response.raise_for_status()
+
+    data, content_type, ext = make_thumbnail(response.content)
+    cache.put(url, data, content_type, ext,
+              response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return "fetched"
+
+
+async def _drain(urls, cache, concurrency, summary, **kwargs):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def worker():
+        for url in urls:
+            try:
+                result = await loop.run_in_executor(executor, lambda u=url: fetch_image(u, cache, **kwargs))
+            except Exception:
+                result = "failed"
+            summary[result] += 1
+            metrics.inc("image_prefetch_total", result=result)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def prefetch(urls, cache, concurrency=8, timeout=DEFAULT_TIMEOUT, max_age=DEFAULT_MAX_AGE):
+    """
+    URL 목록을 동시에 최대 concurrency 개씩 받아 캐시에 반영
+    → {"fetched", "not_modified", "fresh", "failed"} 건수
+    """
+    summary = {"fetched": 0, "not_modified": 0, "fresh": 0, "failed": 0}
+    pending = iter(dict.fromkeys(u for u in urls if u))    # 중복 URL 은 한 번만
+    await _drain(pending, cache, concurrency, summary, timeout=timeout, max_age=max_age)
+    return summary
+
+
+class ImagePrefetcher:
+    """
+    오래 떠 있는 프로세스(Flask)용 백그라운드 미리 받기
+
+        prefetcher = ImagePrefetcher(cache).start()
+        prefetcher.submit(urls)      # 어느 스레드에서든 호출 가능, 바로 반환
+
+    별도 스레드의 이벤트 루프에서 prefetch 를 돌리고,
+    이미 대기 중이거나 받는 중인 URL 은 다시 넣지 않는다.
+    """
+
+    def __init__(self, cache, concurrency=8, timeout=DEFAULT_TIMEOUT, max_age=DEFAULT_MAX_AGE):
+        self.cache = cache
+        self.concurrency = concurrency
+        self.options = {"timeout": timeout, "max_age": max_age}
+        self.summary = {"fetched": 0, "not_modified": 0, "fresh": 0, "failed": 0}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._thread = None
+
+    def _run(self, ready):
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._queue = asyncio.Queue()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        ready.set()
+
+        async def worker():
+            while True:
+                url = await self._queue.get()
+                if url is None:
+                    return
+                try:
+                    result = await loop.run_in_executor(
+                        executor, lambda u=url: fetch_image(u, self.cache, **self.options))
+                except Exception:
+                    result = "failed"
+                with self._lock:
+                    self._pending.discard(url)
+                    self.summary[result] += 1
+                metrics.inc("image_prefetch_total", result=result)
+
+        async def main():
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        try:
+            loop.run_until_complete(main())
+        finally:
+            executor.shutdown(wait=False)
+            loop.close()
+
+    def start(self):
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="image-prefetcher", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def submit(self, urls):
+        """URL 들을 대기열에 추가 → 새로 넣은 수"""
+        added = []
+        with self._lock:
+            for url in urls:
+                if url and url not in self._pending:
+                    self._pending.add(url)
+                    added.append(url)
+        for url in added:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, url)
+        return len(added)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def stop(self):
+        """대기열을 다 받은 뒤 스레드 종료"""
+        for _ in range(self.concurrency):
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공고 사진 썸네일 캐시")
+    parser.add_argument("command", choices=("prefetch", "stats", "evict"))
+    parser.add_argument("path", nargs="?", default=None, help="prefetch: 공고 JSON (기본: fetch_animals 기본 경로)")
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help="캐시 디렉터리")
+    parser.add_argument("--max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=None, help="앞에서부터 이 수만큼만 받기")
+    args = parser.parse_args()
+
+    cache = ImageCache(args.dir, args.max_mb * 1024 * 1024)
+    if args.command == "prefetch":
+        import itertools
+        from src.fetch_animals import iter_animals
+
+        animals = iter_animals(args.path) if args.path else iter_animals()
+        urls = (a.get("popfile") for a in itertools.islice(animals, args.limit))
+        started = time.perf_counter()
+        result = asyncio.run(prefetch(urls, cache, concurrency=args.concurrency))
+        print(f"새로 받음 {result['fetched']} / 변경 없음 {result['not_modified']} / "
+              f"최신 {result['fresh']} / 실패 {result['failed']} ({time.perf_counter() - started:.1f}s)")
+    elif args.command == "evict":
+        print(f"삭제 {cache.evict()} 개")
+    stats = cache.stats()
+    print(f"사진 {stats['images']} 개 / URL {stats['urls']} 개 / "
+          f"{stats['bytes'] / (1024 * 1024):.1f}MB (최대 {stats['max_bytes'] / (1024 * 1024):.0f}MB)")
+    cache.close()
@@ -0,0 +1,124 @@
+# src/knime_normalize.py
+"""
+KNIME 내보내기 CSV (wide) → 동물 한 마리당 한 레코드 (long) 변환
+
+KNIME 은 공고 여러 건을 한 행에 옆으로 이어 붙인다.
+
+    noticeNo, noticeSdt, ..., noticeNo (#1), noticeSdt (#1), noticeEdt (#1), ..., noticeNo (#2), ...
+
+'(#n)' 접미사로 컬럼 묶음을 찾아서 묶음마다 통째로 잘라 세로로 쌓는다.
+(행/레코드 단위 파이썬 루프 없이 pandas 연산만 사용 — 묶음 수만큼만 반복)
+결과 레코드는 API 응답 item 과 같은 모양(문자열 값 dict)이라
+preprocess_animals 에 그대로 넣을 수 있다.
+
+    from src.knime_normalize import iter_knime_animals
+    animals = preprocess_animals(iter_knime_animals("final_urgent_prompts.csv"))
+"""
+import re
+
+import pandas as pd
+
+from src.csv_ingest import read_csv_cached
+
+# 'noticeNo (#2)' → ('noticeNo', 2)
+_SUFFIX_RE = re.compile(r"^(.*?)\s*\(#(\d+)\)$")
+
+# 어느 묶음에 속한 레코드인지 (원본 행 번호, 묶음 번호) — 출력 레코드에는 넣지 않음
+ROW_COLUMN = "_row"
+GROUP_COLUMN = "_group"
+
+# 결측 때문에 float 로 읽혀도 정수 문자열로 되돌릴 필드 (공고번호 / 날짜)
+INTEGER_FIELDS = ("noticeNo", "desertionNo", "happenDt", "noticeSdt", "noticeEdt")
+
+
+def detect_groups(columns):
+    """
+    컬럼 목록 → {묶음 번호: {필드명: 원본 컬럼명}}
+    접미사 없는 컬럼은 다른 묶음에도 나오는 필드일 때만 0번 묶음으로 본다.
+    (numOfRows, AI_Consulting_Prompt 같은 행 단위 컬럼은 제외)
+    """
+    groups = {}
+    for col in columns:
+        m = _SUFFIX_RE.match(str(col))
+        if m:
+            groups.setdefault(int(m.group(2)), {})[m.group(1)] = col
+
+    fields = set()
+    for g in groups.values():
+        fields.update(g)
+
+    base = {col: col for col in columns if col in fields}
+    if base:
+        groups[0] = base
+    return dict(sorted(groups.items()))
+
+
+def _as_text(series):
+    """
+    컬럼 하나를 API 와 같은 문자열 값으로 (결측은 "")
+    KNIME 이 숫자로 읽힌 공고번호/날짜(20251118.0 등)는 정수 문자열로 되돌린다.
+    (체중 같은 나머지 숫자 필드는 "8.0" 그대로)
+    """
+    if series.name in INTEGER_FIELDS and pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        if len(values) and (values == values.round()).all():
+            series = series.astype("Int64")
+    return series.astype("string").fillna("").astype(object)
+
+
+def normalize_wide(df, keep=()):
+    """
+    wide DataFrame → 동물 한 마리당 한 행인 long DataFrame
+
+    - 묶음마다 빠진 필드(0번 묶음의 noticeEdt 등)는 "" 로 채운다.
+    - 모든 필드가 비어 있는 칸(그 행에 동물이 더 없음)은 버린다.
+    - keep 에 준 행 단위 컬럼은 같은 행의 모든 레코드에 복사한다.
+    - 순서는 (원본 행, 묶음 번호) 순
+    """
+    groups = detect_groups(df.columns)
+    fields = []
+    for g in groups.values():
+        fields.extend(f for f in g if f not in fields)
+
+    frames = []
+    for number, mapping in groups.items():
+        part = df[list(mapping.values())].rename(columns={v: k for k, v in mapping.items()})
+        present = part.notna().any(axis=1).to_numpy()
+        # 숫자 → 문자열 변환은 원본 컬럼 단위로 (묶음끼리 섞이기 전에)
+        part = part.apply(_as_text).reindex(columns=fields, fill_value="")
+        part[ROW_COLUMN] = range(len(df))
+        part[GROUP_COLUMN] = number
+        frames.append(part[present])
+
+    if not frames:
+        return pd.DataFrame(columns=fields + list(keep))
+
+    long = pd.concat(frames, ignore_index=True)
+    for col in keep:
+        long[col] = _as_text(df[col]).to_numpy()[long[ROW_COLUMN].to_numpy()]
+
+    long = long.sort_values([ROW_COLUMN, GROUP_COLUMN], kind="stable", ignore_index=True)
+    return long
+
+
+def to_records(long):
+    """long DataFrame → 레코드 dict 리스트 (내부용 _row/_group 컬럼 제외)"""
+    return long.drop(columns=[ROW_COLUMN, GROUP_COLUMN], errors="ignore").to_dict("records")
+
+
+def iter_knime_animals(path, keep=()):
+    """
+    KNIME CSV 파일 → 동물 레코드를 하나씩 yield (iter_animals 대신 사용)
+    인코딩 판별/사이드카 캐시는 src.csv_ingest 를 그대로 쓴다.
+    """
+    yield from to_records(normalize_wide(read_csv_cached(path), keep=keep))
+
+
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "./data/final_urgent_prompts.csv"
+    records = list(iter_knime_animals(path))
+    print(f"{path}: 동물 {len(records)} 마리")
+    for a in records:
+        print(a.get("noticeNo"), a.get("kindCd"), a.get("noticeEdt") or "(마감일 없음)")
@@ -0,0 +1,192 @@
+# src/llm_cache.py
+"""
+대시보드(adoption_dashboard.py, data/stream_app.py)가 같이 쓰는 LLM 응답 캐시
+
+- 키: (모델, 동물 프롬프트, 사용자 환경, 응답 스키마) 를 정규화한 sha256
+- 1차: 메모리 LRU / 2차: SQLite 파일 — 둘 다 TTL 이 지나면 버린다
+- 같은 키로 동시에 들어온 요청은 upstream 호출 한 번으로 합친다
+- 빈 응답이나 validate 를 통과하지 못한 응답(잘린 JSON 등)은 저장하지 않는다
+
+    cache = LLMCache()
+    key = cache.make_key(model, animal_prompt, user_env, schema)
+    result = cache.get_or_compute(key, lambda: call_model(...), validate=lambda text: ...)
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from src import metrics
+
+DEFAULT_CACHE_PATH = "./data/llm_cache.sqlite"
+DEFAULT_TTL = 7 * 24 * 3600     # 7일
+DEFAULT_MAX_ENTRIES = 512       # 메모리 LRU 크기
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _normalize(text):
+    # 앞뒤 공백/줄바꿈/들여쓰기 차이로 키가 달라지지 않도록
+    return _SPACES_RE.sub(" ", str(text or "")).strip()
+
+
+def _cacheable(value, validate):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return False
+    return validate is None or validate(value)
+
+
+class LLMCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = OrderedDict()    # key → (만료 시각, 값)
+        self._inflight = {}             # key → Future (진행 중인 upstream 호출)
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " expires_at REAL NOT NULL,"
+                " value TEXT NOT NULL)"
+            )
+            self.conn.commit()
+
+    @staticmethod
+    def make_key(model, prompt, user_env="", schema=None):
+        raw = json.dumps(
+            [model, _normalize(prompt), _normalize(user_env), schema],
+            ensure_ascii=False, sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ----- 조회/저장 -----
+    def _get_locked(self, key, now):
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                metrics.inc("llm_cache_requests_total", result="memory_hit")
+                return True, entry[1]
+            del self._memory[key]
+
+        if self.conn is not None:
+            row = self.conn.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                if row[0] > now:
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self.disk_hits += 1
+                    metrics.inc("llm_cache_requests_total", result="disk_hit")
+                    return True, value
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+
+        return False, None
+
+    def _remember(self, key, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """(적중 여부, 값)"""
+        with self._lock:
+            hit, value = self._get_locked(key, time.time())
+            if not hit:
+                self.misses += 1
+                metrics.inc("llm_cache_requests_total", result="miss")
+            return hit, value
+
+    def set(self, key, value):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, json.dumps(value, ensure_ascii=False)),
+                )
+                self.conn.commit()
+
+    def get_or_compute(self, key, compute, validate=None):
+        """
+        캐시에 있으면 바로 반환, 없으면 compute() 결과를 저장 후 반환
+        같은 키를 다른 스레드가 계산 중이면 그 결과를 기다린다.
+        compute() 에서 난 예외는 캐시하지 않고 그대로 전달된다.
+        결과가 None / 빈 문자열이거나 validate(결과) 가 거짓이면 반환만 하고 저장하지 않는다.
+        (잘리거나 차단된 응답 하나가 TTL 동안 재사용되지 않도록)
+        """
+        with self._lock:
+            hit, value = self._get_locked(key, time.time())
+            if hit:
+                return value
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                metrics.inc("llm_cache_requests_total", result="miss")
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+                metrics.inc("llm_cache_requests_total", result="coalesced")
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if _cacheable(value, validate):
+                self.set(key, value)
+            else:
+                metrics.inc("llm_cache_requests_total", result="rejected")
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def purge_expired(self):
+        """만료된 항목 정리 → 지운 디스크 항목 수"""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (exp, _) in self._memory.items() if exp <= now]:
+                del self._memory[key]
+            if self.conn is None:
+                return 0
+            cur = self.conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self.conn.commit()
+            return cur.rowcount
+
+    # ----- 통계 -----
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses + self.coalesced
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (hits + self.coalesced) / total if total else 0.0,
+        }
@@ -0,0 +1,178 @@
+# src/llm_client.py
+"""
+대시보드/배치가 같이 쓰는 모델 API 클라이언트
+
+- 프로세스 전체에서 keep-alive 커넥션 풀(requests.Session) 하나를 재사용 (src.http_client)
+  → 클릭마다 TCP/TLS 핸드셰이크를 다시 하지 않음
+- 모든 요청에 (연결, 읽기) 타임아웃 적용
+- Gemini streamGenerateContent(SSE) / OpenAI 스타일 chat.completions(stream=true)
+  스트리밍을 텍스트 조각 제너레이터로 제공 → st.write_stream 으로 바로 출력
+
+    for chunk in gemini_stream(prompt, api_key):
+        print(chunk, end="")
+
+base_url 을 src.stub_server 주소로 바꾸면 로컬에서 확인할 수 있다.
+"""
+import json
+import time
+
+import requests
+
+from src import metrics
+from src.http_client import get_session
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+OPENAI_BASE_URL = "https://api.openai.com"
+
+# (연결, 읽기) 타임아웃 — 스트리밍에서는 '다음 조각까지' 기다리는 시간
+DEFAULT_TIMEOUT = (5, 60)
+
+# -------------------------------------
+# SSE (text/event-stream) 파서
+# -------------------------------------
+def iter_sse(response):
+    """
+    SSE 응답에서 이벤트의 data 를 하나씩 yield
+    (여러 줄 data 는 줄바꿈으로 합치고, 빈 줄에서 이벤트가 끝난다)
+    """
+    data = []
+    for raw in response.iter_lines():
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue  # 주석 (keep-alive ping)
+        if line.startswith("data:"):
+            value = line[5:]
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+# -------------------------------------
+# 스트리밍 계측 (첫 조각까지 / 마지막 조각까지)
+# -------------------------------------
+def _timed_stream(chunks, api):
+    if not metrics.is_enabled():
+        yield from chunks
+        return
+
+    started = time.perf_counter()
+    first = True
+    try:
+        for chunk in chunks:
+            if first:
+                metrics.observe("llm_first_chunk_seconds", time.perf_counter() - started, api=api)
+                first = False
+            yield chunk
+    except requests.RequestException:
+        metrics.inc("llm_request_errors_total", api=api)
+        raise
+    metrics.observe("llm_request_seconds", time.perf_counter() - started, api=api)
+
+
+# -------------------------------------
+# Gemini
+# -------------------------------------
+def gemini_payload(text, generation_config=None):
+    payload = {"contents": [{"parts": [{"text": text}]}]}
+    if generation_config:
+        payload["generationConfig"] = generation_config
+    return payload
+
+
+def _gemini_text(result):
+    return result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
+
+
+def gemini_generate(text, api_key, model, base_url=GEMINI_BASE_URL,
+                    generation_config=None, timeout=DEFAULT_TIMEOUT):
+    """
+    generateContent 한 번 호출 → 응답 텍스트 (HTTP 오류는 requests.HTTPError)
+    """
+    try:
+        with metrics.timer("llm_request_seconds", api="gemini"):
+            response = get_session().post(
+                f"{base_url}/v1beta/models/{model}:generateContent",
+                params={"key": api_key},
+                json=gemini_payload(text, generation_config),
+                timeout=timeout,
+            )
+            response.raise_for_status()
+    except requests.RequestException:
+        metrics.inc("llm_request_errors_total", api="gemini")
+        raise
+    return _gemini_text(response.json())
+
+
+def gemini_stream(text, api_key, model, base_url=GEMINI_BASE_URL,
+                  generation_config=None, timeout=DEFAULT_TIMEOUT):
+    """
+    streamGenerateContent(alt=sse) → 텍스트 조각 제너레이터
+    """
+    return _timed_stream(_gemini_stream(text, api_key, model, base_url, generation_config, timeout), "gemini")
+
+
+def _gemini_stream(text, api_key, model, base_url, generation_config, timeout):
+    with get_session().post(
+        f"{base_url}/v1beta/models/{model}:streamGenerateContent",
+        params={"key": api_key, "alt": "sse"},
+        json=gemini_payload(text, generation_config),
+        timeout=timeout,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        for data in iter_sse(response):
+            chunk = _gemini_text(json.loads(data))
+            if chunk:
+                yield chunk
+
+
+# -------------------------------------
+# OpenAI 스타일 chat.completions
+# -------------------------------------
+def chat_complete(messages, api_key, model, base_url=OPENAI_BASE_URL, timeout=DEFAULT_TIMEOUT):
+    """
+    chat.completions 한 번 호출 → 답변 텍스트
+    """
+    try:
+        with metrics.timer("llm_request_seconds", api="openai"):
+            response = get_session().post(
+                f"{base_url}/v1/chat/completions",
+                headers={"Authorization": f"Bearer {api_key}"},
+                json={"model": model, "messages": messages},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+    except requests.RequestException:
+        metrics.inc("llm_request_errors_total", api="openai")
+        raise
+    return response.json()["choices"][0]["message"]["content"]
+
+
+def chat_stream(messages, api_key, model, base_url=OPENAI_BASE_URL, timeout=DEFAULT_TIMEOUT):
+    """
+    chat.completions(stream=true) → 텍스트 조각 제너레이터 ('[DONE]' 에서 종료)
+    """
+    return _timed_stream(_chat_stream(messages, api_key, model, base_url, timeout), "openai")
+
+
+def _chat_stream(messages, api_key, model, base_url, timeout):
+    with get_session().post(
+        f"{base_url}/v1/chat/completions",
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={"model": model, "messages": messages, "stream": True},
+        timeout=timeout,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        for data in iter_sse(response):
+            if data.strip() == "[DONE]":
+                return
+            choices = json.loads(data).get("choices") or [{}]
+            chunk = (choices[0].get("delta") or {}).get("content")
+            if chunk:
+                yield chunk
@@ -0,0 +1,247 @@
+# src/metrics.py
+"""
+가벼운 계측 모듈 (카운터 / 히스토그램 / 타이머)
+
+    from src import metrics
+
+    with metrics.timer("animal_stage_seconds", stage="preprocess"):
+        ...
+
+    @metrics.timed("animal_stage_seconds", stage="filter_by_kind")
+    def filter_by_kind(...): ...
+
+    metrics.inc("llm_cache_requests_total", result="miss")
+
+- 기본은 꺼져 있고, 꺼져 있으면 타이머/카운터가 아무 일도 하지 않는다.
+  (플래그 확인 한 번 + 공용 no-op 객체 반환뿐이라 거의 비용이 없음)
+- 켜는 방법: metrics.enable() 또는 환경변수 ANIMAL_METRICS=1
+- render_prometheus() → Prometheus 텍스트 형식 (Flask /metrics)
+- report() → 사람이 읽는 단계별 표 (main.py --profile)
+"""
+import functools
+import os
+import threading
+import time
+
+# 초 단위 히스토그램 구간 (마지막 +Inf 는 자동)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 지표 이름 → 설명 (render_prometheus 의 # HELP)
+DESCRIPTIONS = {
+    "animal_stage_seconds": "파이프라인 단계별 소요 시간",
+    "preprocess_cache_requests_total": "전처리 캐시 조회 결과",
+    "llm_cache_requests_total": "LLM 응답 캐시 조회 결과",
+    "llm_request_seconds": "모델 API 응답 시간 (스트리밍은 마지막 조각까지)",
+    "llm_first_chunk_seconds": "모델 API 스트리밍 첫 조각까지 걸린 시간",
+    "llm_request_errors_total": "모델 API 호출 실패",
+    "http_request_seconds": "Flask 요청 처리 시간",
+    "http_requests_total": "Flask 요청 수",
+    "image_prefetch_total": "공고 사진 미리 받기 결과",
+}
+
+_enabled = os.getenv("ANIMAL_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_counters = {}      # (이름, 라벨) → 값
+_histograms = {}    # (이름, 라벨) → _Histogram
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+# -------------------------------------
+# 카운터 / 히스토그램
+# -------------------------------------
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)    # 구간별 (누적 아님)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+
+def inc(name, amount=1, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, value, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = _Histogram()
+        hist.observe(value)
+
+
+# -------------------------------------
+# 타이머
+# -------------------------------------
+class _Timer:
+    __slots__ = ("name", "labels", "started", "elapsed")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.elapsed = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        observe(self.name, self.elapsed, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+    elapsed = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name, **labels):
+    """
+    with 블록의 소요 시간을 히스토그램에 기록 (꺼져 있으면 no-op)
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name, **labels):
+    """
+    함수 호출 시간을 기록하는 데코레이터 (켜짐/꺼짐은 호출할 때마다 확인)
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started, **labels)
+        return wrapper
+    return decorator
+
+
+# -------------------------------------
+# 출력
+# -------------------------------------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def render_prometheus():
+    """
+    Prometheus 텍스트 노출 형식 (text/plain; version=0.0.4)
+    """
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((k, (list(h.counts), h.sum, h.count, h.buckets)) for k, h in _histograms.items())
+
+    lines = []
+    seen = set()
+
+    def header(name, kind):
+        if name not in seen:
+            seen.add(name)
+            if name in DESCRIPTIONS:
+                lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in counters:
+        header(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for (name, labels), (counts, total, count, buckets) in histograms:
+        header(name, "histogram")
+        cumulative = 0
+        for bound, n in zip(buckets, counts):
+            cumulative += n
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', repr(bound))])} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def report():
+    """
+    단계별 표 (횟수 / 합계 / 평균 / 최대) + 카운터
+    """
+    with _lock:
+        rows = sorted(((name, dict(labels), h.count, h.sum, h.max) for (name, labels), h in _histograms.items()),
+                      key=lambda r: -r[3])
+        counters = sorted(_counters.items())
+
+    lines = [f"{'지표':<50} {'횟수':>6} {'합계(ms)':>12} {'평균(ms)':>10} {'최대(ms)':>10}"]
+    for name, labels, count, total, peak in rows:
+        label = ",".join(f"{k}={v}" for k, v in labels.items())
+        title = f"{name}[{label}]" if label else name
+        lines.append(f"{title:<50} {count:>6} {total * 1000:>12.1f} {total / count * 1000:>10.2f} {peak * 1000:>10.2f}")
+    for (name, labels), value in counters:
+        label = ",".join(f"{k}={v}" for k, v in labels)
+        title = f"{name}[{label}]" if label else name
+        lines.append(f"{title:<50} {value:>6}")
+    return "\n".join(lines)
@@ -1,23 +1,35 @@
 # src/preprocess_animals.py
-import datetime
+import functools
+import itertools
 import re
+from concurrent.futures import ProcessPoolExecutor
 
-# -------------------------------------
-# 날짜 변환
-# -------------------------------------
-def parse_date(date_str):
-    """
-    '20250131' → datetime.date 객체
-    """
-    try:
-        return datetime.datetime.strptime(date_str, "%Y%m%d").date()
-    except:
-        return None
+# 날짜 변환 ('20250131' → datetime.date) 은 animal_utils 와 같은 구현을 공유
+# (메모이즈 + 8자리 슬라이싱 fast path)
+from src import metrics
+from src.animal_utils import parse_date
+from src.preprocess_cache import record_hash
+from src.region import parse_place
+
+# 병렬 전처리 시 한 작업(프로세스 호출)에 넘기는 레코드 수
+DEFAULT_CHUNK_SIZE = 5000
+
+# preprocess_animal 이 원본 공고에 추가하는 필드
+ADDED_FIELDS = ("noticeSdt_parsed", "noticeEdt_parsed", "kindClean", "placeClean", "region", "careNm_lower")
+
+# preprocess_animal 결과 형식 버전 — preprocess_animal 이 만드는 값이 바뀌면 올린다
+# 전처리 캐시 키에 ADDED_FIELDS 와 함께 섞여서, 예전 형식으로 캐시된 결과는 다시 전처리된다.
+PREPROCESS_VERSION = 2
+PREPROCESS_SCHEMA = f"{PREPROCESS_VERSION}:{','.join(ADDED_FIELDS)}:"
+
+_BRACKET_RE = re.compile(r"\[.*?\]\s*")
+_SPACES_RE = re.compile(r"\s+")
 
 
 # -------------------------------------
 # 품종 정리
 # -------------------------------------
+@functools.lru_cache(maxsize=4096)
 def clean_kind(kindCd):
     """
     '[개] 포메라니안' → '포메라니안'
@@ -27,13 +39,14 @@ def clean_kind(kindCd):
         return ""
 
     # 대괄호 [xxx] 제거
-    cleaned = re.sub(r"\[.*?\]\s*", "", kindCd).strip()
+    cleaned = _BRACKET_RE.sub("", kindCd).strip()
     return cleaned
 
 
 # -------------------------------------
 # 장소(happenPlace) 정리
 # -------------------------------------
+@functools.lru_cache(maxsize=16384)
 def clean_place(place):
     """
     장소 문자열을 단순 정리
@@ -46,7 +59,7 @@ def clean_place(place):
     place = place.replace("시 ", " ")
 
     # 중복 공백 제거
-    place = re.sub(r"\s+", " ", place).strip()
+    place = _SPACES_RE.sub(" ", place).strip()
 
     return place
 
@@ -54,32 +67,110 @@ def clean_place(place):
 # -------------------------------------
 # 전체 데이터 전처리
 # -------------------------------------
-def preprocess_animals(raw_animals):
+def preprocess_animal(a):
     """
-    mock 데이터 리스트를 받아서
-    날짜/문자열/품종 등을 모두 정리한 새 리스트 반환
+    동물 한 마리(dict)를 정리한 새 dict 반환
     """
+    item = a.copy()  # 원본 손상 방지
 
-    processed = []
+    # 날짜 파싱
+    item["noticeSdt_parsed"] = parse_date(item.get("noticeSdt", ""))
+    item["noticeEdt_parsed"] = parse_date(item.get("noticeEdt", ""))
 
+    # 품종 정리
+    item["kindClean"] = clean_kind(item.get("kindCd", ""))
+
+    # 발생 장소 정리
+    item["placeClean"] = clean_place(item.get("happenPlace", ""))
+
+    # (시도, 시군구, 읍면동) — 지역 검색용
+    item["region"] = parse_place(item.get("happenPlace", ""))
+
+    # 보호소 이름 소문자 버전 (검색용)
+    item["careNm_lower"] = item.get("careNm", "").lower()
+
+    return item
+
+
+def iter_preprocess_animals(raw_animals):
+    """
+    iter_animals 같은 이터레이터를 받아 한 마리씩 전처리해서 yield
+    (원본 리스트를 통째로 들고 있지 않아도 됨)
+    """
     for a in raw_animals:
-        item = a.copy()  # 원본 손상 방지
+        yield preprocess_animal(a)
+
 
-        # 날짜 파싱
-        item["noticeSdt_parsed"] = parse_date(item.get("noticeSdt", ""))
-        item["noticeEdt_parsed"] = parse_date(item.get("noticeEdt", ""))
+def _preprocess_chunk(chunk):
+    # ProcessPoolExecutor 작업 단위 (모듈 최상위 함수여야 pickle 가능)
+    return [preprocess_animal(a) for a in chunk]
 
-        # 품종 정리
-        item["kindClean"] = clean_kind(item.get("kindCd", ""))
 
-        # 발생 장소 정리
-        item["placeClean"] = clean_place(item.get("happenPlace", ""))
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
-        # 보호소 이름 소문자 버전 (검색용)
-        item["careNm_lower"] = item.get("careNm", "").lower()
 
-        processed.append(item)
+def _preprocess_with_cache(raw_animals, cache, workers, chunk_size):
+    """
+    캐시에 (noticeNo, 원본 해시 + 전처리 형식) 가 있으면 재사용하고
+    새로 생겼거나 내용이 바뀐 공고만 모아서 전처리한다.
+    """
+    processed = []
+    missed = []  # (결과 위치, noticeNo, 해시, 원본)
+
+    for chunk in _chunks(raw_animals, chunk_size):
+        keys = [(a.get("noticeNo"), record_hash(a, PREPROCESS_SCHEMA)) for a in chunk]
+        found = cache.get_many([k for k in keys if k[0]])
+
+        for a, key in zip(chunk, keys):
+            item = found.get(key)
+            if item is None:
+                missed.append((len(processed), key[0], key[1], a))
+                cache.misses += 1
+            else:
+                cache.hits += 1
+            processed.append(item)
+
+    metrics.inc("preprocess_cache_requests_total", len(processed) - len(missed), result="hit")
+    metrics.inc("preprocess_cache_requests_total", len(missed), result="miss")
+
+    # 바깥 preprocess_animals 호출에서 이미 시간을 재고 있으므로 계측 없는 원본 함수로
+    fresh = preprocess_animals.__wrapped__([m[3] for m in missed], workers=workers, chunk_size=chunk_size)
+
+    for (pos, _, _, _), item in zip(missed, fresh):
+        processed[pos] = item
+    cache.put_many([(n, h, item) for (_, n, h, _), item in zip(missed, fresh) if n])
+
+    return processed
 
+
+@metrics.timed("animal_stage_seconds", stage="preprocess")
+def preprocess_animals(raw_animals, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """
+    mock 데이터 리스트(또는 이터레이터)를 받아서
+    날짜/문자열/품종 등을 모두 정리한 새 리스트 반환
+
+    workers 를 2 이상으로 주면 chunk_size 개씩 나눠서 프로세스 풀로 병렬 처리한다.
+    결과 순서와 내용은 직렬 처리와 동일하다.
+
+    cache(PreprocessCache) 를 주면 이전 실행에서 전처리한 공고는 재사용하고
+    새 공고/바뀐 공고만 처리한다. (cache.hits / cache.misses 로 확인)
+    """
+    if cache is not None:
+        return _preprocess_with_cache(raw_animals, cache, workers, chunk_size)
+
+    if not workers or workers <= 1:
+        return list(iter_preprocess_animals(raw_animals))
+
+    processed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_preprocess_chunk, _chunks(raw_animals, chunk_size)):
+            processed.extend(chunk)
     return processed
 
 
@@ -87,11 +178,9 @@ def preprocess_animals(raw_animals):
 # 빠른 테스트용 코드
 # -------------------------------------
 if __name__ == "__main__":
-    import json
+    from src.fetch_animals import load_mock_animals
 
-    with open("./data/sample_data_for_knime.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-        raw = data["response"]["body"]["items"]["item"]
+    raw = load_mock_animals()
 
     processed = preprocess_animals(raw)
 
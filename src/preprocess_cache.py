@@ -0,0 +1,112 @@
+# src/preprocess_cache.py
+import hashlib
+import json
+import pickle
+import sqlite3
+
+DEFAULT_CACHE_PATH = "./data/preprocess_cache.sqlite"
+
+# SQLite IN (...) 한 번에 넣는 키 수
+_BATCH = 500
+
+
+def record_hash(a, salt=""):
+    """
+    원본 공고 dict 의 내용 해시 (키 순서와 무관)
+    salt 를 주면 해시에 섞는다 (전처리 형식 버전 등)
+    """
+    raw = json.dumps(a, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1((salt + raw).encode("utf-8")).hexdigest()
+
+
+# -------------------------------------
+# 전처리 결과 디스크 캐시
+# -------------------------------------
+class PreprocessCache:
+    """
+    noticeNo → (원본 해시, 전처리된 dict) 를 SQLite 파일에 저장
+
+    같은 noticeNo 라도 원본 내용이 바뀌면 해시가 달라져서 다시 전처리된다.
+    해시에는 전처리 형식 버전(preprocess_animals.PREPROCESS_SCHEMA)도 섞여 있어서
+    전처리 결과 필드가 바뀌면 예전 캐시는 모두 미스가 된다.
+    hits / misses 는 이번 실행에서의 적중/미스 수.
+
+        with PreprocessCache() as cache:
+            animals = preprocess_animals(iter_animals(), cache=cache)
+            print(cache.hits, cache.misses)
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed ("
+            " notice_no TEXT PRIMARY KEY,"
+            " raw_hash TEXT NOT NULL,"
+            " record BLOB NOT NULL)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def get_many(self, keys):
+        """
+        [(noticeNo, 해시), ...] → {(noticeNo, 해시): 전처리된 dict} (해시가 같은 것만)
+        """
+        wanted = set(keys)
+        found = {}
+        notice_nos = list({n for n, _ in wanted})
+        for i in range(0, len(notice_nos), _BATCH):
+            part = notice_nos[i:i + _BATCH]
+            rows = self.conn.execute(
+                "SELECT notice_no, raw_hash, record FROM processed"
+                f" WHERE notice_no IN ({','.join('?' * len(part))})",
+                part,
+            )
+            for notice_no, raw_hash, record in rows:
+                if (notice_no, raw_hash) in wanted:
+                    found[(notice_no, raw_hash)] = pickle.loads(record)
+        return found
+
+    def put_many(self, entries):
+        """
+        [(noticeNo, 해시, 전처리된 dict), ...] 저장 (있으면 덮어씀)
+        """
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO processed (notice_no, raw_hash, record) VALUES (?, ?, ?)",
+            [(n, h, pickle.dumps(item, pickle.HIGHEST_PROTOCOL)) for n, h, item in entries],
+        )
+        self.conn.commit()
+
+    def discard(self, notice_nos):
+        """
+        주어진 공고들을 캐시에서 제거 → 요청한 개수
+        """
+        notice_nos = list(notice_nos)
+        for i in range(0, len(notice_nos), _BATCH):
+            part = notice_nos[i:i + _BATCH]
+            self.conn.execute(
+                f"DELETE FROM processed WHERE notice_no IN ({','.join('?' * len(part))})", part
+            )
+        self.conn.commit()
+        return len(notice_nos)
+
+    def prune(self, keep_notice_nos):
+        """
+        keep_notice_nos 에 없는 공고(만료/삭제된 공고)를 캐시에서 제거
+        """
+        keep = set(keep_notice_nos)
+        stale = [n for (n,) in self.conn.execute("SELECT notice_no FROM processed") if n not in keep]
+        return self.discard(stale)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
@@ -0,0 +1,162 @@
+# src/prompt_template.py
+"""
+AI_Consulting_Prompt 생성기 (KNIME 문자열 조작 노드 대체)
+
+KNIME 과 같은 '$필드$' 자리표시자 템플릿을 한 번 컴파일해 두고
+전처리된 레코드 묶음을 컬럼 단위로 채워서 프롬프트를 만든다.
+
+- 컴파일할 때 자리표시자 이름을 검사 → 오타가 있으면 바로 ValueError
+  (KNIME 처럼 '($neuterYn$)' 가 그대로 프롬프트에 남는 일이 없음)
+- 레코드마다 템플릿을 다시 해석하지 않고, 필드별 값 컬럼을 만든 뒤
+  미리 만들어 둔 format 문자열 하나로 이어 붙인다.
+- 결과는 제너레이터라 배치 실행기나 CSV 로 바로 흘려보낼 수 있다.
+
+    template = PromptTemplate(DEFAULT_TEMPLATE)
+    for prompt in iter_prompts(animals, template):
+        ...
+"""
+import csv
+import datetime
+import itertools
+import re
+
+from src.animal_store import FIELDS
+from src.fetch_animals import API_FIELDS
+from src.preprocess_animals import ADDED_FIELDS
+
+# KNIME 워크플로가 만들던 프롬프트와 같은 형식
+DEFAULT_TEMPLATE = (
+    " 긴급 입양 컨설팅 요청. 공고 종료일 임박:$noticeEdt_parsed$ 품종:$kindCd$"
+    " 성별(중성화):$sexCd$($neuterYn$) 나이:$age$ 특이사항:$specialMark$"
+)
+
+# 템플릿에서 쓸 수 있는 필드 (API 공고 필드 전체 + 전처리 추가 필드)
+# AnimalStore 는 FIELDS 만 들고 있으므로 그 밖의 필드는 스토어 행에서 빈 문자열이 된다.
+KNOWN_FIELDS = frozenset(API_FIELDS) | frozenset(FIELDS) | frozenset(ADDED_FIELDS)
+
+PROMPT_COLUMN = "AI_Consulting_Prompt"
+
+# 한 번에 컬럼으로 만들어 채우는 레코드 수
+DEFAULT_CHUNK_SIZE = 1000
+
+# '$name$' 자리표시자, '$$' 는 '$' 문자 그대로
+_PLACEHOLDER_RE = re.compile(r"\$\$|\$([A-Za-z_][A-Za-z0-9_]*)\$")
+
+
+def _to_text(value):
+    # None/NaN → "", 날짜 → '2025-11-30'
+    if value is None or value != value:
+        return ""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+class PromptTemplate:
+    """
+    '$필드$' 템플릿을 컴파일한 객체
+
+    fields 를 주면 그 안의 이름만 허용 (None 이면 검사하지 않음)
+    """
+
+    def __init__(self, text, fields=KNOWN_FIELDS):
+        self.text = text
+        self.fields = []    # 자리표시자 순서대로 (중복 제거)
+        parts = []
+        pos = 0
+
+        for m in _PLACEHOLDER_RE.finditer(text):
+            parts.append(self._literal(text[pos:m.start()]))
+            pos = m.end()
+            name = m.group(1)
+            if name is None:
+                parts.append("$")
+                continue
+            if name not in self.fields:
+                self.fields.append(name)
+            parts.append("{%d}" % self.fields.index(name))
+
+        parts.append(self._literal(text[pos:]))
+
+        if fields is not None:
+            unknown = [f for f in self.fields if f not in fields]
+            if unknown:
+                raise ValueError(f"알 수 없는 자리표시자: {', '.join(unknown)}")
+
+        self._format = "".join(parts).format
+
+    @staticmethod
+    def _literal(literal):
+        # 자리표시자 사이에 '$' 가 남아 있으면 짝이 안 맞거나 이름이 잘못된 것
+        if "$" in literal:
+            raise ValueError(f"잘못된 자리표시자: {literal!r}")
+        return literal.replace("{", "{{").replace("}", "}}")
+
+    def render(self, record):
+        """레코드 하나 → 프롬프트"""
+        return self._format(*(_to_text(record.get(f)) for f in self.fields))
+
+    def render_many(self, records):
+        """레코드 리스트 → 프롬프트 리스트 (필드별 컬럼을 만든 뒤 한 번에 채움)"""
+        records = list(records)
+        cols = [[_to_text(r.get(f)) for r in records] for f in self.fields]
+        if not cols:
+            return [self._format()] * len(records)
+        return list(map(self._format, *cols))
+
+
+def iter_prompts(records, template=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    레코드 이터레이터 → 프롬프트를 하나씩 yield
+    chunk_size 개씩 모아서 컬럼 단위로 채운다. (전체를 메모리에 올리지 않음)
+    """
+    template = template or PromptTemplate(DEFAULT_TEMPLATE)
+    it = iter(records)
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return
+        yield from template.render_many(chunk)
+
+
+def write_prompts_csv(records, path, template=None, id_field="noticeNo",
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    (id_field, AI_Consulting_Prompt) 두 컬럼 CSV 로 저장 → 기록한 행 수
+    utf-8-sig 로 저장하므로 엑셀과 src.csv_ingest 모두 인코딩을 자동 인식한다.
+    """
+    template = template or PromptTemplate(DEFAULT_TEMPLATE)
+    count = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([id_field, PROMPT_COLUMN])
+        it = iter(records)
+        while True:
+            chunk = list(itertools.islice(it, chunk_size))
+            if not chunk:
+                break
+            ids = [_to_text(r.get(id_field)) for r in chunk]
+            writer.writerows(zip(ids, template.render_many(chunk)))
+            count += len(chunk)
+    return count
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.fetch_animals import DEFAULT_PATH, iter_animals
+    from src.preprocess_animals import iter_preprocess_animals
+
+    parser = argparse.ArgumentParser(description="공고 JSON → 입양 컨설팅 프롬프트 CSV")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH, help="공고 JSON (gzip 가능)")
+    parser.add_argument("--out", default="./data/consulting_prompts.csv")
+    parser.add_argument("--template", default=None, help="템플릿 텍스트 파일 (기본: KNIME 과 같은 형식)")
+    args = parser.parse_args()
+
+    text = DEFAULT_TEMPLATE
+    if args.template:
+        with open(args.template, "r", encoding="utf-8") as f:
+            text = f.read()
+
+    n = write_prompts_csv(iter_preprocess_animals(iter_animals(args.path)), args.out, PromptTemplate(text))
+    print(f"프롬프트 {n}개 → {args.out}")
@@ -0,0 +1,433 @@
+# src/query.py
+"""
+filter_animals 뒤에서 동작하는 간단한 쿼리 엔진
+
+    q = Contains("kindCd", "말티즈") & (Contains("happenPlace", "서울") | ~Equals("sexCd", "M"))
+    result = run_query(animals, q)
+
+- 리스트(또는 이터레이터): 조건 전체를 함수 하나로 컴파일해서 한 번만 훑는다.
+  AND 는 선택도(만족 비율)가 낮은 조건부터, OR 는 높은 조건부터 검사해서
+  최대한 빨리 결론이 나도록 순서를 바꾼다.
+- AnimalIndex / AnimalStore: 조건마다 행 번호를 구해서 교집합/합집합만 계산한다.
+- AnimalDB (SQLite): 조건 전체를 WHERE 절 하나로 바꿔서 DB 가 실행한다.
+
+결과는 QueryResult 로 돌려주며 실제로 순회할 때 계산된다.
+"""
+import itertools
+from collections import Counter
+
+from src.region import parse_place, parse_region_query, region_matcher
+
+# 선택도 추정에 쓰는 표본 크기
+SAMPLE_SIZE = 512
+
+
+# -----------------------------
+#  필드 통계 (선택도 추정용)
+# -----------------------------
+class FieldStats:
+    """
+    동물 목록 일부를 표본으로 뽑아 필드별 값 분포(카디널리티)를 센다.
+    길이를 알 수 없는 이터레이터라면 통계 없이 원래 순서대로 검사한다.
+    """
+
+    def __init__(self, animals, sample_size=SAMPLE_SIZE):
+        self.sample = []
+        self._counts = {}
+
+        if hasattr(animals, "__len__") and hasattr(animals, "__getitem__"):
+            n = len(animals)
+            step = max(1, n // sample_size)
+            self.sample = [animals[i] for i in range(0, n, step)][:sample_size]
+
+    def counts(self, field):
+        c = self._counts.get(field)
+        if c is None:
+            c = Counter((a.get(field, "") or "") for a in self.sample)
+            self._counts[field] = c
+        return c
+
+    def cardinality(self, field):
+        return len(self.counts(field))
+
+    def fraction(self, field, match):
+        """
+        표본에서 match(값) 을 만족하는 비율 (고유 값마다 한 번만 평가)
+        """
+        if not self.sample:
+            return 0.5
+        c = self.counts(field)
+        hit = sum(cnt for v, cnt in c.items() if match(v))
+        return hit / len(self.sample)
+
+
+# -----------------------------
+#  조건식
+# -----------------------------
+class Predicate:
+    # True 면 색인으로 찾을 수 없어 후보를 하나씩 확인해야 하는 조건
+    scan = False
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+    def compile(self, stats):
+        """레코드 하나 → bool 함수"""
+        raise NotImplementedError
+
+    def estimate(self, stats):
+        """만족하는 레코드 비율 추정 (0~1)"""
+        raise NotImplementedError
+
+    def ids(self, backend, universe):
+        """색인/컬럼 저장소에서 만족하는 행 번호 집합"""
+        raise NotImplementedError
+
+    def sql(self, db):
+        """(WHERE 절, 인자 리스트) — SQL 로 바꿀 수 없으면 NotImplementedError"""
+        raise NotImplementedError
+
+
+class Contains(Predicate):
+    """
+    부분 문자열 검색 (대소문자 무시) — filter_by_* 와 같은 의미
+    """
+
+    def __init__(self, field, keyword):
+        self.field = field
+        self.keyword = keyword.lower()
+
+    def compile(self, stats):
+        field, kw = self.field, self.keyword
+        return lambda a: kw in (a.get(field, "") or "").lower()
+
+    def estimate(self, stats):
+        kw = self.keyword
+        return stats.fraction(self.field, lambda v: kw in v.lower())
+
+    def ids(self, backend, universe):
+        return set(backend.lookup(self.field, self.keyword))
+
+    def sql(self, db):
+        return db.contains_sql(self.field, self.keyword)
+
+    def __repr__(self):
+        return f"Contains({self.field!r}, {self.keyword!r})"
+
+
+class Equals(Predicate):
+    """
+    값이 정확히 같은지 (예: sexCd == 'F', neuterYn == 'Y')
+    """
+
+    def __init__(self, field, value):
+        self.field = field
+        self.value = value
+
+    def compile(self, stats):
+        field, value = self.field, self.value
+        return lambda a: a.get(field, "") == value
+
+    def estimate(self, stats):
+        c = stats.counts(self.field)
+        if not stats.sample:
+            return 0.5
+        if self.value in c:
+            return c[self.value] / len(stats.sample)
+        return 1 / (len(c) + 1)
+
+    def ids(self, backend, universe):
+        # 부분 검색 결과 중에서 정확히 같은 것만 남긴다
+        field, value = self.field, self.value
+        candidates = backend.lookup(field, value or "")
+        return {i for i in candidates if backend[i].get(field, "") == value}
+
+    def sql(self, db):
+        return db.equals_sql(self.field, self.value)
+
+    def __repr__(self):
+        return f"Equals({self.field!r}, {self.value!r})"
+
+
+class InRegion(Predicate):
+    """
+    발생 장소가 지역(시도 / 시군구 / 읍면동) 안에 있는지
+
+        InRegion("서울")                       # 서울특별시 전체
+        InRegion("수원시 팔달구")               # 시군구까지
+        InRegion("서울 강서구", "neighbors")    # 서울과 맞닿은 시도(경기/인천)까지
+
+    지역으로 해석되지 않는 검색어는 기존처럼 happenPlace 부분 검색(Contains)으로 처리한다.
+    """
+
+    def __init__(self, text, expand=None):
+        self.text = text
+        self.expand = expand
+        self.query = parse_region_query(text)
+        self._fallback = Contains("happenPlace", text) if self.query is None else None
+
+    @staticmethod
+    def _region(a):
+        # preprocess_animal 이 채워 둔 (시도, 시군구, 읍면동), 원본 공고면 happenPlace 에서
+        return a.get("region") or parse_place(a.get("happenPlace", "") or "")
+
+    def compile(self, stats):
+        if self._fallback is not None:
+            return self._fallback.compile(stats)
+        match, region = region_matcher(self.query, self.expand), self._region
+        return lambda a: match(region(a))
+
+    def estimate(self, stats):
+        if self._fallback is not None:
+            return self._fallback.estimate(stats)
+        match = region_matcher(self.query, self.expand)
+        return stats.fraction("happenPlace", lambda v: match(parse_place(v)))
+
+    def ids(self, backend, universe):
+        if self._fallback is not None:
+            return self._fallback.ids(backend, universe)
+        if hasattr(backend, "region_lookup"):
+            return set(backend.region_lookup(self.query, self.expand))
+        match, region = region_matcher(self.query, self.expand), self._region
+        return {i for i in universe if match(region(backend[i]))}
+
+    def sql(self, db):
+        if self._fallback is not None:
+            return self._fallback.sql(db)
+        return db.region_sql(self.query, self.expand)
+
+    def __repr__(self):
+        return f"InRegion({self.text!r}, {self.expand!r})"
+
+
+class DateRange(Predicate):
+    """
+    날짜 필드가 [start, end] 구간에 있는지 (예: 마감일 N일 이내)
+    field 는 전처리된 날짜 필드 (noticeEdt_parsed 등), start/end 는 date 또는 None
+    """
+
+    scan = True
+
+    def __init__(self, field, start=None, end=None):
+        self.field = field
+        self.start = start
+        self.end = end
+
+    def _test(self, d):
+        if not d:
+            return False
+        if self.start is not None and d < self.start:
+            return False
+        if self.end is not None and d > self.end:
+            return False
+        return True
+
+    def compile(self, stats):
+        field, test = self.field, self._test
+        return lambda a: test(a.get(field))
+
+    def estimate(self, stats):
+        return stats.fraction(self.field, self._test)
+
+    def ids(self, backend, universe):
+        # 앞선 조건으로 좁혀진 후보(universe)만 확인
+        field, test = self.field, self._test
+        return {i for i in universe if test(backend[i].get(field))}
+
+    def sql(self, db):
+        return db.date_sql(self.field, self.start, self.end)
+
+    def __repr__(self):
+        return f"DateRange({self.field!r}, {self.start!r}, {self.end!r})"
+
+
+class And(Predicate):
+    def __init__(self, *preds):
+        self.preds = [p for p in preds if p is not None]
+
+    def compile(self, stats):
+        # 가장 잘 걸러내는 조건을 먼저 검사
+        ordered = sorted(self.preds, key=lambda p: p.estimate(stats))
+        funcs = [p.compile(stats) for p in ordered]
+        if not funcs:
+            return lambda a: True
+        if len(funcs) == 1:
+            return funcs[0]
+        return lambda a: all(f(a) for f in funcs)
+
+    def estimate(self, stats):
+        s = 1.0
+        for p in self.preds:
+            s *= p.estimate(stats)
+        return s
+
+    def ids(self, backend, universe):
+        if not self.preds:
+            return set(universe)
+
+        # 하나씩 확인해야 하는 조건과 NOT 은 앞선 결과를 좁히는 방식이 싸므로 뒤로 보낸다
+        result = None
+        for p in sorted(self.preds, key=lambda p: (isinstance(p, Not), p.scan)):
+            if isinstance(p, Not) and result is not None:
+                result -= p.pred.ids(backend, result)
+            else:
+                s = p.ids(backend, universe if result is None else result)
+                result = s if result is None else result & s
+            if not result:
+                return set()
+        return result
+
+    def sql(self, db):
+        return _join_sql(" AND ", self.preds, db, "1")
+
+    def __repr__(self):
+        return f"And{tuple(self.preds)!r}"
+
+
+class Or(Predicate):
+    def __init__(self, *preds):
+        self.preds = [p for p in preds if p is not None]
+
+    def compile(self, stats):
+        # 가장 많이 통과시키는 조건을 먼저 검사
+        ordered = sorted(self.preds, key=lambda p: -p.estimate(stats))
+        funcs = [p.compile(stats) for p in ordered]
+        return lambda a: any(f(a) for f in funcs)
+
+    def estimate(self, stats):
+        miss = 1.0
+        for p in self.preds:
+            miss *= 1 - p.estimate(stats)
+        return 1 - miss
+
+    def ids(self, backend, universe):
+        result = set()
+        for p in self.preds:
+            result |= p.ids(backend, universe)
+        return result
+
+    def sql(self, db):
+        return _join_sql(" OR ", self.preds, db, "0")
+
+    def __repr__(self):
+        return f"Or{tuple(self.preds)!r}"
+
+
+class Not(Predicate):
+    def __init__(self, pred):
+        self.pred = pred
+
+    def compile(self, stats):
+        f = self.pred.compile(stats)
+        return lambda a: not f(a)
+
+    def estimate(self, stats):
+        return 1 - self.pred.estimate(stats)
+
+    def ids(self, backend, universe):
+        return set(universe) - self.pred.ids(backend, universe)
+
+    def sql(self, db):
+        clause, params = self.pred.sql(db)
+        return f"NOT ({clause})", params
+
+    def __repr__(self):
+        return f"Not({self.pred!r})"
+
+
+def _join_sql(op, preds, db, empty):
+    clauses, params = [], []
+    for p in preds:
+        clause, p_params = p.sql(db)
+        clauses.append(f"({clause})")
+        params += p_params
+    return op.join(clauses) or empty, params
+
+
+# -----------------------------
+#  지연 결과
+# -----------------------------
+class QueryResult:
+    """
+    순회할 때 계산되는 결과
+    한 번 계산한 항목은 보관해 두므로 여러 번 순회해도 같은 결과가 나온다.
+    len() / 인덱싱을 하면 그때 끝까지 계산하고, bool() 은 첫 항목만 확인한다.
+    """
+
+    def __init__(self, source):
+        self._source = iter(source)
+        self._seen = []
+        self._done = False
+
+    def _pull(self):
+        i = 0
+        while True:
+            if i < len(self._seen):
+                yield self._seen[i]
+                i += 1
+                continue
+            if self._done:
+                return
+            try:
+                item = next(self._source)
+            except StopIteration:
+                self._done = True
+                return
+            self._seen.append(item)
+
+    def _materialize(self):
+        for _ in self._pull():
+            pass
+        return self._seen
+
+    def __iter__(self):
+        return self._pull()
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __bool__(self):
+        return bool(self.first(1))
+
+    def __getitem__(self, i):
+        return self._materialize()[i]
+
+    def __eq__(self, other):
+        return self._materialize() == list(other)
+
+    def first(self, n):
+        """앞의 n 개만 계산 (전체를 만들지 않음)"""
+        return list(itertools.islice(self._pull(), n))
+
+    def __repr__(self):
+        return f"QueryResult({self._materialize()!r})"
+
+
+# -----------------------------
+#  실행
+# -----------------------------
+def run_query(animals, pred):
+    """
+    pred 를 만족하는 동물을 QueryResult 로 반환
+    """
+    if hasattr(animals, "select"):
+        # AnimalDB: WHERE 절로 바꿔서 SQLite 가 색인(FTS5 / B-tree)으로 실행
+        return QueryResult(a for _, a in animals.select(pred))
+
+    if hasattr(animals, "lookup"):
+        # AnimalIndex / AnimalStore: 행 번호 집합 연산 한 번
+        def gen():
+            ids = pred.ids(animals, range(len(animals)))
+            for i in sorted(ids):
+                yield animals[i]
+        return QueryResult(gen())
+
+    stats = FieldStats(animals)
+    match = pred.compile(stats)
+    return QueryResult(a for a in animals if match(a))
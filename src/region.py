@@ -0,0 +1,234 @@
+# src/region.py
+"""
+발생 장소(happenPlace) → (시도, 시군구, 읍면동) 정규화 + 계층형 지역 색인
+
+    parse_place("서울시 강서구 화곡동 인근")   → ("서울특별시", "강서구", "화곡동")
+    parse_place("경기 수원시 팔달구 지동")     → ("경기도", "수원시 팔달구", "지동")
+
+- 시도는 별칭(서울특별시/서울시/서울, 강원도/강원특별자치도 …)을 정식 명칭 하나로 맞춘다.
+- 일반구가 있는 시는 '수원시 팔달구' 처럼 시군구 하나로 묶고, '수원시' 로도 찾을 수 있다.
+- RegionIndex 는 시도 → 시군구 → 읍면동 트리라 '서울', '서울 강서구' 같은 질의가
+  전체를 훑지 않고 해당 가지만 모은다. (결과 수에 비례)
+- expand="province" 는 같은 시도 전체, "neighbors" 는 맞닿은 시도까지 넓혀서 찾는다.
+  (시군구 단위 인접 정보는 없어서 이웃 확장은 시도 단위)
+"""
+import functools
+
+# 정식 시도명 → 별칭
+PROVINCES = {
+    "서울특별시": ("서울", "서울시"),
+    "부산광역시": ("부산", "부산시"),
+    "대구광역시": ("대구", "대구시"),
+    "인천광역시": ("인천", "인천시"),
+    "광주광역시": (),                  # '광주' / '광주시' 는 경기도 광주시와 헷갈려서 별칭 없음
+    "대전광역시": ("대전", "대전시"),
+    "울산광역시": ("울산", "울산시"),
+    "세종특별자치시": ("세종", "세종시"),
+    "경기도": ("경기",),
+    "강원특별자치도": ("강원", "강원도"),
+    "충청북도": ("충북",),
+    "충청남도": ("충남",),
+    "전북특별자치도": ("전북", "전라북도"),
+    "전라남도": ("전남",),
+    "경상북도": ("경북",),
+    "경상남도": ("경남",),
+    "제주특별자치도": ("제주", "제주도"),
+}
+
+# 맞닿은 시도 (expand="neighbors")
+NEIGHBOR_PROVINCES = {
+    "서울특별시": ("경기도", "인천광역시"),
+    "인천광역시": ("서울특별시", "경기도"),
+    "경기도": ("서울특별시", "인천광역시", "강원특별자치도", "충청북도", "충청남도"),
+    "강원특별자치도": ("경기도", "충청북도", "경상북도"),
+    "충청북도": ("경기도", "강원특별자치도", "경상북도", "전북특별자치도", "충청남도",
+             "대전광역시", "세종특별자치시"),
+    "충청남도": ("경기도", "충청북도", "세종특별자치시", "대전광역시", "전북특별자치도"),
+    "세종특별자치시": ("충청북도", "충청남도", "대전광역시"),
+    "대전광역시": ("충청북도", "충청남도", "세종특별자치시"),
+    "전북특별자치도": ("충청남도", "충청북도", "경상북도", "경상남도", "전라남도"),
+    "전라남도": ("전북특별자치도", "경상남도", "광주광역시"),
+    "광주광역시": ("전라남도",),
+    "경상북도": ("강원특별자치도", "충청북도", "전북특별자치도", "경상남도",
+             "대구광역시", "울산광역시"),
+    "대구광역시": ("경상북도", "경상남도"),
+    "경상남도": ("전북특별자치도", "전라남도", "경상북도", "대구광역시", "울산광역시", "부산광역시"),
+    "부산광역시": ("경상남도", "울산광역시"),
+    "울산광역시": ("부산광역시", "경상남도", "경상북도"),
+    "제주특별자치도": (),
+}
+
+EXPAND_MODES = ("province", "neighbors")
+
+_ALIASES = {}
+for _name, _aliases in PROVINCES.items():
+    _ALIASES[_name] = _name
+    for _alias in _aliases:
+        _ALIASES[_alias] = _name
+
+# 붙여 쓴 '서울강서구' 같은 경우를 위해 긴 별칭부터 검사
+_PREFIXES = sorted(_ALIASES, key=len, reverse=True)
+
+# 시도 별칭으로 시작하지만 그 자체가 시군구인 이름 (앞을 시도로 떼어 내면 안 됨)
+PREFIXED_SIGUNGU = frozenset({"부산진구"})
+
+_SIGUNGU_SUFFIXES = ("시", "군", "구")
+_DONG_SUFFIXES = ("읍", "면", "동", "가")
+
+EMPTY_REGION = ("", "", "")
+
+
+def _is_sigungu(token):
+    return len(token) > 1 and token.endswith(_SIGUNGU_SUFFIXES) and token not in _ALIASES
+
+
+def _is_dong(token):
+    return len(token) > 1 and token.endswith(_DONG_SUFFIXES)
+
+
+def _parse(place):
+    """
+    (시도, 시군구, 읍면동), 앞에서부터 읽어 들인 토큰 수
+    """
+    tokens = (place or "").split()
+    if not tokens:
+        return EMPTY_REGION, 0
+
+    sido = _ALIASES.get(tokens[0], "")
+    i = 1 if sido else 0
+    if not sido and tokens[0] not in PREFIXED_SIGUNGU:
+        for alias in _PREFIXES:
+            rest = tokens[0][len(alias):]
+            if tokens[0].startswith(alias) and _is_sigungu(rest):
+                sido = _ALIASES[alias]
+                tokens[0] = rest
+                break
+
+    sigungu = ""
+    if i < len(tokens) and _is_sigungu(tokens[i]):
+        sigungu = tokens[i]
+        i += 1
+        # 일반구 (수원시 팔달구)
+        if sigungu.endswith("시") and i < len(tokens) and tokens[i].endswith("구") and len(tokens[i]) > 1:
+            sigungu += " " + tokens[i]
+            i += 1
+
+    dong = ""
+    if i < len(tokens) and _is_dong(tokens[i]):
+        dong = tokens[i]
+        i += 1
+
+    return (sido, sigungu, dong), i
+
+
+@functools.lru_cache(maxsize=16384)
+def parse_place(place):
+    """발생 장소 문자열 → (시도, 시군구, 읍면동), 모르는 부분은 빈 문자열"""
+    return _parse(place)[0]
+
+
+def parse_region_query(text):
+    """
+    검색어 → (시도, 시군구, 읍면동)
+    지역으로 해석되지 않는 단어가 섞여 있거나 시도/시군구가 없으면 None
+    (호출하는 쪽에서 기존 부분 문자열 검색으로 대체)
+    """
+    region, used = _parse(text)
+    if used != len((text or "").split()) or not (region[0] or region[1]):
+        return None
+    return region
+
+
+def _sigungu_matches(value, wanted):
+    # '수원시' 질의는 '수원시 팔달구' 도 포함
+    return value == wanted or value.startswith(wanted + " ")
+
+
+def expand_provinces(sido, expand):
+    if expand == "neighbors":
+        return {sido, *NEIGHBOR_PROVINCES.get(sido, ())}
+    return {sido}
+
+
+def region_matcher(query, expand=None):
+    """
+    (시도, 시군구, 읍면동) → bool 함수
+    expand 는 시도를 알 때만 적용 (시군구만 준 질의는 그대로 비교)
+    """
+    sido, sigungu, dong = query
+    if expand in EXPAND_MODES and sido:
+        provinces = expand_provinces(sido, expand)
+        return lambda r: r[0] in provinces
+
+    def match(r):
+        if sido and r[0] != sido:
+            return False
+        if sigungu and not _sigungu_matches(r[1], sigungu):
+            return False
+        if dong and r[2] != dong:
+            return False
+        return True
+    return match
+
+
+# -------------------------------------
+# 계층형 색인
+# -------------------------------------
+class RegionIndex:
+    """
+    시도 → 시군구 → 읍면동 → 행 번호 리스트
+
+        index = RegionIndex()
+        for i, a in enumerate(animals):
+            index.add(i, a["region"])
+        index.lookup(("서울특별시", "강서구", ""))
+    """
+
+    def __init__(self):
+        self.tree = {}
+        self.by_sigungu = {}    # 시군구 이름('수원시', '수원시 팔달구') → {(시도, 시군구)}
+
+    def add(self, rid, region):
+        sido, sigungu, dong = region
+        node = self.tree.setdefault(sido, {})
+        if sigungu not in node:
+            node[sigungu] = {}
+            names = {sigungu, sigungu.split(" ")[0]} if sigungu else ()
+            for name in names:
+                self.by_sigungu.setdefault(name, set()).add((sido, sigungu))
+        node[sigungu].setdefault(dong, []).append(rid)
+
+    def _collect_sido(self, sido, out):
+        for dongs in self.tree.get(sido, {}).values():
+            for ids in dongs.values():
+                out.extend(ids)
+
+    def lookup(self, query, expand=None):
+        """
+        질의 (시도, 시군구, 읍면동) 에 해당하는 행 번호 리스트 (오름차순)
+        """
+        sido, sigungu, dong = query
+        out = []
+
+        if expand in EXPAND_MODES and sido:
+            for p in expand_provinces(sido, expand):
+                self._collect_sido(p, out)
+        elif sigungu:
+            for p, s in self.by_sigungu.get(sigungu, ()):
+                if sido and p != sido:
+                    continue
+                dongs = self.tree[p][s]
+                if dong:
+                    out.extend(dongs.get(dong, ()))
+                else:
+                    for ids in dongs.values():
+                        out.extend(ids)
+        elif sido:
+            if dong:
+                for dongs in self.tree.get(sido, {}).values():
+                    out.extend(dongs.get(dong, ()))
+            else:
+                self._collect_sido(sido, out)
+
+        out.sort()
+        return out
@@ -0,0 +1,291 @@
+# src/scoring.py
+"""
+마감 임박도 가중 점수로 추천 순위 매기기 (NumPy)
+
+recommend_animals 는 '지역/품종으로 거르고 마감일 순 정렬' 만 할 수 있어서
+여러 요소를 섞어 순위를 매길 수 없다. AnimalScorer 는 전처리된 데이터를 한 번
+NumPy 배열로 바꿔 두고, 질의마다 아래 요소의 가중합을 벡터 연산 한 번으로 계산한다.
+
+    마감 임박   noticeEdt 까지 남은 날 (DEADLINE_HORIZON 일 이내일수록 높음, 지난 공고는 0)
+    보호 기간   noticeSdt 부터 지난 날 (SHELTER_HORIZON 일까지 늘어남)
+    지역 일치   같은 읍면동 > 시군구 > 시도 > 맞닿은 시도 (src.region)
+    품종 일치   kindCd 에 원하는 품종 포함
+    나이/체중   원하는 범위 안이면 1, 벗어난 만큼 줄어듦
+    중성화     Y=1, U=0.5, N=0
+
+문자열 비교(지역/품종)는 고유 값(카테고리)마다 한 번만 하고 코드 배열로 펼치며,
+상위 k 개는 argpartition 으로 뽑아서 전체 정렬 없이 O(N) 이다.
+
+    scorer = AnimalScorer(animals)          # 리스트 / AnimalIndex / AnimalStore / 스냅샷 / AnimalDB
+    page = scorer.recommend("서울 강서구", "말티즈", limit=20, age_range=(0, 3))
+    for a, s in zip(page, page.scores): ...
+"""
+import datetime
+import functools
+import re
+
+import numpy as np
+
+from src import metrics
+from src.animal_store import AnimalStore
+from src.region import NEIGHBOR_PROVINCES, parse_place, parse_region_query
+
+# 요소별 기본 가중치
+DEFAULT_WEIGHTS = {
+    "deadline": 3.0,
+    "shelter": 1.0,
+    "region": 2.0,
+    "kind": 1.5,
+    "age": 0.5,
+    "weight": 0.5,
+    "neuter": 0.3,
+}
+
+# 마감까지 이 일수 이내부터 점수가 붙기 시작 (당일 마감 = 1)
+DEADLINE_HORIZON = 14
+
+# 보호 기간이 이 일수 이상이면 최대 점수
+SHELTER_HORIZON = 30
+
+# 지역 일치 정도별 점수
+REGION_SCORES = {"dong": 1.0, "sigungu": 0.8, "province": 0.5, "neighbor": 0.25}
+
+MISSING_DATE = 0
+
+_YEAR_RE = re.compile(r"(\d{4})")
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_birth_year(age):
+    """'2020(년생)' → 2020.0, 알 수 없으면 nan"""
+    m = _YEAR_RE.search(age or "")
+    return float(m.group(1)) if m else np.nan
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_weight(weight):
+    """'3.5(Kg)' → 3.5, 알 수 없으면 nan"""
+    m = _NUMBER_RE.search(weight or "")
+    return float(m.group(1)) if m else np.nan
+
+
+_NEUTER = {"Y": 1.0, "U": 0.5}
+
+
+def _ordinal(d):
+    return d.toordinal() if d else MISSING_DATE
+
+
+def _code(value, lookup, categories):
+    # 문자열 → 카테고리 코드 (AnimalStore 의 CategoricalColumn 과 같은 방식)
+    code = lookup.get(value)
+    if code is None:
+        code = lookup[value] = len(categories)
+        categories.append(value)
+    return code
+
+
+def _range_fit(values, value_range):
+    """범위 안이면 1, 벗어난 거리 d 만큼 1/(1+d), 값이 없으면 0"""
+    lo, hi = value_range
+    lo = -np.inf if lo is None else lo
+    hi = np.inf if hi is None else hi
+    dist = np.maximum(lo - values, 0) + np.maximum(values - hi, 0)
+    return np.nan_to_num(1.0 / (1.0 + dist), nan=0.0)
+
+
+# -------------------------------------
+# 순위 결과
+# -------------------------------------
+class RankedPage(list):
+    """
+    AnimalScorer.recommend 결과 (점수 높은 순 동물 리스트)
+    scores[i] 는 i 번째 동물의 점수
+    """
+    scores = ()
+
+
+# -------------------------------------
+# 점수 계산기
+# -------------------------------------
+class AnimalScorer:
+    """
+    전처리된 동물 목록 → 점수 계산용 컬럼 배열
+
+    한 번 만들어 두고 질의마다 score / top / recommend 를 부른다.
+    AnimalStore(스냅샷 포함)는 카테고리 코드와 날짜 ordinal 배열을 복사 없이 그대로 쓴다.
+    """
+
+    def __init__(self, animals):
+        if not hasattr(animals, "__getitem__"):
+            # AnimalDB 등 순회만 되는 저장소는 한 번 읽어서 행 번호로 접근
+            animals = list(animals)
+        self.animals = animals
+        if isinstance(animals, AnimalStore):
+            self._from_store(animals)
+        else:
+            self._from_records(animals)
+        self.n = len(self.end)
+
+        # 마감일 없는 공고는 동점일 때 맨 뒤로
+        self._end_key = np.where(self.end == MISSING_DATE, np.iinfo(np.int32).max, self.end)
+        self._regions = None
+
+    def _from_store(self, store):
+        place = store.categorical["happenPlace"]
+        kind = store.categorical["kindCd"]
+        neuter = store.categorical["neuterYn"]
+
+        self.places = place.categories
+        self.kinds = kind.categories
+        self.place_codes = np.frombuffer(place.codes, dtype=np.uint32)
+        self.kind_codes = np.frombuffer(kind.codes, dtype=np.uint32)
+        self.end = np.frombuffer(store.dates["noticeEdt"].ordinals, dtype=np.int32)
+        self.start = np.frombuffer(store.dates["noticeSdt"].ordinals, dtype=np.int32)
+
+        neuter_table = np.array([_NEUTER.get(c, 0.0) for c in neuter.categories], dtype=np.float32)
+        self.neuter = neuter_table[np.frombuffer(neuter.codes, dtype=np.uint32)]
+        self.birth_year = np.fromiter((parse_birth_year(s) for s in store.text["age"]),
+                                      dtype=np.float32, count=store.n)
+        self.weight = np.fromiter((parse_weight(s) for s in store.text["weight"]),
+                                  dtype=np.float32, count=store.n)
+
+    def _from_records(self, animals):
+        places, place_lookup = [], {}
+        kinds, kind_lookup = [], {}
+        place_codes, kind_codes = [], []
+        end, start, neuter, birth, weight = [], [], [], [], []
+
+        for a in animals:
+            place_codes.append(_code(a.get("happenPlace", "") or "", place_lookup, places))
+            kind_codes.append(_code(a.get("kindCd", "") or "", kind_lookup, kinds))
+            end.append(_ordinal(a.get("noticeEdt_parsed")))
+            start.append(_ordinal(a.get("noticeSdt_parsed")))
+            neuter.append(_NEUTER.get(a.get("neuterYn", ""), 0.0))
+            birth.append(parse_birth_year(a.get("age", "")))
+            weight.append(parse_weight(a.get("weight", "")))
+
+        self.places = places
+        self.kinds = kinds
+        self.place_codes = np.array(place_codes, dtype=np.uint32)
+        self.kind_codes = np.array(kind_codes, dtype=np.uint32)
+        self.end = np.array(end, dtype=np.int32)
+        self.start = np.array(start, dtype=np.int32)
+        self.neuter = np.array(neuter, dtype=np.float32)
+        self.birth_year = np.array(birth, dtype=np.float32)
+        self.weight = np.array(weight, dtype=np.float32)
+
+    # ----- 카테고리별 점수표 -----
+    def _region_table(self, user_region):
+        """happenPlace 카테고리마다 지역 일치 점수"""
+        table = np.zeros(len(self.places), dtype=np.float32)
+        if not user_region:
+            return table
+
+        query = parse_region_query(user_region)
+        if query is None:
+            # 지역으로 해석되지 않으면 부분 검색 (filter_by_region 과 동일)
+            kw = user_region.lower()
+            for code, place in enumerate(self.places):
+                if kw in place.lower():
+                    table[code] = 1.0
+            return table
+
+        if self._regions is None:
+            self._regions = [parse_place(p) for p in self.places]
+
+        sido, sigungu, dong = query
+        neighbors = set(NEIGHBOR_PROVINCES.get(sido, ()))
+        for code, (r_sido, r_sigungu, r_dong) in enumerate(self._regions):
+            same_sido = not sido or r_sido == sido
+            same_sigungu = same_sido and (not sigungu or r_sigungu == sigungu
+                                          or r_sigungu.startswith(sigungu + " "))
+            if same_sigungu and dong and r_dong == dong:
+                table[code] = REGION_SCORES["dong"]
+            elif same_sigungu and sigungu:
+                table[code] = REGION_SCORES["sigungu"]
+            elif same_sido and sido:
+                table[code] = REGION_SCORES["province"]
+            elif r_sido in neighbors:
+                table[code] = REGION_SCORES["neighbor"]
+        return table
+
+    def _kind_table(self, preferred_kind):
+        table = np.zeros(len(self.kinds), dtype=np.float32)
+        if preferred_kind:
+            kw = preferred_kind.lower()
+            for code, kind in enumerate(self.kinds):
+                if kw in kind.lower():
+                    table[code] = 1.0
+        return table
+
+    # ----- 점수 -----
+    def score(self, user_region=None, preferred_kind=None, age_range=None, weight_range=None,
+              weights=None, today=None):
+        """
+        동물마다 점수 (float32 배열, 행 번호 순)
+        age_range / weight_range: (최소, 최대) — 나이(년) / 체중(kg), 한쪽은 None 가능
+        weights: DEFAULT_WEIGHTS 중 바꿀 항목만
+        """
+        w = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        today = (today or datetime.date.today()).toordinal()
+
+        # 마감 임박: 오늘 마감 1 → DEADLINE_HORIZON 일 뒤 0, 지났거나 없으면 0
+        days_left = (self.end - today).astype(np.float32)
+        open_ = (self.end != MISSING_DATE) & (days_left >= 0)
+        deadline = np.where(open_, np.clip(1 - days_left / DEADLINE_HORIZON, 0, 1), 0)
+
+        # 보호 기간
+        days_in = (today - self.start).astype(np.float32)
+        shelter = np.where(self.start != MISSING_DATE, np.clip(days_in / SHELTER_HORIZON, 0, 1), 0)
+
+        total = w["deadline"] * deadline + w["shelter"] * shelter + w["neuter"] * self.neuter
+        if user_region:
+            total += w["region"] * self._region_table(user_region)[self.place_codes]
+        if preferred_kind:
+            total += w["kind"] * self._kind_table(preferred_kind)[self.kind_codes]
+        if age_range is not None:
+            age = datetime.date.fromordinal(today).year - self.birth_year
+            total += w["age"] * _range_fit(age, age_range)
+        if weight_range is not None:
+            total += w["weight"] * _range_fit(self.weight, weight_range)
+        return total.astype(np.float32, copy=False)
+
+    def top(self, scores, k):
+        """
+        점수 상위 k 개의 (행 번호 배열, 점수 배열)
+        argpartition 으로 k 번째 점수를 구하고, 그보다 높은 행은 모두 넣고
+        k 번째 점수와 같은 행들 중에서는 (마감일, 행 번호) 가 앞서는 것만 모자란 만큼 뽑는다.
+        (동점 묶음도 argpartition 이라 동점이 많아도 전체 정렬 없이 O(N), 마지막 정렬은 k 개만)
+        """
+        k = min(k, self.n)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        if k < self.n:
+            kth = -np.partition(-scores, k - 1)[k - 1]
+            above = np.flatnonzero(scores > kth)
+            tied = np.flatnonzero(scores == kth)
+            need = k - len(above)
+            if need < len(tied):
+                # (마감일, 행 번호) 를 정수 하나로 합쳐서 앞선 need 개만
+                tie_key = self._end_key[tied].astype(np.int64) * self.n + tied
+                tied = tied[np.argpartition(tie_key, need - 1)[:need]]
+            ids = np.concatenate((above, tied))
+        else:
+            ids = np.arange(self.n)
+        order = np.lexsort((ids, self._end_key[ids], -scores[ids]))
+        ids = ids[order]
+        return ids, scores[ids]
+
+    @metrics.timed("animal_stage_seconds", stage="score_recommend")
+    def recommend(self, user_region=None, preferred_kind=None, limit=20, **kwargs):
+        """
+        점수 높은 순 상위 limit 마리 (RankedPage)
+        나머지 인자는 score 와 같다.
+        """
+        scores = self.score(user_region, preferred_kind, **kwargs)
+        ids, top_scores = self.top(scores, limit)
+        page = RankedPage(self.animals[int(i)] for i in ids)
+        page.scores = [float(s) for s in top_scores]
+        return page
@@ -0,0 +1,238 @@
+# src/snapshot.py
+"""
+전처리된 동물 데이터를 바이너리 컬럼 파일로 저장하고 mmap 으로 바로 여는 모듈
+
+JSON 파싱 + 전처리 없이 파일을 매핑만 하므로 시작이 거의 즉시 끝나고,
+여러 프로세스(main.py, app.py 등)가 같은 페이지 캐시를 공유한다.
+
+파일 구조 (모든 오프셋은 파일 시작 기준, 8바이트 정렬)
+
+    [헤더]        magic(8) | version(uint32) | manifest 길이(uint32)
+    [manifest]    컬럼 목록/오프셋/날짜 예외값 등을 담은 UTF-8 JSON
+    [문자열 테이블] offsets(uint32 × (문자열 수 + 1)) + UTF-8 바이트
+    [컬럼]        카테고리: 카테고리별 문자열 번호(uint32) + 행별 코드(uint32)
+                  날짜: 행별 int32 ordinal
+                  텍스트: 행별 문자열 번호(uint32)
+
+변환:
+    python -m src.snapshot data/sample_data_for_knime.json data/animals.snap
+    python -m src.snapshot data/animals_2025-11-29.json data/animals_2025-11-29.snap
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from src.animal_store import AnimalStore
+
+SNAPSHOT_MAGIC = b"ANIMSNAP"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+def _pad(f):
+    pos = f.tell()
+    if pos % _ALIGN:
+        f.write(b"\0" * (_ALIGN - pos % _ALIGN))
+
+
+# -------------------------------------
+# 문자열 테이블
+# -------------------------------------
+class _StringTableWriter:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def add(self, s):
+        i = self.ids.get(s)
+        if i is None:
+            i = len(self.strings)
+            self.ids[s] = i
+            self.strings.append(s)
+        return i
+
+
+class _StringTable:
+    """mmap 위의 문자열 테이블 (필요한 문자열만 디코딩)"""
+
+    def __init__(self, buf, offsets, data_start):
+        self.buf = buf
+        self.offsets = offsets
+        self.data_start = data_start
+
+    def __getitem__(self, i):
+        start = self.data_start + self.offsets[i]
+        end = self.data_start + self.offsets[i + 1]
+        return str(self.buf[start:end], "utf-8")
+
+
+class _TextColumn:
+    """행별 문자열 번호 → 문자열 (읽기 전용)"""
+
+    def __init__(self, ids, table):
+        self.ids = ids
+        self.table = table
+
+    def __getitem__(self, i):
+        return self.table[self.ids[i]]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+# -------------------------------------
+# 저장
+# -------------------------------------
+def write_snapshot(animals, path):
+    """
+    AnimalStore (또는 동물 dict 목록/이터레이터) 를 스냅샷 파일로 저장
+    """
+    store = animals if isinstance(animals, AnimalStore) else AnimalStore.from_records(animals)
+
+    strings = _StringTableWriter()
+    blobs = []  # (이름, array)
+    manifest = {
+        "byteorder": sys.byteorder,
+        "rows": store.n,
+        "present": sorted(store.present),
+        "categorical": {},
+        "dates": {},
+        "text": {},
+        "extras": {str(i): e for i, e in store.extras.items()},
+    }
+
+    for f, col in store.categorical.items():
+        cats = array("I", (strings.add(c) for c in col.categories))
+        blobs.append((f"cat:{f}", cats))
+        blobs.append((f"codes:{f}", array("I", col.codes)))
+        manifest["categorical"][f] = {"categories": f"cat:{f}", "codes": f"codes:{f}"}
+
+    for f, col in store.dates.items():
+        blobs.append((f"date:{f}", array("i", col.ordinals)))
+        manifest["dates"][f] = {
+            "ordinals": f"date:{f}",
+            "raw": {str(i): v for i, v in col.raw.items()},
+        }
+
+    for f, col in store.text.items():
+        blobs.append((f"text:{f}", array("I", (strings.add(v) for v in col))))
+        manifest["text"][f] = f"text:{f}"
+
+    encoded = [s.encode("utf-8") for s in strings.strings]
+    offsets = array("I", [0])
+    for b in encoded:
+        offsets.append(offsets[-1] + len(b))
+
+    # 오프셋을 알아야 manifest 를 쓸 수 있으므로 크기를 먼저 계산
+    def layout(manifest_len):
+        pos = _HEADER.size + manifest_len
+        pos += -pos % _ALIGN
+        sections = {}
+        sections["str:offsets"] = (pos, len(offsets) * offsets.itemsize)
+        pos += len(offsets) * offsets.itemsize
+        sections["str:data"] = (pos, offsets[-1])
+        pos += offsets[-1]
+        for name, arr in blobs:
+            pos += -pos % _ALIGN
+            sections[name] = (pos, len(arr) * arr.itemsize)
+            pos += len(arr) * arr.itemsize
+        return sections
+
+    # manifest 길이가 오프셋 자릿수에 따라 바뀔 수 있어 안정될 때까지 반복
+    manifest_bytes = b""
+    while True:
+        manifest["sections"] = layout(len(manifest_bytes))
+        new_bytes = json.dumps(manifest, ensure_ascii=False, default=str).encode("utf-8")
+        if len(new_bytes) == len(manifest_bytes):
+            break
+        manifest_bytes = new_bytes
+    manifest_bytes = new_bytes
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        _pad(f)
+        offsets.tofile(f)
+        for b in encoded:
+            f.write(b)
+        for name, arr in blobs:
+            _pad(f)
+            arr.tofile(f)
+
+    return store.n
+
+
+# -------------------------------------
+# 불러오기
+# -------------------------------------
+def load_snapshot(path):
+    """
+    스냅샷 파일을 mmap 으로 열어 AnimalStore 로 반환 (읽기 전용)
+
+    컬럼은 파일 위의 memoryview 라서 실제로 읽는 부분만 메모리에 올라온다.
+    animal_utils 의 filter_animals / recommend_animals 등에 그대로 넘기면 된다.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, manifest_len = _HEADER.unpack_from(mm, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"스냅샷 파일이 아닙니다: {path}")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {version} (필요: {SNAPSHOT_VERSION})")
+
+    manifest = json.loads(mm[_HEADER.size:_HEADER.size + manifest_len].decode("utf-8"))
+    if manifest["byteorder"] != sys.byteorder:
+        raise ValueError("다른 바이트 순서(endianness)로 만든 스냅샷입니다. 다시 변환하세요.")
+
+    buf = memoryview(mm)
+    sections = manifest["sections"]
+
+    def view(name, typecode):
+        start, size = sections[name]
+        return buf[start:start + size].cast(typecode)
+
+    table = _StringTable(buf, view("str:offsets", "I"), sections["str:data"][0])
+
+    store = AnimalStore()
+    store.n = manifest["rows"]
+    store.present = set(manifest["present"])
+    store.extras = {int(i): e for i, e in manifest["extras"].items()}
+
+    for f, spec in manifest["categorical"].items():
+        col = store.categorical[f]
+        col.categories = [table[i] for i in view(spec["categories"], "I")]
+        col.lookup = {c: i for i, c in enumerate(col.categories)}
+        col.codes = view(spec["codes"], "I")
+
+    for f, spec in manifest["dates"].items():
+        col = store.dates[f]
+        col.ordinals = view(spec["ordinals"], "i")
+        col.raw = {int(i): v for i, v in spec["raw"].items()}
+
+    for f, name in manifest["text"].items():
+        store.text[f] = _TextColumn(view(name, "I"), table)
+
+    # memoryview 가 살아있는 동안 mmap 이 닫히지 않도록 참조 유지
+    store.mmap = mm
+    return store
+
+
+# -------------------------------------
+# JSON → 스냅샷 변환기
+# -------------------------------------
+if __name__ == "__main__":
+    from src.fetch_animals import iter_animals
+    from src.preprocess_animals import iter_preprocess_animals
+
+    if len(sys.argv) != 3:
+        print("사용법: python -m src.snapshot <입력.json[.gz]> <출력.snap>")
+        sys.exit(1)
+
+    src_path, out_path = sys.argv[1], sys.argv[2]
+    count = write_snapshot(iter_preprocess_animals(iter_animals(src_path)), out_path)
+    print(f"{src_path} → {out_path}: {count} 마리 저장")
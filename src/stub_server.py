@@ -0,0 +1,263 @@
+# src/stub_server.py
+"""
+외부 API 없이 로컬에서 돌려볼 수 있는 스텁 HTTP 서버
+
+- POST /v1beta/models/<model>:generateContent         Gemini generateContent 흉내
+- POST /v1beta/models/<model>:streamGenerateContent   같은 내용을 SSE 로 조금씩
+- POST /v1/chat/completions                           OpenAI 스타일 (stream=true 면 SSE)
+- GET  .../abandonmentPublic_v2?pageNo=&numOfRows=&bgnde=   유기동물 공고 API (페이지 단위)
+- GET  /static/<파일>                                  --static 디렉터리의 파일 (ETag / 304 지원)
+
+    python -m src.stub_server --port 8765 --fail-rate 0.2
+    python -m src.consulting_batch --base-url http://127.0.0.1:8765 ...
+    python -m src.fetch_api --base-url http://127.0.0.1:8765
+    python -m src.stub_server --static ./data/photos   # popfile 사진 서버 흉내
+
+fail_rate 만큼 429 를 섞어서 돌려주므로 재시도 로직도 확인할 수 있다.
+"""
+import argparse
+import email.utils
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.synth_animals import iter_synthetic_animals
+
+
+# /static/ 파일 확장자 → Content-Type
+STATIC_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
+                ".gif": "image/gif", ".webp": "image/webp"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # 서버 인스턴스에 붙여 두는 설정 (make_server 참고)
+    #   server.fail_rate   : 429 로 응답할 확률
+    #   server.delay       : 응답 전 대기 시간(초)
+    #   server.chunk_delay : SSE 조각 사이 대기 시간(초)
+    #   server.animals     : 공고 API 로 내려줄 공고 리스트 (기본: src.synth_animals 1000건)
+    #   server.static_dir  : /static/ 으로 내려줄 파일 디렉터리 (None 이면 404)
+    #   server.static_hits : /static/ 응답 상태 코드별 횟수 (조건부 요청 확인용)
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(fmt, *args)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body or b"{}")
+
+    def _send_json(self, status, obj, headers=None):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data):
+        # Transfer-Encoding: chunked 한 조각 (keep-alive 유지)
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_sse(self, events):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for event in events:
+            self._write_chunk(f"data: {event}\n\n".encode("utf-8"))
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _maybe_fail(self):
+        if random.random() < self.server.fail_rate:
+            self._send_json(429, {"error": {"code": 429, "message": "stub: rate limited"}},
+                            {"Retry-After": "0"})
+            return True
+        return False
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        payload = self._read_json()
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self._maybe_fail():
+            return
+
+        if path.endswith(":generateContent"):
+            self._send_json(200, gemini_response(stub_answer(payload)))
+            return
+
+        if path.endswith(":streamGenerateContent"):
+            self._send_sse(json.dumps(gemini_response(c), ensure_ascii=False)
+                           for c in split_chunks(stub_answer(payload)))
+            return
+
+        if path == "/v1/chat/completions":
+            answer = stub_answer(payload)
+            if payload.get("stream"):
+                events = [json.dumps({"choices": [{"delta": {"content": c}, "index": 0}]}, ensure_ascii=False)
+                          for c in split_chunks(answer)]
+                events.append("[DONE]")
+                self._send_sse(events)
+            else:
+                self._send_json(200, {"choices": [{"index": 0, "message": {"role": "assistant", "content": answer}}]})
+            return
+
+        self._send_json(404, {"error": {"code": 404, "message": f"stub: unknown path {path}"}})
+
+    def _send_static(self, name):
+        root = self.server.static_dir
+        path = os.path.realpath(os.path.join(root or "", unquote(name)))
+        if not root or not path.startswith(os.path.realpath(root) + os.sep) or not os.path.isfile(path):
+            self.server.static_hits[404] += 1
+            self._send_json(404, {"error": {"code": 404, "message": f"stub: no such file {name}"}})
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        last_modified = email.utils.formatdate(os.stat(path).st_mtime, usegmt=True)
+
+        if self.headers.get("If-None-Match") == etag:
+            self.server.static_hits[304] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.server.static_hits[200] += 1
+        self.send_response(200)
+        ext = os.path.splitext(path)[1].lower()
+        self.send_header("Content-Type", STATIC_TYPES.get(ext, "application/octet-stream"))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.startswith("/static/"):
+            if self.server.delay:
+                time.sleep(self.server.delay)
+            self._send_static(url.path[len("/static/"):])
+            return
+        if not url.path.endswith("/abandonmentPublic_v2"):
+            self._send_json(404, {"error": {"code": 404, "message": f"stub: unknown path {url.path}"}})
+            return
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self._maybe_fail():
+            return
+
+        query = parse_qs(url.query)
+        page_no = int(query.get("pageNo", ["1"])[0])
+        rows = int(query.get("numOfRows", ["10"])[0])
+        animals = self.server.animals
+        if "bgnde" in query:
+            # 실제 API 처럼 시작일 이후 공고만 (여기서는 noticeSdt 기준)
+            animals = [a for a in animals if a["noticeSdt"] >= query["bgnde"][0]]
+        self._send_json(200, animals_page(animals, page_no, rows))
+
+
+def animals_page(animals, page_no, rows):
+    """공공데이터 API 와 같은 응답 봉투 (response.header / response.body)"""
+    start = (page_no - 1) * rows
+    return {"response": {
+        "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE."},
+        "body": {
+            "items": {"item": animals[start:start + rows]},
+            "numOfRows": rows,
+            "pageNo": page_no,
+            "totalCount": len(animals),
+        },
+    }}
+
+
+def stub_answer(payload):
+    """
+    요청 프롬프트 길이로 만든 가짜 적합도 JSON (같은 입력이면 같은 출력)
+    """
+    text = ""
+    for content in payload.get("contents", []):
+        for part in content.get("parts", []):
+            text += part.get("text", "")
+    for message in payload.get("messages", []):
+        text += message.get("content", "")
+    score = len(text) % 11
+    return json.dumps({
+        "adoptionSuitabilityScore": score,
+        "consultationDetails": {"overallAssessment": f"stub 평가 (프롬프트 {len(text)}자)"},
+    }, ensure_ascii=False)
+
+
+def split_chunks(text, size=8):
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def gemini_response(text):
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+
+def make_server(host="127.0.0.1", port=0, fail_rate=0.0, delay=0.0, chunk_delay=0.0,
+                animals=None, handler=StubHandler, static_dir=None):
+    """
+    스텁 서버 생성 (port=0 이면 빈 포트 자동 선택 → server.server_address 로 확인)
+    """
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.fail_rate = fail_rate
+    server.delay = delay
+    server.chunk_delay = chunk_delay
+    server.animals = animals if animals is not None else list(iter_synthetic_animals(1000))
+    server.static_dir = static_dir
+    server.static_hits = Counter()
+    server.verbose = False
+    return server
+
+
+def start_in_thread(**kwargs):
+    """
+    백그라운드 스레드에서 서버를 띄우고 (server, base_url) 반환
+    끝나면 server.shutdown() 호출
+    """
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 스텁 API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    parser.add_argument("--animals", type=int, default=1000, help="공고 API 로 내려줄 가짜 공고 수")
+    parser.add_argument("--static", default=None, help="/static/ 으로 내려줄 파일 디렉터리 (사진 서버 흉내)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.fail_rate, args.delay, args.chunk_delay,
+                         list(iter_synthetic_animals(args.animals)), static_dir=args.static)
+    server.verbose = True
+    print(f"stub server: http://{args.host}:{args.port}")
+    server.serve_forever()
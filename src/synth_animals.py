@@ -0,0 +1,152 @@
+# src/synth_animals.py
+"""
+벤치마크/부하 확인용 가짜 유기동물 공고 생성기
+
+실제 공고처럼 보이는 품종/보호소/발생 장소/날짜 분포로 원하는 개수(1만~100만)를 만든다.
+seed 가 같으면 항상 같은 결과.
+
+    python -m src.synth_animals 100000 --out data/synth_100k.json
+    python -m src.synth_animals 1000000 --out data/synth_1m.json.gz --gzip
+"""
+import argparse
+import datetime
+import gzip
+import json
+import random
+
+# (품종, 가중치) — 실제 공고에서 많이 보이는 순서 대략 반영
+KINDS = [
+    ("[개] 믹스견", 30), ("[고양이] 코리안숏헤어", 22), ("[개] 진도견", 8), ("[개] 말티즈", 6),
+    ("[개] 푸들", 5), ("[개] 포메라니안", 4), ("[개] 시츄", 4), ("[개] 치와와", 3),
+    ("[개] 비글", 2), ("[개] 웰시 코기", 1), ("[개] 골든 리트리버", 1), ("[개] 시베리안 허스키", 1),
+    ("[개] 풍산견", 1), ("[개] 요크셔 테리어", 2), ("[개] 닥스훈트", 1), ("[개] 비숑 프리제", 2),
+    ("[고양이] 페르시안", 1), ("[고양이] 러시안 블루", 1), ("[고양이] 스코티시 폴드", 1),
+    ("[기타축종] 토끼", 1), ("[기타축종] 햄스터", 1),
+]
+
+# 시도 → 시군구 목록 (공고 수가 많은 지역일수록 가중치 큼)
+REGIONS = {
+    "서울특별시": (["강서구", "노원구", "송파구", "관악구", "마포구", "은평구", "강남구", "서초구"], 12),
+    "부산광역시": (["해운대구", "사하구", "부산진구", "북구", "금정구"], 7),
+    "대구광역시": (["달서구", "북구", "수성구", "동구"], 5),
+    "인천광역시": (["남동구", "부평구", "서구", "미추홀구"], 6),
+    "광주광역시": (["북구", "광산구", "서구"], 3),
+    "대전광역시": (["서구", "유성구", "중구"], 3),
+    "경기도": (["수원시", "화성시", "용인시", "평택시", "안산시", "고양시", "남양주시", "파주시"], 25),
+    "강원특별자치도": (["춘천시", "원주시", "강릉시"], 4),
+    "충청남도": (["천안시", "아산시", "당진시"], 6),
+    "전북특별자치도": (["전주시", "익산시", "군산시"], 6),
+    "전라남도": (["여수시", "순천시", "목포시"], 6),
+    "경상북도": (["포항시", "구미시", "경주시"], 7),
+    "경상남도": (["창원시", "김해시", "진주시", "양산시"], 8),
+    "제주특별자치도": (["제주시", "서귀포시"], 5),
+}
+
+DONGS = ["중앙동", "신촌동", "행복동", "산성동", "장안동", "신월동", "대명동", "송정동"]
+SPOTS = ["인근", "도로변", "공원", "아파트 단지", "주택가", "시장 앞", "야산"]
+COLORS = ["흰색", "갈색", "검정", "크림", "회색", "황색", "삼색", "치즈", "검정/흰색", "갈색/흰색"]
+MARKS = [
+    "사람을 잘 따름", "겁이 많음", "경계심 있음", "온순함", "활발함", "피부병 있음",
+    "다리 불편", "목줄 착용", "마킹 있음", "노령", "새끼", "중성화 흔적 있음", "짖음 심함",
+]
+
+# 공고 기간 (시작일 기준 10~14일)
+NOTICE_DAYS = (10, 14)
+
+# 날짜 범위의 끝 (고정해 두어야 실행할 때마다 같은 데이터가 나옴)
+DEFAULT_END = datetime.date(2025, 11, 29)
+
+
+def _weighted(pairs):
+    items, weights = zip(*pairs)
+    return list(items), list(weights)
+
+
+def iter_synthetic_animals(n, seed=0, end=None, span_days=60):
+    """
+    가짜 공고 n건을 하나씩 yield
+    noticeSdt 는 end 기준 span_days 일 전 ~ end 사이
+    일부는 noticeEdt 가 비어 있거나 형식이 틀림 (실데이터의 지저분함 재현)
+    """
+    rng = random.Random(seed)
+    end = end or DEFAULT_END
+    start_ord = end.toordinal() - span_days
+
+    kinds, kind_w = _weighted(KINDS)
+    provinces = list(REGIONS)
+    province_w = [REGIONS[p][1] for p in provinces]
+
+    # 지역별 보호소 (시군구마다 1~2곳)
+    shelters = {}
+    for p in provinces:
+        for city in REGIONS[p][0]:
+            names = [f"{city} 동물보호센터"]
+            if rng.random() < 0.4:
+                names.append(f"{p[:2]} {city} 유기동물보호소")
+            shelters[(p, city)] = names
+
+    for i in range(n):
+        province = rng.choices(provinces, province_w)[0]
+        city = rng.choice(REGIONS[province][0])
+        sdt = datetime.date.fromordinal(start_ord + rng.randrange(span_days + 1))
+        edt = sdt + datetime.timedelta(days=rng.randint(*NOTICE_DAYS))
+
+        r = rng.random()
+        if r < 0.02:
+            notice_edt = ""
+        elif r < 0.025:
+            notice_edt = edt.strftime("%Y-%m-%d")   # 형식 오류
+        else:
+            notice_edt = edt.strftime("%Y%m%d")
+
+        kind = rng.choices(kinds, kind_w)[0]
+        birth = end.year - min(int(rng.expovariate(0.35)), 15)
+        care = rng.choice(shelters[(province, city)])
+
+        yield {
+            "desertionNo": f"4{sdt:%y%m%d}{i:08d}",
+            "noticeNo": f"{province[:2]}-{city}-{sdt.year}-{i:07d}",
+            "noticeSdt": sdt.strftime("%Y%m%d"),
+            "noticeEdt": notice_edt,
+            "happenDt": (sdt - datetime.timedelta(days=rng.randint(0, 3))).strftime("%Y%m%d"),
+            "happenPlace": f"{province} {city} {rng.choice(DONGS)} {rng.choice(SPOTS)}",
+            "kindCd": kind,
+            "colorCd": rng.choice(COLORS),
+            "age": f"{birth}(년생)" if rng.random() < 0.8 else f"{birth}(추정)",
+            "weight": f"{rng.uniform(0.5, 30.0) if kind.startswith('[개]') else rng.uniform(0.3, 7.0):.1f}(Kg)",
+            "sexCd": rng.choices("MFQ", (47, 47, 6))[0],
+            "neuterYn": rng.choices("YNU", (25, 55, 20))[0],
+            "specialMark": ", ".join(rng.sample(MARKS, rng.randint(1, 3))),
+            "processState": "보호중",
+            "popfile": f"http://www.animal.go.kr/files/shelter/{sdt:%Y/%m}/{i}.jpg",
+            "careNm": care,
+            "careAddr": f"{province} {city} {rng.choice(DONGS)} {rng.randint(1, 999)}",
+            "orgNm": f"{province} {city}",
+        }
+
+
+def write_synthetic(n, path, seed=0, compress=False, end=None):
+    """
+    가짜 공고 n건을 날짜별 덤프와 같은 최상위 JSON 배열로 저장 (gzip 선택)
+    """
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        f.write("[")
+        for i, a in enumerate(iter_synthetic_animals(n, seed, end)):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(a, ensure_ascii=False))
+        f.write("\n]\n")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 유기동물 공고 생성")
+    parser.add_argument("n", type=int, help="공고 수 (예: 10000, 100000, 1000000)")
+    parser.add_argument("--out", default=None, help="저장 경로 (기본: data/synth_<n>.json)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+
+    out = args.out or f"./data/synth_{args.n}.json" + (".gz" if args.gzip else "")
+    write_synthetic(args.n, out, args.seed, args.gzip)
+    print(f"가짜 공고 {args.n}건 → {out}")
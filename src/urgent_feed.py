@@ -0,0 +1,219 @@
+# src/urgent_feed.py
+"""
+마감 임박 피드 (마감일 ordinal 힙, 공고 추가/변경/삭제 O(log n))
+
+recommend_animals 는 질의마다 마감일로 다시 정렬하고, 마감이 지난 공고도 그대로 남는다.
+UrgentFeed 는 오래 떠 있는 프로세스(Flask, 동기화 루프)에서 한 번 만들어 두고
+공고가 들어올 때마다 갱신하며, 만료 청소(expire)로 마감 지난 공고를 빼낸다.
+
+    feed = UrgentFeed(animals)
+    feed.upsert(animal)                     # 새 공고 / 마감일 변경
+    feed.remove("서울-강서-2025-00123")
+    feed.expire()                           # 오늘 이전 마감 공고 제거
+    feed.within(7)                          # 7일 이내 마감, 마감일 순 (정렬 없음)
+
+- 변경/삭제는 힙에서 바로 빼지 않고 '지워진 항목' 으로 남겨 두었다가 (lazy deletion)
+  꺼낼 때 건너뛴다. 지워진 항목이 살아있는 항목보다 많아지면 힙을 다시 만든다.
+- within / first 는 힙 배열을 그대로 두고 보조 힙으로 앞에서부터 k 개만 꺼낸다 (O(k log k)).
+- 마감일이 없는(파싱 실패) 공고는 담지 않는다.
+"""
+import datetime
+import heapq
+import itertools
+import threading
+
+from src.animal_utils import parse_date
+
+# 만료 청소 주기 (초)
+DEFAULT_SWEEP_INTERVAL = 600
+
+
+def _deadline(a):
+    d = a.get("noticeEdt_parsed") or parse_date(a.get("noticeEdt", "") or "")
+    return d.toordinal() if d else None
+
+
+# -------------------------------------
+# 피드
+# -------------------------------------
+class UrgentFeed:
+    """
+    heap    : [(마감일 ordinal, 순번, noticeNo)] — 지워진 항목이 섞여 있을 수 있음
+    entries : noticeNo → (마감일 ordinal, 순번, 동물)  현재 살아있는 항목만
+    같은 마감일이면 먼저 들어온 공고가 앞 (sort_by_end_date 와 같은 안정 정렬)
+    """
+
+    def __init__(self, animals=()):
+        self.heap = []
+        self.entries = {}
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self.expired = 0    # 지금까지 만료 청소로 빠진 수
+
+        for a in animals:
+            self._set(a)
+        heapq.heapify(self.heap)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, notice_no):
+        return notice_no in self.entries
+
+    # ----- 갱신 -----
+    def _set(self, a):
+        # heapify 전 초기 적재용 (힙 순서는 호출한 쪽이 맞춘다)
+        deadline = _deadline(a)
+        key = a.get("noticeNo")
+        if deadline is None or not key:
+            return False
+        item = (deadline, next(self._seq), key)
+        self.entries[key] = (deadline, item[1], a)
+        self.heap.append(item)
+        return True
+
+    def upsert(self, a):
+        """
+        새 공고 추가 또는 같은 noticeNo 공고 교체 (O(log n))
+        마감일이 없으면 피드에서 빼고 False
+        """
+        key = a.get("noticeNo")
+        deadline = _deadline(a)
+        with self._lock:
+            if deadline is None:
+                self.remove(key)
+                return False
+            old = self.entries.get(key)
+            if old is not None and old[0] == deadline:
+                # 마감일이 같으면 힙은 그대로, 내용만 교체
+                self.entries[key] = (deadline, old[1], a)
+                return True
+            seq = next(self._seq)
+            self.entries[key] = (deadline, seq, a)
+            heapq.heappush(self.heap, (deadline, seq, key))
+            self._maybe_compact()
+            return True
+
+    def remove(self, notice_no):
+        """공고 제거 (힙 항목은 꺼낼 때 건너뜀) — 있었으면 동물, 없으면 None"""
+        with self._lock:
+            old = self.entries.pop(notice_no, None)
+            if old is None:
+                return None
+            self._maybe_compact()
+            return old[2]
+
+    def apply(self, ops):
+        """
+        delta_sync.diff 결과(insert / update / expire 연산 목록)를 그대로 반영
+        """
+        for op in ops:
+            if op["op"] == "expire":
+                self.remove(op["noticeNo"])
+            else:
+                self.upsert(op["record"])
+
+    def _live(self, item):
+        entry = self.entries.get(item[2])
+        return entry is not None and entry[1] == item[1]
+
+    def _maybe_compact(self):
+        # 지워진 항목이 절반을 넘으면 살아있는 것만 남겨 다시 heapify (O(n), 드물게)
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.heap = [(d, seq, key) for key, (d, seq, _) in self.entries.items()]
+            heapq.heapify(self.heap)
+
+    # ----- 만료 -----
+    def expire(self, today=None):
+        """
+        마감일이 today 이전인 공고를 모두 빼서 리스트로 반환
+        힙 맨 앞만 보므로 뺄 게 없으면 O(1)
+        """
+        cutoff = (today or datetime.date.today()).toordinal()
+        removed = []
+        with self._lock:
+            heap = self.heap
+            while heap and heap[0][0] < cutoff:
+                item = heapq.heappop(heap)
+                if self._live(item):
+                    removed.append(self.entries.pop(item[2])[2])
+            self.expired += len(removed)
+        return removed
+
+    # ----- 조회 -----
+    def _walk(self, start=None, until=None, limit=None):
+        """
+        마감일 순으로 (start ≤ 마감일 ≤ until) 동물을 최대 limit 마리
+        힙 배열은 그대로 두고 보조 힙으로 자식 노드만 따라가서, 꺼내는 수 k 에 대해 O(k log k)
+        """
+        out = []
+        with self._lock:
+            heap, entries = self.heap, self.entries
+            frontier = [(heap[0], 0)] if heap else []
+            while frontier and (limit is None or len(out) < limit):
+                item, i = heapq.heappop(frontier)
+                if until is not None and item[0] > until:
+                    break
+                entry = entries.get(item[2])
+                if entry is not None and entry[1] == item[1] and (start is None or item[0] >= start):
+                    out.append(entry[2])
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], child))
+        return out
+
+    def within(self, days, today=None, limit=None):
+        """
+        오늘부터 days 일 이내 마감 (마감일 순, 이미 지난 공고는 expire 전이라도 제외)
+        지난 공고도 힙 앞쪽에서 하나씩 건너뛰어야 하므로 expire 를 먼저 불러 두면 빠르다.
+        """
+        start = (today or datetime.date.today()).toordinal()
+        return self._walk(start, start + days, limit)
+
+    def first(self, n):
+        """마감일 빠른 순 n 마리"""
+        return self._walk(limit=n)
+
+
+# -------------------------------------
+# 주기적 만료 청소
+# -------------------------------------
+class ExpirySweeper:
+    """
+    interval 초마다 feed.expire() 를 부르는 데몬 스레드
+
+        sweeper = ExpirySweeper(feed).start()
+        ...
+        sweeper.stop()
+
+    on_expire(동물 리스트) 를 주면 뺀 공고가 있을 때마다 호출한다 (로그/캐시 정리 등).
+    """
+
+    def __init__(self, feed, interval=DEFAULT_SWEEP_INTERVAL, on_expire=None, clock=None):
+        self.feed = feed
+        self.interval = interval
+        self.on_expire = on_expire
+        self.clock = clock or datetime.date.today
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sweep(self):
+        removed = self.feed.expire(self.clock())
+        if removed and self.on_expire is not None:
+            self.on_expire(removed)
+        return removed
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sweep()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="urgent-feed-sweeper", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
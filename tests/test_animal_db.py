@@ -0,0 +1,60 @@
+from src import animal_db, preprocess_animals
+from src.animal_db import AnimalDB
+from src.animal_utils import filter_animals, recommend_animals
+from src.preprocess_animals import preprocess_animal
+from src.query import Contains
+from src.synth_animals import iter_synthetic_animals
+
+
+def test_read_path_uses_stored_preprocessed_columns(tmp_path, monkeypatch):
+    raw = list(iter_synthetic_animals(300, seed=5))
+    raw[0]["noticeEdt"] = ""
+    expected = {a["noticeNo"]: preprocess_animal(a) for a in raw}
+
+    db = AnimalDB(str(tmp_path / "animals.sqlite"))
+    db.upsert_many(raw)
+
+    # 읽을 때는 전처리 함수를 하나도 부르지 않아야 함
+    def boom(*args, **kwargs):
+        raise AssertionError("preprocess called on read")
+    monkeypatch.setattr(preprocess_animals, "preprocess_animal", boom)
+    monkeypatch.setattr(animal_db, "preprocess_animal", boom, raising=False)
+    for name in ("clean_kind", "clean_place", "parse_place", "parse_date"):
+        monkeypatch.setattr(animal_db, name, boom)
+
+    assert {a["noticeNo"]: a for a in db} == expected
+    assert db.get(raw[0]["noticeNo"]) == expected[raw[0]["noticeNo"]]
+    for _, a in db.select(Contains("kindCd", "말티즈"), "page"):
+        assert a == expected[a["noticeNo"]]
+    page = recommend_animals(db, "경기", limit=10)
+    assert [a for a in page] == [expected[a["noticeNo"]] for a in page]
+
+
+def _nos(xs):
+    return [a["noticeNo"] for a in xs]
+
+
+def test_db_filters_and_cursor_pages_match_the_list(tmp_path):
+    raw = list(iter_synthetic_animals(1500, seed=12))
+    raw[3]["noticeEdt"] = ""
+    animals = [preprocess_animal(a) for a in raw]
+    db = AnimalDB(str(tmp_path / "animals.sqlite"))
+    db.upsert_many(raw)
+
+    for kw in ({"kind": "말티즈"}, {"kind": "개"}, {"region": "경기", "care": "센터"},
+               {"region": "부산", "expand": "neighbors"}):
+        assert _nos(filter_animals(db, **kw)) == _nos(filter_animals(animals, **kw))
+    assert _nos(recommend_animals(db, "서울")) == _nos(recommend_animals(animals, "서울"))
+
+    for kind in (None, "믹스"):
+        db_pages, list_cursor, db_cursor = [], None, None
+        while True:
+            list_page = recommend_animals(animals, "경기", kind, limit=23, cursor=list_cursor)
+            db_page = recommend_animals(db, "경기", kind, limit=23, cursor=db_cursor)
+            assert _nos(db_page) == _nos(list_page)
+            assert db_page.next_cursor == list_page.next_cursor
+            db_pages += _nos(db_page)
+            list_cursor, db_cursor = list_page.next_cursor, db_page.next_cursor
+            if db_cursor is None:
+                break
+        assert db_pages == _nos(recommend_animals(animals, "경기", kind, limit=10 ** 6))
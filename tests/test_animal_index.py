@@ -0,0 +1,34 @@
+import pytest
+
+from src.animal_index import AnimalIndex
+from src.animal_utils import filter_animals, filter_by_care_name, filter_by_kind, filter_by_region
+from src.preprocess_animals import preprocess_animal
+from src.synth_animals import iter_synthetic_animals
+
+
+@pytest.fixture(scope="module")
+def animals():
+    return [preprocess_animal(a) for a in iter_synthetic_animals(2000, seed=6)]
+
+
+def _nos(xs):
+    return [a["noticeNo"] for a in xs]
+
+
+# 1글자 / 2글자(2-gram) / 3글자 이상(3-gram 교집합) / 없는 값 / 대소문자
+@pytest.mark.parametrize("fn, keyword", [
+    (filter_by_kind, "개"), (filter_by_kind, "말티"), (filter_by_kind, "코리안숏헤어"),
+    (filter_by_kind, "웰시 코기"), (filter_by_kind, "없는품종"),
+    (filter_by_care_name, "센터"), (filter_by_care_name, "강서구 동물"),
+    (filter_by_region, "수원"), (filter_by_region, "서울 강서구"), (filter_by_region, "경기"),
+])
+def test_index_matches_list(animals, fn, keyword):
+    index = AnimalIndex(animals)
+    assert _nos(fn(index, keyword)) == _nos(fn(animals, keyword))
+
+
+def test_index_combined_filter_matches_list(animals):
+    index = AnimalIndex(animals)
+    for kw in ({"kind": "믹스", "region": "경기"}, {"kind": "푸들", "care": "보호"},
+               {"region": "부산", "expand": "neighbors"}):
+        assert _nos(filter_animals(index, **kw)) == _nos(filter_animals(animals, **kw))
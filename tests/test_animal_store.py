@@ -0,0 +1,44 @@
+import pytest
+
+from src.animal_store import AnimalStore
+from src.animal_utils import (filter_animals, filter_by_care_name, filter_by_kind, filter_by_region,
+                              sort_by_end_date)
+from src.preprocess_animals import preprocess_animal
+from src.synth_animals import iter_synthetic_animals
+
+
+@pytest.fixture(scope="module")
+def animals():
+    raw = list(iter_synthetic_animals(2000, seed=7))
+    raw[0]["noticeEdt"] = ""
+    raw[1]["extraField"] = "x"      # 컬럼에 없는 필드
+    return [preprocess_animal(a) for a in raw]
+
+
+def _nos(xs):
+    return [a["noticeNo"] for a in xs]
+
+
+def test_rows_read_back_as_the_preprocessed_records(animals):
+    store = AnimalStore.from_records(animals)
+    assert len(store) == len(animals)
+    for row, a in zip(store, animals):
+        assert row.to_dict() == a
+    assert store[1]["extraField"] == "x"
+    assert store[0]["noticeEdt_parsed"] is None
+
+
+@pytest.mark.parametrize("fn, keyword", [
+    (filter_by_kind, "개"), (filter_by_kind, "말티즈"), (filter_by_kind, "없는품종"),
+    (filter_by_care_name, "센터"), (filter_by_region, "서울"), (filter_by_region, "수원시"),
+])
+def test_store_filters_match_list(animals, fn, keyword):
+    store = AnimalStore.from_records(animals)
+    assert _nos(fn(store, keyword)) == _nos(fn(animals, keyword))
+
+
+def test_store_combined_filter_and_sort_match_list(animals):
+    store = AnimalStore.from_records(animals)
+    assert _nos(filter_animals(store, kind="믹스", region="경기", care="센터")) == \
+        _nos(filter_animals(animals, kind="믹스", region="경기", care="센터"))
+    assert _nos(sort_by_end_date(store)) == _nos(sort_by_end_date(animals))
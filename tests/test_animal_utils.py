@@ -0,0 +1,21 @@
+import json
+
+from src.animal_utils import filter_animals, iter_filter_animals
+from src.preprocess_animals import preprocess_animal
+from src.synth_animals import iter_synthetic_animals
+
+
+def _animals(n=300, seed=4):
+    return [preprocess_animal(a) for a in iter_synthetic_animals(n, seed=seed)]
+
+
+def test_filter_animals_returns_a_list_and_iter_version_is_lazy():
+    animals = _animals()
+    result = filter_animals(animals, kind="믹스", region="경기")
+    assert type(result) is list and result
+    json.dumps([a["noticeNo"] for a in result])
+
+    lazy = iter_filter_animals(animals, kind="믹스", region="경기")
+    assert not isinstance(lazy, list)
+    assert list(lazy) == result
+    assert filter_animals(animals) is animals      # 조건이 없으면 그대로
@@ -0,0 +1,57 @@
+import gzip
+import json
+import os
+
+import pytest
+
+import app as app_module
+from app import app, load_payload
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # data/ 의 JSON 대신 작은 파일로
+    path = tmp_path / "animals.json"
+    path.write_text(json.dumps([{"noticeNo": str(i), "kindCd": "[개] 믹스견"} for i in range(50)]),
+                    encoding="utf-8")
+    monkeypatch.setattr(app_module, "_payload", {})
+    monkeypatch.setattr(app_module, "load_payload", lambda: load_payload(str(path)))
+    return app.test_client()
+
+
+def test_animals_gzip_negotiation(client):
+    plain = client.get("/animals")
+    zipped = client.get("/animals", headers={"Accept-Encoding": "gzip, deflate"})
+    assert plain.status_code == zipped.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert zipped.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+    assert plain.headers["ETag"] != zipped.headers["ETag"]
+
+
+def test_animals_conditional_get(client):
+    first = client.get("/animals")
+    etag = first.headers["ETag"]
+
+    again = client.get("/animals", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.get_data() == b""
+
+    # 다른 표현(gzip)의 ETag 로는 304 가 아님
+    zipped = client.get("/animals", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert zipped.status_code == 200
+
+
+def test_payload_is_rebuilt_when_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "_payload", {})
+    path = tmp_path / "animals.json"
+    path.write_text(json.dumps([{"noticeNo": "1"}]), encoding="utf-8")
+    first = load_payload(str(path))
+    assert load_payload(str(path)) is first
+
+    path.write_text(json.dumps([{"noticeNo": "1"}, {"noticeNo": "2"}]), encoding="utf-8")
+    os.utime(path, ns=(first["key"][1] + 10 ** 9, first["key"][1] + 10 ** 9))
+    second = load_payload(str(path))
+    assert second is not first and second["etag"] != first["etag"]
+    assert json.loads(second["body"]) == [{"noticeNo": "1"}, {"noticeNo": "2"}]
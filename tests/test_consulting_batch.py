@@ -0,0 +1,76 @@
+import asyncio
+import json
+import random
+import time
+
+import pytest
+
+from src import consulting_batch
+from src.consulting_batch import TokenBucket, build_jobs, load_checkpoint, run_batch
+from src.stub_server import start_in_thread
+
+
+def test_job_ids_survive_reordered_rows_and_profiles():
+    before = {(j["row"], j["profile"]): j["id"] for j in build_jobs(["A", "B"], ["p1", "p2"])}
+    after = {(j["row"], j["profile"]): j["id"] for j in build_jobs(["C", "B", "A"], ["p2", "p1"])}
+
+    assert after[(2, 1)] == before[(0, 0)]     # A × p1
+    assert after[(1, 0)] == before[(1, 1)]     # B × p2
+    assert len(set(after.values())) == 6
+    assert set(before.values()) < set(after.values())
+
+
+def test_token_bucket_limits_the_rate():
+    async def take(n):
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(n)))
+        return time.monotonic() - started
+
+    # 처음 2개는 바로, 나머지 8개는 초당 50개씩 → 최소 0.16초
+    assert asyncio.run(take(10)) >= 0.15
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(consulting_batch, "backoff_delay", lambda attempt: 0)
+    server, base_url = start_in_thread(animals=[])
+    yield server, base_url
+    server.shutdown()
+
+
+def _records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_run_batch_retries_and_resumes_from_checkpoint(stub, tmp_path):
+    server, base_url = stub
+    prompts = [f"동물 {i} 프롬프트" for i in range(6)]
+    profiles = ["프로필 A", "프로필 B"]
+    path = str(tmp_path / "consulting.jsonl")
+
+    def run(max_retries=20):
+        return asyncio.run(run_batch(prompts, profiles, "key", path, base_url=base_url,
+                                     concurrency=4, rate=1000, max_retries=max_retries))
+
+    # 전부 429 → 실패로 기록되고, 실패 기록은 다음 실행에서 다시 시도
+    server.fail_rate = 1.0
+    assert run(max_retries=1) == {"total": 12, "skipped": 0, "ok": 0, "failed": 12}
+    assert load_checkpoint(path) == set()
+
+    # 429 가 섞여도 재시도로 모두 성공
+    random.seed(0)
+    server.fail_rate = 0.3
+    assert run() == {"total": 12, "skipped": 0, "ok": 12, "failed": 0}
+    ok = [r for r in _records(path) if r["error"] is None]
+    assert sorted(r["id"] for r in ok) == sorted(j["id"] for j in build_jobs(prompts, profiles))
+    assert all("adoptionSuitabilityScore" in json.loads(r["response"]) for r in ok)
+
+    # 쓰다 만 줄을 남기고 죽은 상태에서 프롬프트가 추가됨 → 새 작업만 실행
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "cut')
+    prompts.append("동물 6 프롬프트")
+    server.fail_rate = 0.0
+    assert run() == {"total": 14, "skipped": 12, "ok": 2, "failed": 0}
+    assert len(load_checkpoint(path)) == 14
@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+
+from src import csv_ingest
+from src.csv_ingest import SAMPLE_SIZE, _decode_with_fallback, _sidecar_paths, detect_encoding, read_csv_cached
+
+
+def _mixed_csv(path):
+    head = "noticeNo,AI_Consulting_Prompt\n".encode("ascii")
+    filler = b"".join(f"N-{i},ascii only row\n".encode("ascii") for i in range(SAMPLE_SIZE // 16))
+    tail = "N-last,말티즈 보호 중\n".encode("cp949")
+    path.write_bytes(head + filler + tail)
+
+
+def test_falls_back_when_cp949_rows_come_after_the_sample(tmp_path, monkeypatch):
+    path = tmp_path / "mixed.csv"
+    _mixed_csv(path)
+
+    assert detect_encoding(str(path)) == "utf-8"    # 표본은 ASCII 뿐
+
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *a, **kw: calls.append(a) or read_csv(*a, **kw))
+    df = read_csv_cached(str(path), use_sidecar=False)
+    assert df["AI_Consulting_Prompt"].iloc[-1] == "말티즈 보호 중"
+    assert len(df) == SAMPLE_SIZE // 16 + 1
+    assert len(calls) == 1      # 후보마다 파일을 다시 읽지 않음
+
+
+def test_decoder_switch_keeps_text_across_chunks(tmp_path):
+    path = tmp_path / "mixed.csv"
+    _mixed_csv(path)
+    encoding, text = _decode_with_fallback(str(path), "utf-8", chunk_size=1000)
+    assert encoding == "cp949"
+    assert text == path.read_bytes().decode("cp949")
+
+
+def test_sidecar_lives_in_cache_dir_and_is_checked_before_loading(tmp_path):
+    path = tmp_path / "prompts.csv"
+    path.write_text("noticeNo,AI_Consulting_Prompt\nN-1,보호 중\n", encoding="utf-8")
+    cache_dir = str(tmp_path / "cache")
+
+    df = read_csv_cached(str(path), cache_dir=cache_dir)
+    data_path, meta_path = _sidecar_paths(str(path), cache_dir)
+    assert os.path.dirname(data_path) == cache_dir and os.path.exists(meta_path)
+    assert sorted(os.listdir(tmp_path)) == ["cache", "prompts.csv"]
+    assert csv_ingest._read_sidecar(str(path), cache_dir).equals(df)
+
+    # meta 를 쓴 뒤에 바뀐 사이드카는 열지 않는다
+    with open(data_path, "ab") as f:
+        f.write(b"tampered")
+    assert csv_ingest._read_sidecar(str(path), cache_dir) is None
+    assert read_csv_cached(str(path), cache_dir=cache_dir).equals(df)
@@ -0,0 +1,72 @@
+import datetime
+import json
+
+import pytest
+
+from src import delta_sync
+from src.stub_server import start_in_thread
+
+TODAY = datetime.date(2025, 11, 15)
+
+
+def _notice(no, sdt, edt, mark=""):
+    return {"noticeNo": no, "noticeSdt": sdt, "noticeEdt": edt, "kindCd": "[개] 믹스견", "specialMark": mark}
+
+
+A = _notice("A", "20251101", "20251110")                # 오늘 기준 이미 마감
+B = _notice("B", "20251105", "20251120")
+C = _notice("C", "20251110", "20251125")
+C2 = _notice("C", "20251110", "20251125", "내용 바뀜")
+D = _notice("D", "20251112", "20251126")                # 새 공고
+E = _notice("E", "20251110", "20251111")                # 새 공고지만 이미 마감
+
+
+@pytest.fixture
+def paths(tmp_path):
+    base = tmp_path / "animals_base.json"
+    base.write_text(json.dumps([A, B, C], ensure_ascii=False), encoding="utf-8")
+    return {"base": str(base), "state_path": str(tmp_path / "state.json"),
+            "log_path": str(tmp_path / "delta.jsonl"), "out": str(tmp_path / "animals_new.json")}
+
+
+@pytest.fixture
+def server():
+    server, base_url = start_in_thread(animals=[B, C2, D, E])
+    server.base_url = base_url
+    yield server
+    server.shutdown()
+
+
+def _sync(server, paths, **kwargs):
+    return delta_sync.sync(base_url=server.base_url, state_path=paths["state_path"],
+                           log_path=paths["log_path"], today=TODAY, rows=2, workers=2, **kwargs)
+
+
+def _current(paths):
+    return list(delta_sync.iter_synced_animals(paths["state_path"], paths["log_path"]))
+
+
+def test_sync_records_only_changes_and_compacts(server, paths):
+    state = delta_sync.init(paths["base"], paths["state_path"], paths["log_path"])
+    assert state.watermark == "20251110"
+
+    assert _sync(server, paths) == {"insert": 1, "update": 1, "expire": 1}
+    assert _current(paths) == [B, C2, D]
+    # 바뀐 것이 없으면 로그에도 안 남음
+    assert _sync(server, paths) == {"insert": 0, "update": 0, "expire": 0}
+    with open(paths["log_path"], encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+
+    assert delta_sync.compact(paths["out"], paths["state_path"], paths["log_path"]) == 3
+    with open(paths["out"], encoding="utf-8") as f:
+        assert json.load(f) == [B, C2, D]
+    assert _current(paths) == [B, C2, D]
+
+
+def test_full_sync_expires_notices_missing_from_the_api(server, paths):
+    delta_sync.init(paths["base"], paths["state_path"], paths["log_path"])
+    _sync(server, paths)
+
+    server.animals = [C2, D]     # B 가 API 에서 사라짐
+    assert _sync(server, paths, full=True) == {"insert": 0, "update": 0, "expire": 1}
+    assert _current(paths) == [C2, D]
@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pytest
+
+from src import fetch_animals
+from src.fetch_animals import iter_animals
+from src.synth_animals import iter_synthetic_animals
+
+
+@pytest.fixture(autouse=True)
+def tiny_chunks(monkeypatch):
+    # 객체/문자열/숫자가 청크 경계에 걸치도록
+    monkeypatch.setattr(fetch_animals, "CHUNK_SIZE", 7)
+
+
+def _api_response(items):
+    return {"response": {"header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE."},
+                         "body": {"numOfRows": 1000, "pageNo": 1, "totalCount": 12.5,
+                                  "items": {"item": items}, "extra": [1, {"a": "}]"}]}}}
+
+
+def test_stream_matches_json_load(tmp_path):
+    animals = list(iter_synthetic_animals(40, seed=1))
+    animals[3]["specialMark"] = "따옴표 \" 와 괄호 ]} 포함"
+
+    api = tmp_path / "api.json"
+    api.write_text(json.dumps(_api_response(animals), ensure_ascii=False, indent=1), encoding="utf-8")
+    dump = tmp_path / "dump.json.gz"
+    with gzip.open(dump, "wt", encoding="utf-8") as f:
+        json.dump(animals, f, ensure_ascii=False)
+
+    with open(api, encoding="utf-8") as f:
+        expected = json.load(f)["response"]["body"]["items"]["item"]
+    assert list(iter_animals(str(api))) == expected
+    assert list(iter_animals(str(dump))) == expected
+
+
+@pytest.mark.parametrize("items, expected", [
+    ({"noticeNo": "1"}, [{"noticeNo": "1"}]),     # 1건이면 배열이 아니라 객체
+    ([], []),
+])
+def test_single_and_empty_item(tmp_path, items, expected):
+    path = tmp_path / "api.json"
+    path.write_text(json.dumps(_api_response(items)), encoding="utf-8")
+    assert list(iter_animals(str(path))) == expected
+
+
+def test_empty_items_string(tmp_path):
+    path = tmp_path / "api.json"
+    body = _api_response([])
+    body["response"]["body"]["items"] = ""
+    path.write_text(json.dumps(body), encoding="utf-8")
+    assert list(iter_animals(str(path))) == []
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from src import fetch_api
+from src.fetch_api import FetchError, fetch_page, iter_api_animals, write_dump
+from src.stub_server import StubHandler, start_in_thread
+from src.synth_animals import iter_synthetic_animals
+
+
+class _FixedHandler(StubHandler):
+    # 공고 API 경로에 server.status / server.body 를 그대로 돌려줌
+    def do_GET(self):
+        self._send_json(self.server.status, self.server.body)
+
+
+@pytest.fixture
+def fixed_server():
+    server, base_url = start_in_thread(handler=_FixedHandler, animals=[])
+    yield server, base_url
+    server.shutdown()
+
+
+@pytest.mark.parametrize("status, body", [
+    (403, {"error": "forbidden"}),      # 재시도하지 않는 HTTP 오류
+    (200, {"unexpected": 1}),           # response 키 없음
+    (200, ["not", "a", "dict"]),
+])
+def test_fetch_page_wraps_errors_in_fetch_error(fixed_server, status, body):
+    server, base_url = fixed_server
+    server.status, server.body = status, body
+    with pytest.raises(FetchError):
+        fetch_page(1, base_url=base_url, max_retries=0)
+
+
+def test_write_dump_keeps_the_original_error_when_tmp_cannot_be_opened(tmp_path):
+    path = str(tmp_path / "missing_dir" / "animals.json")     # 디렉터리가 없어 open 부터 실패
+    with pytest.raises(FileNotFoundError) as e:
+        write_dump(iter([{"noticeNo": "1"}]), path)
+    assert e.value.filename == path + ".tmp"
+    assert e.value.__context__ is None      # 정리 중에 난 오류가 아니라 원래 오류
+
+
+def test_write_dump_removes_tmp_and_reraises_source_error(tmp_path):
+    path = str(tmp_path / "animals.json")
+
+    def animals():
+        yield {"noticeNo": "1"}
+        raise FetchError("page 2")
+
+    with pytest.raises(FetchError):
+        write_dump(animals(), path)
+    assert not (tmp_path / "animals.json.tmp").exists()
+    assert not (tmp_path / "animals.json").exists()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(fetch_api, "backoff_delay", lambda attempt: 0)
+
+
+def test_iter_api_animals_returns_every_page_in_order(no_backoff):
+    animals = list(iter_synthetic_animals(103))
+    server, base_url = start_in_thread(animals=animals)
+    try:
+        got = list(iter_api_animals(rows=10, base_url=base_url, workers=3))
+        since = animals[50]["noticeSdt"]
+        recent = list(iter_api_animals(rows=7, params={"bgnde": since}, base_url=base_url, workers=2))
+    finally:
+        server.shutdown()
+    assert [a["noticeNo"] for a in got] == [a["noticeNo"] for a in animals]
+    assert [a["noticeNo"] for a in recent] == [a["noticeNo"] for a in animals if a["noticeSdt"] >= since]
+
+
+def test_iter_api_animals_retries_rate_limited_pages(no_backoff):
+    random.seed(1)
+    animals = list(iter_synthetic_animals(60))
+    server, base_url = start_in_thread(animals=animals, fail_rate=0.4)
+    try:
+        got = list(iter_api_animals(rows=5, base_url=base_url, workers=4, max_retries=20))
+        server.fail_rate = 1.0
+        with pytest.raises(FetchError):
+            fetch_page(1, base_url=base_url, max_retries=2)
+    finally:
+        server.shutdown()
+    assert [a["noticeNo"] for a in got] == [a["noticeNo"] for a in animals]
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import struct
+import zlib
+
+import pytest
+
+from src.image_cache import ImageCache, ImagePrefetcher, fetch_image, prefetch
+from src.stub_server import start_in_thread
+
+
+def _png(rgb, size=4):
+    # Pillow 유무와 상관없이 열리는 단색 PNG
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+    row = b"\x00" + bytes(rgb) * size
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * size))
+            + chunk(b"IEND", b""))
+
+
+@pytest.fixture
+def static(tmp_path):
+    root = tmp_path / "static"
+    root.mkdir()
+    (root / "a.png").write_bytes(_png((255, 0, 0)))
+    (root / "b.png").write_bytes(_png((0, 0, 255)))
+    server, base_url = start_in_thread(animals=[], static_dir=str(root))
+    yield server, base_url, root
+    server.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ImageCache(str(tmp_path / "thumbs"))
+    yield cache
+    cache.close()
+
+
+def test_fetch_image_revalidates_with_etag(static, cache):
+    server, base_url, root = static
+    url = f"{base_url}/static/a.png"
+
+    assert fetch_image(url, cache) == "fetched"
+    path, content_type, _ = cache.lookup(url)
+    assert os.path.isfile(path) and content_type.startswith("image/")
+
+    assert fetch_image(url, cache) == "fresh"               # max_age 안이면 요청하지 않음
+    assert fetch_image(url, cache, max_age=0) == "not_modified"
+    assert server.static_hits == {200: 1, 304: 1}
+
+    (root / "a.png").write_bytes(_png((0, 255, 0)))         # 내용이 바뀌면 ETag 도 바뀜
+    assert fetch_image(url, cache, max_age=0) == "fetched"
+    assert cache.lookup(url)[0] != path
+    assert server.static_hits == {200: 2, 304: 1}
+
+
+def test_prefetcher_fetches_each_url_once(static, cache):
+    server, base_url, _ = static
+    urls = [f"{base_url}/static/{name}" for name in ("a.png", "b.png", "missing.png")]
+
+    prefetcher = ImagePrefetcher(cache, concurrency=2).start()
+    assert prefetcher.submit(urls + urls[:1] + [""]) == 3
+    prefetcher.stop()
+
+    assert prefetcher.summary == {"fetched": 2, "not_modified": 0, "fresh": 0, "failed": 1}
+    assert prefetcher.pending() == 0
+    assert all(cache.lookup(u) for u in urls[:2])
+    assert server.static_hits == {200: 2, 404: 1}
+
+    summary = asyncio.run(prefetch(urls, cache, concurrency=2, max_age=0))
+    assert summary == {"fetched": 0, "not_modified": 2, "fresh": 0, "failed": 1}
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from src.knime_normalize import normalize_wide, to_records
+
+
+def test_only_id_and_date_columns_become_integer_strings():
+    df = pd.DataFrame({
+        "noticeNo": [20251118.0, None],
+        "noticeSdt": [20251101.0, 20251102.0],
+        "weight": [8.0, 3.0],
+        "noticeNo (#1)": [None, 7.0],
+        "noticeSdt (#1)": [None, 20251103.0],
+        "weight (#1)": [None, 4.5],
+    })
+    records = to_records(normalize_wide(df))
+    assert records == [
+        {"noticeNo": "20251118", "noticeSdt": "20251101", "weight": "8.0"},
+        {"noticeNo": "", "noticeSdt": "20251102", "weight": "3.0"},
+        {"noticeNo": "7", "noticeSdt": "20251103", "weight": "4.5"},
+    ]
@@ -0,0 +1,26 @@
+import json
+
+from src.llm_cache import LLMCache
+
+
+def _is_json(text):
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+def test_empty_and_invalid_responses_are_not_cached(tmp_path):
+    cache = LLMCache(str(tmp_path / "llm.sqlite"))
+    answers = iter(["", '{"score": 3', '{"score": 3}', '{"score": 9}'])
+
+    def compute():
+        return next(answers)
+
+    assert cache.get_or_compute("k", compute, validate=_is_json) == ""
+    assert cache.get_or_compute("k", compute, validate=_is_json) == '{"score": 3'
+    assert cache.get_or_compute("k", compute, validate=_is_json) == '{"score": 3}'
+    # 유효한 응답부터 저장되어 다시 호출하지 않음
+    assert cache.get_or_compute("k", compute, validate=_is_json) == '{"score": 3}'
+    assert cache.get("k") == (True, '{"score": 3}')
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+import requests
+
+from src.llm_client import chat_complete, chat_stream, gemini_generate, gemini_stream, iter_sse
+from src.stub_server import start_in_thread
+
+
+class _Lines:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+def test_iter_sse_events():
+    response = _Lines([b": ping", b"data: a", b"data:b", b"", b"", b"event: x", b"data: {\"k\": 1}", b"",
+                       b"data: tail"])
+    assert list(iter_sse(response)) == ["a\nb", '{"k": 1}', "tail"]
+
+
+@pytest.fixture
+def stub():
+    server, base_url = start_in_thread(animals=[])
+    yield server, base_url
+    server.shutdown()
+
+
+def test_gemini_stream_matches_generate(stub):
+    _, base_url = stub
+    prompt = "말티즈 입양 상담 " * 10
+    chunks = list(gemini_stream(prompt, "key", "model", base_url=base_url))
+    assert len(chunks) > 1
+    text = "".join(chunks)
+    assert text == gemini_generate(prompt, "key", "model", base_url=base_url)
+    assert "adoptionSuitabilityScore" in json.loads(text)
+
+
+def test_chat_stream_matches_complete(stub):
+    _, base_url = stub
+    messages = [{"role": "user", "content": "푸들 " * 20}]
+    chunks = list(chat_stream(messages, "key", "model", base_url=base_url))
+    assert len(chunks) > 1
+    assert "".join(chunks) == chat_complete(messages, "key", "model", base_url=base_url)
+
+
+def test_stream_raises_http_errors(stub):
+    server, base_url = stub
+    server.fail_rate = 1.0
+    with pytest.raises(requests.HTTPError):
+        list(gemini_stream("x", "key", "model", base_url=base_url))
@@ -0,0 +1,62 @@
+import pytest
+
+from src import metrics
+
+
+@pytest.fixture
+def fresh_metrics():
+    was_enabled = metrics.is_enabled()
+    metrics.reset()
+    yield metrics
+    metrics.reset()
+    (metrics.enable if was_enabled else metrics.disable)()
+
+
+def test_disabled_metrics_record_nothing(fresh_metrics):
+    metrics.disable()
+    metrics.inc("llm_cache_requests_total", result="hit")
+    with metrics.timer("animal_stage_seconds", stage="load") as t:
+        pass
+    assert t.elapsed is None
+    assert metrics.render_prometheus() == "\n"
+
+
+def test_prometheus_output(fresh_metrics):
+    metrics.enable()
+    metrics.inc("llm_cache_requests_total", result="hit")
+    metrics.inc("llm_cache_requests_total", 2, result="hit")
+    metrics.observe("animal_stage_seconds", 0.003, stage="load")
+    metrics.observe("animal_stage_seconds", 100.0, stage="load")
+
+    text = metrics.render_prometheus()
+    assert "# TYPE llm_cache_requests_total counter" in text
+    assert 'llm_cache_requests_total{result="hit"} 3' in text
+    assert "# HELP animal_stage_seconds " in text
+    assert 'animal_stage_seconds_bucket{stage="load",le="0.001"} 0' in text
+    assert 'animal_stage_seconds_bucket{stage="load",le="0.005"} 1' in text
+    assert 'animal_stage_seconds_bucket{stage="load",le="60.0"} 1' in text
+    assert 'animal_stage_seconds_bucket{stage="load",le="+Inf"} 2' in text
+    assert 'animal_stage_seconds_count{stage="load"} 2' in text
+
+
+def test_timed_records_failed_calls_too(fresh_metrics):
+    metrics.enable()
+
+    @metrics.timed("animal_stage_seconds", stage="boom")
+    def boom():
+        raise RuntimeError("x")
+
+    with pytest.raises(RuntimeError):
+        boom()
+    assert 'animal_stage_seconds_count{stage="boom"} 1' in metrics.render_prometheus()
+    assert "animal_stage_seconds[stage=boom]" in metrics.report()
+
+
+def test_metrics_endpoint(fresh_metrics):
+    from app import app
+
+    metrics.enable()
+    client = app.test_client()
+    client.get("/metrics")
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'http_requests_total{endpoint="/metrics",status="200"} 1' in body
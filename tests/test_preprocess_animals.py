@@ -0,0 +1,23 @@
+import datetime
+
+from src.animal_utils import parse_date
+from src.preprocess_animals import preprocess_animal, preprocess_animals
+from src.synth_animals import iter_synthetic_animals
+
+
+def test_process_pool_matches_serial():
+    raw = list(iter_synthetic_animals(500, seed=9))
+    serial = [preprocess_animal(a) for a in raw]
+    assert preprocess_animals(raw) == serial
+    # 청크 경계가 여러 번 생기도록 작게 나눠서, 이터레이터로 넘겨도 순서 유지
+    assert preprocess_animals(iter(raw), workers=2, chunk_size=37) == serial
+
+
+def test_parse_date_fast_path_matches_strptime():
+    for s in ("20250131", "20240229", "20250230", "2025013", "2025-01-31", "２０２５０１３１", ""):
+        try:
+            expected = datetime.datetime.strptime(s, "%Y%m%d").date()
+        except ValueError:
+            expected = None
+        assert parse_date(s) == expected, s
+    assert parse_date(None) is None
@@ -0,0 +1,21 @@
+from src.preprocess_animals import PREPROCESS_SCHEMA, preprocess_animals
+from src.preprocess_cache import PreprocessCache, record_hash
+
+RAW = {"noticeNo": "N-1", "noticeEdt": "20250110", "happenPlace": "서울특별시 강서구 화곡동"}
+
+
+def test_entries_from_older_preprocess_format_are_misses(tmp_path):
+    with PreprocessCache(str(tmp_path / "cache.sqlite")) as cache:
+        # 예전 형식(버전 없는 해시, region 없음)으로 저장된 결과
+        cache.put_many([("N-1", record_hash(RAW), {"noticeNo": "N-1"})])
+
+        animals = preprocess_animals([RAW], cache=cache)
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert animals[0]["region"] == ("서울특별시", "강서구", "화곡동")
+
+        preprocess_animals([RAW], cache=cache)
+        assert cache.hits == 1
+
+
+def test_schema_salt_changes_hash():
+    assert record_hash(RAW, PREPROCESS_SCHEMA) != record_hash(RAW)
@@ -0,0 +1,12 @@
+import pytest
+
+from src.prompt_template import PromptTemplate
+
+
+def test_api_fields_are_valid_placeholders():
+    t = PromptTemplate("발생일 $happenDt$ / $orgNm$ / $careAddr$")
+    assert t.render({"happenDt": "20251201", "orgNm": "서울특별시 강서구", "careAddr": "서울"}) == \
+        "발생일 20251201 / 서울특별시 강서구 / 서울"
+    # 오타는 여전히 거부
+    with pytest.raises(ValueError):
+        PromptTemplate("$orgNmm$")
@@ -0,0 +1,52 @@
+import datetime
+
+import pytest
+
+from src.animal_utils import filter_animals, recommend_animals, sort_by_end_date
+from src.preprocess_animals import preprocess_animal
+from src.synth_animals import iter_synthetic_animals
+
+
+@pytest.fixture(scope="module")
+def animals():
+    raw = list(iter_synthetic_animals(1500, seed=8))
+    raw[10]["noticeEdt"] = ""
+    return [preprocess_animal(a) for a in raw]
+
+
+def _nos(xs):
+    return [a["noticeNo"] for a in xs]
+
+
+def _expected(animals, region, kind=None):
+    # 페이지 모드 순서: 마감일(없으면 맨 뒤) → noticeNo
+    def key(a):
+        d = a["noticeEdt_parsed"]
+        return (d or datetime.date.max), a["noticeNo"]
+    return _nos(sorted(filter_animals(animals, kind=kind, region=region), key=key))
+
+
+def test_full_result_matches_filter_then_sort(animals):
+    assert _nos(recommend_animals(animals, "경기", "믹스")) == \
+        _nos(sort_by_end_date(filter_animals(animals, kind="믹스", region="경기")))
+
+
+@pytest.mark.parametrize("limit, offset", [(1, 0), (10, 0), (10, 25), (1000, 5)])
+def test_limit_offset_and_lazy(animals, limit, offset):
+    expected = _expected(animals, "서울")[offset:offset + limit]
+    assert _nos(recommend_animals(animals, "서울", limit=limit, offset=offset)) == expected
+    lazy = recommend_animals(animals, "서울", limit=limit, offset=offset, lazy=True)
+    assert not isinstance(lazy, list)
+    assert _nos(lazy) == expected
+
+
+def test_cursor_pages_cover_everything_once(animals):
+    pages, cursor = [], None
+    while True:
+        page = recommend_animals(animals, "경기", limit=17, cursor=cursor)
+        pages += _nos(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+        assert len(page) == 17
+    assert pages == _expected(animals, "경기")
@@ -0,0 +1,25 @@
+from src.animal_utils import recommend_animals
+from src.preprocess_animals import preprocess_animal
+
+
+def _animal(no, end="20250110"):
+    return preprocess_animal({"noticeNo": no, "noticeEdt": end, "happenPlace": "서울특별시 강서구",
+                              "kindCd": "[개] 믹스견"})
+
+
+def test_cursor_survives_records_added_before_it():
+    animals = [_animal(f"서울-강서-2025-{i:05d}") for i in range(10)]
+    first = recommend_animals(animals, "서울", limit=4)
+    seen = [a["noticeNo"] for a in first]
+
+    # 다시 읽었더니 같은 마감일 공고가 앞쪽에 끼어들고 하나는 빠짐
+    reloaded = [_animal("서울-강서-2025-00003a")] + [a for a in animals if a["noticeNo"] != seen[0]]
+    rest = []
+    cursor = first.next_cursor
+    while cursor is not None:
+        page = recommend_animals(reloaded, "서울", limit=4, cursor=cursor)
+        rest += [a["noticeNo"] for a in page]
+        cursor = page.next_cursor
+
+    assert not set(seen) & set(rest)
+    assert rest == sorted(n for n in (a["noticeNo"] for a in reloaded) if n > seen[-1])
@@ -0,0 +1,35 @@
+from src.animal_index import AnimalIndex
+from src.animal_utils import filter_animals, filter_by_region, recommend_animals
+from src.preprocess_animals import preprocess_animal
+from src.region import parse_place
+from src.synth_animals import iter_synthetic_animals
+
+
+def test_parse_place_forms():
+    assert parse_place("부산진구") == ("", "부산진구", "")
+    assert parse_place("부산광역시 부산진구 전포동") == ("부산광역시", "부산진구", "전포동")
+    assert parse_place("부산북구") == ("부산광역시", "북구", "")
+    assert parse_place("경기도 광주시 오포읍") == ("경기도", "광주시", "오포읍")
+    assert parse_place("광주시 오포읍") == ("", "광주시", "오포읍")
+    assert parse_place("광주광역시 북구 용봉동") == ("광주광역시", "북구", "용봉동")
+
+
+def test_sigungu_query_matches_prefixed_name():
+    animals = [preprocess_animal({"noticeNo": "1", "happenPlace": "부산광역시 부산진구 전포동"}),
+               preprocess_animal({"noticeNo": "2", "happenPlace": "부산광역시 북구 화명동"})]
+    assert [a["noticeNo"] for a in filter_by_region(animals, "부산진구")] == ["1"]
+
+
+def test_region_filter_on_raw_records():
+    raw = list(iter_synthetic_animals(500, seed=2))
+    animals = [preprocess_animal(a) for a in raw]
+
+    def nos(xs):
+        return [a["noticeNo"] for a in xs]
+
+    expected = nos(filter_by_region(animals, "서울"))
+    assert expected
+    assert nos(filter_by_region(raw, "서울")) == expected
+    assert nos(filter_animals(raw, region="서울")) == expected
+    assert nos(filter_by_region(AnimalIndex(raw), "서울")) == expected
+    assert nos(recommend_animals(raw, "서울", limit=5)) == nos(recommend_animals(animals, "서울", limit=5))
@@ -0,0 +1,52 @@
+import datetime
+
+import numpy as np
+
+from src.preprocess_animals import preprocess_animal
+from src.scoring import DEADLINE_HORIZON, AnimalScorer
+
+TODAY = datetime.date(2025, 1, 1)
+
+
+def _animals(n):
+    # 모두 DEADLINE_HORIZON 밖이라 점수가 같고 마감일만 다름
+    out = []
+    for i in range(n):
+        end = TODAY + datetime.timedelta(days=DEADLINE_HORIZON + 1 + (i * 37) % 50)
+        out.append(preprocess_animal({
+            "noticeNo": f"N-{i}",
+            "noticeEdt": end.strftime("%Y%m%d"),
+            "happenPlace": "서울특별시 강서구",
+            "kindCd": "[개] 믹스견",
+        }))
+    return out
+
+
+def test_top_orders_ties_at_boundary_by_deadline_then_row():
+    scorer = AnimalScorer(_animals(2000))
+    scores = scorer.score(today=TODAY)
+    ids, _ = scorer.top(scores, 5)
+
+    expected = np.lexsort((np.arange(scorer.n), scorer._end_key, -scores))[:5]
+    assert list(ids) == list(expected)
+
+
+def test_top_keeps_higher_scores_first():
+    animals = _animals(100)
+    scorer = AnimalScorer(animals)
+    scores = scorer.score(today=TODAY)
+    scores[42] += 1.0
+    ids, top_scores = scorer.top(scores, 3)
+    assert ids[0] == 42
+    assert list(top_scores) == sorted(top_scores, reverse=True)
+
+
+def test_top_matches_full_sort_with_coarse_scores():
+    scorer = AnimalScorer(_animals(3000))
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 4, scorer.n).astype(np.float32)    # 동점이 아주 많음
+    full = np.lexsort((np.arange(scorer.n), scorer._end_key, -scores))
+    for k in (1, 7, 750, 751, 2999, 3000, 5000):
+        ids, top_scores = scorer.top(scores, k)
+        assert list(ids) == list(full[:k])
+        assert list(top_scores) == list(scores[full[:k]])
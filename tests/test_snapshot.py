@@ -0,0 +1,38 @@
+import pytest
+
+from src.animal_utils import filter_animals, recommend_animals
+from src.preprocess_animals import preprocess_animal
+from src.snapshot import load_snapshot, write_snapshot
+from src.synth_animals import iter_synthetic_animals
+
+
+def _animals():
+    raw = list(iter_synthetic_animals(800, seed=10))
+    raw[0]["noticeEdt"] = ""
+    raw[1]["noticeEdt"] = "2025-12-01"     # 형식 오류 — 원본 문자열이 그대로 남아야 함
+    raw[2]["memo"] = "컬럼에 없는 필드"
+    return [preprocess_animal(a) for a in raw]
+
+
+def test_round_trip(tmp_path):
+    animals = _animals()
+    path = str(tmp_path / "animals.snap")
+    assert write_snapshot(animals, path) == len(animals)
+
+    store = load_snapshot(path)
+    assert len(store) == len(animals)
+    assert [row.to_dict() for row in store] == animals
+    assert store[1]["noticeEdt"] == "2025-12-01" and store[1]["noticeEdt_parsed"] is None
+    assert store[2]["memo"] == "컬럼에 없는 필드"
+
+    nos = lambda xs: [a["noticeNo"] for a in xs]    # noqa: E731
+    assert nos(filter_animals(store, kind="믹스", region="서울")) == \
+        nos(filter_animals(animals, kind="믹스", region="서울"))
+    assert nos(recommend_animals(store, "경기", limit=20)) == nos(recommend_animals(animals, "경기", limit=20))
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.snap"
+    path.write_bytes(b"{}" * 16)
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
@@ -0,0 +1,58 @@
+import datetime
+import random
+
+from src.urgent_feed import UrgentFeed
+
+TODAY = datetime.date(2025, 11, 1)
+
+
+def _notice(no, days):
+    return {"noticeNo": no, "noticeEdt": (TODAY + datetime.timedelta(days=days)).strftime("%Y%m%d")}
+
+
+def _reference(feed):
+    # 살아있는 항목을 (마감일, 들어온 순) 으로 정렬한 것
+    return [e[2]["noticeNo"] for e in sorted(feed.entries.values(), key=lambda e: e[:2])]
+
+
+def test_lazy_deletion_skips_replaced_and_removed_entries():
+    feed = UrgentFeed([_notice("A", 5), _notice("B", 3), _notice("C", 9), {"noticeNo": "X", "noticeEdt": ""}])
+    assert len(feed) == 3 and "X" not in feed
+
+    feed.upsert(_notice("A", 1))        # 마감일 변경 → 예전 힙 항목은 지워진 항목으로 남음
+    feed.remove("B")
+    assert len(feed.heap) == 4          # 힙에서 바로 빼지 않음
+    assert [a["noticeNo"] for a in feed.first(10)] == ["A", "C"]
+
+    feed.upsert({"noticeNo": "C", "noticeEdt": ""})     # 마감일이 없어지면 피드에서 빠짐
+    assert [a["noticeNo"] for a in feed.first(10)] == ["A"]
+
+
+def test_heap_is_compacted_when_deleted_entries_pile_up():
+    feed = UrgentFeed(_notice(str(i), i % 30) for i in range(100))
+    for i in range(100):
+        feed.upsert(_notice(str(i), 40 + i % 7))
+    assert len(feed.heap) <= 2 * len(feed.entries) + 64
+    assert [a["noticeNo"] for a in feed.first(100)] == _reference(feed)
+
+
+def test_within_and_expire_match_a_full_sort():
+    rng = random.Random(0)
+    feed = UrgentFeed(_notice(str(i), rng.randint(-5, 20)) for i in range(300))
+    for _ in range(200):
+        no = str(rng.randrange(400))
+        if rng.random() < 0.3:
+            feed.remove(no)
+        else:
+            feed.upsert(_notice(no, rng.randint(-5, 20)))
+
+    expected = _reference(feed)
+    start, end = TODAY.toordinal(), TODAY.toordinal() + 7
+    within = [n for n in expected if start <= feed.entries[n][0] <= end]
+    assert [a["noticeNo"] for a in feed.within(7, today=TODAY)] == within
+    assert [a["noticeNo"] for a in feed.within(7, today=TODAY, limit=5)] == within[:5]
+
+    gone = [n for n in expected if feed.entries[n][0] < start]
+    assert [a["noticeNo"] for a in feed.expire(TODAY)] == gone
+    assert feed.expired == len(gone)
+    assert [a["noticeNo"] for a in feed.first(1000)] == [n for n in expected if n not in set(gone)]